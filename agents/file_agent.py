@@ -2,9 +2,25 @@
 
 from __future__ import annotations
 
-from typing import BinaryIO
+from typing import BinaryIO, Iterator
 
-import fitz  # PyMuPDF
+from utils.extractors import iter_chunks
+
+
+def iter_pdf_pages(uploaded_file: BinaryIO) -> Iterator[str]:
+    """Yield the text of each PDF page without joining the whole document.
+
+    The document is closed once the generator is exhausted or closed, so
+    callers can stop early without keeping the remaining pages in memory.
+
+    Args:
+        uploaded_file: File-like object containing the PDF data.
+
+    Yields:
+        Text content of one page at a time.
+    """
+
+    yield from iter_chunks(uploaded_file, "pdf")
 
 
 def extract_text_from_pdf(uploaded_file: BinaryIO) -> str:
@@ -20,7 +36,4 @@ def extract_text_from_pdf(uploaded_file: BinaryIO) -> str:
         Extracted text content from the PDF.
     """
 
-    uploaded_file.seek(0)
-    with fitz.open(stream=uploaded_file.read(), filetype="pdf") as doc:
-        text = "\n".join(page.get_text() for page in doc)
-    return text
+    return "\n".join(iter_pdf_pages(uploaded_file))
@@ -1,7 +1,7 @@
-import re
 import streamlit as st
 import plotly.graph_objects as go
 from utils.field_map import WizardStep, get_fields_for_step, get_fields_by_group
+from utils.salary import parse_salary
 from utils.utils_jobinfo import display_fields_summary
 
 st.set_page_config("Vacalyser Vacancy Data Wizard", page_icon="📝", layout="wide")
@@ -50,13 +50,11 @@ for step in WizardStep:
                 step=1000.0,
                 key=exp_key,
             )
-            salary_range = str(st.session_state.get("salary_range", ""))
-            numbers = [
-                float(n.replace(",", "."))
-                for n in re.findall(r"\d+[.,]?\d*", salary_range)
-            ]
-            min_sal = numbers[0] if numbers else 0
-            max_sal = numbers[1] if len(numbers) > 1 else min_sal
+            salary = parse_salary(
+                str(st.session_state.get("salary_range", ""))
+            ).annualized()
+            min_sal = salary.min or 0
+            max_sal = salary.max or min_sal
             fig = go.Figure()
             fig.add_trace(
                 go.Bar(
@@ -0,0 +1,201 @@
+"""Command-line bulk ingestion of job ads into JSONL.
+
+Walks directories and ZIP archives of PDF, DOCX, TXT, HTML and RTF files, runs
+:func:`extract_text` and :func:`basic_field_extraction` across a process pool
+and streams one JSON object per document to the output file. The output file
+doubles as checkpoint: re-running the same command skips documents that were
+already written.
+
+Usage::
+
+    python batch_ingest.py ads/ archive.zip -o results.jsonl --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import zipfile
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from utils.utils_jobinfo import basic_field_extraction, extract_text
+
+SUPPORTED_SUFFIXES = {".pdf", ".docx", ".txt", ".html", ".htm", ".rtf"}
+
+
+@dataclass
+class BatchDocument:
+    """A single job ad found while walking the inputs."""
+
+    doc_id: str
+    name: str
+    source: Union[str, bytes]
+
+
+def iter_documents(paths: Iterable[Union[str, Path]]) -> Iterator[BatchDocument]:
+    """Yield supported documents from files, directories and ZIP archives."""
+
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            for child in sorted(path.rglob("*")):
+                if child.is_file():
+                    yield from _documents_for_file(child)
+        elif path.is_file():
+            yield from _documents_for_file(path)
+
+
+def _documents_for_file(path: Path) -> Iterator[BatchDocument]:
+    suffix = path.suffix.lower()
+    if suffix == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            for member in sorted(archive.namelist()):
+                if Path(member).suffix.lower() in SUPPORTED_SUFFIXES:
+                    yield BatchDocument(
+                        doc_id=f"{path}:{member}",
+                        name=member,
+                        source=archive.read(member),
+                    )
+    elif suffix in SUPPORTED_SUFFIXES:
+        yield BatchDocument(doc_id=str(path), name=path.name, source=str(path))
+
+
+def process_document(doc: BatchDocument) -> Dict[str, Any]:
+    """Extract text and fields for ``doc`` and report the elapsed time."""
+
+    file_type = Path(doc.name).suffix.lower().lstrip(".")
+    start = time.perf_counter()
+    try:
+        # Files on disk are memory-mapped by the extractors, archive members
+        # are handed over as the bytes already read from the ZIP. The actual
+        # type is sniffed from the content, the suffix only labels the stats.
+        text = extract_text(doc.source)
+        fields = {k: v for k, v in basic_field_extraction(text).items() if v}
+        result: Dict[str, Any] = {"id": doc.doc_id, "fields": fields}
+    except Exception as exc:
+        result = {"id": doc.doc_id, "error": str(exc)}
+    result["file_type"] = file_type
+    result["seconds"] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def load_checkpoint(output: Path) -> Set[str]:
+    """Return document IDs already present in ``output``.
+
+    A partially written last line (for example after a crash) is truncated
+    so that appending new results keeps the file valid JSONL.
+    """
+
+    if not output.exists():
+        return set()
+    done: Set[str] = set()
+    valid_bytes = 0
+    with output.open("rb") as fh:
+        for line in fh:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                done.add(json.loads(line)["id"])
+            except (ValueError, KeyError):
+                break
+            valid_bytes += len(line)
+    if valid_bytes != output.stat().st_size:
+        with output.open("r+b") as fh:
+            fh.truncate(valid_bytes)
+    return done
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(results: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    """Return throughput and per file type latency statistics."""
+
+    by_type: Dict[str, List[float]] = defaultdict(list)
+    for result in results:
+        by_type[result["file_type"]].append(result["seconds"])
+    return {
+        "documents": len(results),
+        "errors": sum(1 for r in results if "error" in r),
+        "seconds": round(elapsed, 3),
+        "docs_per_second": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        "p95_seconds": {
+            file_type: round(_percentile(latencies, 95), 6)
+            for file_type, latencies in sorted(by_type.items())
+        },
+    }
+
+
+def run_batch(
+    paths: Iterable[Union[str, Path]],
+    output: Union[str, Path],
+    *,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Process all documents below ``paths`` and append results to ``output``.
+
+    Args:
+        paths: Files, directories or ZIP archives to ingest.
+        output: JSONL file receiving one result per document.
+        workers: Size of the process pool, defaults to the CPU count.
+
+    Returns:
+        Throughput summary as produced by :func:`summarize`.
+    """
+
+    output = Path(output)
+    done = load_checkpoint(output)
+    workers = workers or os.cpu_count() or 1
+    results: List[Dict[str, Any]] = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool, output.open(
+        "a", encoding="utf-8"
+    ) as out:
+        pending: Set[Future] = set()
+
+        def drain() -> None:
+            nonlocal pending
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                result = future.result()
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                results.append(result)
+
+        for doc in iter_documents(paths):
+            if doc.doc_id in done:
+                continue
+            # Keep a bounded number of documents in flight so archive members
+            # are not all held in memory at once.
+            if len(pending) >= workers * 2:
+                drain()
+            pending.add(pool.submit(process_document, doc))
+        while pending:
+            drain()
+    return summarize(results, time.perf_counter() - start)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="Files, directories or ZIP archives")
+    parser.add_argument("-o", "--output", required=True, help="JSONL output file")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    summary = run_batch(args.paths, args.output, workers=args.workers)
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
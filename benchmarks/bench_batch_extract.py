@@ -0,0 +1,58 @@
+"""Throughput of per-document extraction vs. ``extract_fields_batch``.
+
+Generates unique synthetic job ads and reports documents per second for a
+loop over ``basic_field_extraction`` and for the batch API.
+
+Usage::
+
+    python -m benchmarks.bench_batch_extract [sizes ...]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from utils.utils_jobinfo import basic_field_extraction, extract_fields_batch
+
+TITLES = ["Data Engineer", "Buchhalter", "Vertriebsleiter", "UX Designer"]
+CITIES = ["Berlin", "Hamburg", "München", "Köln", "Zürich"]
+SKILLS = ["Python", "SQL", "SAP FI", "Figma", "Kubernetes", "Excel", "DATEV"]
+
+
+def build_corpus(count: int, seed: int = 3) -> list[str]:
+    rng = random.Random(seed)
+    ads = []
+    for number in range(count):
+        skills = rng.sample(SKILLS, 3)
+        ads.append(
+            f"Jobtitel: {rng.choice(TITLES)} ({number})\n"
+            f"Firma: Firma {number} GmbH\n"
+            f"Ort: {rng.choice(CITIES)}\n"
+            f"Gehaltsspanne: {rng.randint(40, 70)}-{rng.randint(71, 99)}k EUR\n\n"
+            "Wir bieten eine unbefristete Stelle in Vollzeit für Senior-Profis.\n"
+            f"Experience with {skills[0]} and {skills[1]}. Kenntnisse in "
+            f"{skills[2]} sind ein Plus.\n"
+        )
+    return ads
+
+
+def main(sizes: list[int]) -> None:
+    for size in sizes:
+        corpus = build_corpus(size)
+        start = time.perf_counter()
+        for text in corpus:
+            basic_field_extraction(text)
+        single = time.perf_counter() - start
+        start = time.perf_counter()
+        extract_fields_batch(corpus)
+        batch = time.perf_counter() - start
+        print(
+            f"{size:7d} docs  per-document {size / single:8.0f} docs/s"
+            f"  batch {size / batch:8.0f} docs/s  x{single / batch:4.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000])
@@ -0,0 +1,67 @@
+"""Compare the DOCX extractor with python-docx on a large, table-heavy job ad.
+
+python-docx is not a registered backend: it yields tables after the body
+text and repeats merged cells, so it would change the extracted text. It is
+timed here as the reference.
+
+Usage::
+
+    python -m benchmarks.bench_docx
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from io import BytesIO
+
+import docx
+
+from utils.extractors import BufferReader, get_backend
+
+
+def build_sample(paragraphs: int = 2000, tables: int = 100) -> bytes:
+    doc = docx.Document()
+    for number in range(tables):
+        for line in range(paragraphs // tables):
+            doc.add_paragraph(f"Abschnitt {number}.{line}: Experience with Python.")
+        table = doc.add_table(rows=6, cols=4)
+        table.cell(0, 0).merge(table.cell(0, 3)).text = f"Jobtitel: Engineer {number}"
+        for row in table.rows[1:]:
+            for cell in row.cells:
+                cell.text = "Firma: ACME"
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def python_docx(buffer: memoryview):
+    doc = docx.Document(BufferReader(buffer))
+    for para in doc.paragraphs:
+        yield para.text
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                if cell.text:
+                    yield cell.text
+
+
+def main() -> None:
+    sample = build_sample()
+    print(f"sample size: {len(sample) / 1024:.0f} KiB")
+    readers = {"stream-xml": get_backend("docx"), "python-docx": python_docx}
+    for name, backend in readers.items():
+        tracemalloc.start()
+        start = time.perf_counter()
+        chunks = sum(1 for _ in backend(memoryview(sample)))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{name:12s} {elapsed * 1000:8.1f} ms  peak {peak / 2**20:6.1f} MiB"
+            f"  {chunks} chunks"
+        )
+
+
+if __name__ == "__main__":
+    main()
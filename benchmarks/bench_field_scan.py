@@ -0,0 +1,70 @@
+"""Compare per-field regex searches with the one-pass label scanner.
+
+The baseline runs one ``re.search`` per field, as ``basic_field_extraction``
+did before, but over the full wizard label vocabulary.
+
+Usage::
+
+    python -m benchmarks.bench_field_scan
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from typing import Dict
+
+from utils.field_scanner import _default_labels, _label_variants, scan_fields
+
+
+def build_per_field_patterns() -> Dict[str, re.Pattern]:
+    patterns = {}
+    for key, names in _default_labels().items():
+        variants = {v for name in names for v in _label_variants(name)}
+        alternation = "|".join(sorted(map(re.escape, variants), key=len, reverse=True))
+        patterns[key] = re.compile(rf"(?im)^\s*(?:{alternation})\s*[:\-]\s*(.+)$")
+    return patterns
+
+
+def per_field_search(text: str, patterns: Dict[str, re.Pattern]) -> Dict[str, str]:
+    found = {}
+    for key, pattern in patterns.items():
+        match = pattern.search(text)
+        if match:
+            found[key] = match.group(1).strip()
+    return found
+
+
+def build_ad(lines: int) -> str:
+    body = [
+        f"Wir bieten spannende Aufgaben im Bereich Daten, Zeile {n}."
+        for n in range(lines)
+    ]
+    return "\n".join(body + ["Jobtitel: Data Engineer", "Ort: Berlin"])
+
+
+def timed(func, *args, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    patterns = build_per_field_patterns()
+    print(f"{len(patterns)} fields")
+    for lines in (100, 1000, 10000):
+        text = build_ad(lines)
+        assert per_field_search(text, patterns) == scan_fields(text)
+        baseline = timed(per_field_search, text, patterns)
+        scanner = timed(scan_fields, text)
+        print(
+            f"{len(text) / 1024:7.0f} KiB  per-field {baseline * 1000:8.2f} ms"
+            f"  scanner {scanner * 1000:7.2f} ms  x{baseline / scanner:5.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Show that gazetteer scan time does not grow with the dictionary size.
+
+Synthetic skill dictionaries of increasing size are compiled into an
+Aho-Corasick automaton and into one regex alternation; both scan the same ad.
+
+Usage::
+
+    python -m benchmarks.bench_gazetteer
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import string
+import time
+
+from utils.aho_corasick import AhoCorasick
+from utils.gazetteer import load_skill_terms
+
+
+def synthetic_terms(count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    terms = set(load_skill_terms())
+    while len(terms) < count:
+        words = rng.randint(1, 3)
+        terms.add(
+            " ".join(
+                "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+                for _ in range(words)
+            )
+        )
+    return sorted(terms)
+
+
+def build_ad(repeat: int = 200) -> str:
+    line = (
+        "Wir suchen einen Senior Data Engineer mit Erfahrung in Python, SQL, "
+        "Apache Spark und Kubernetes für unser Team in Berlin.\n"
+    )
+    return line * repeat
+
+
+def timed(func, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    text = build_ad()
+    print(f"ad size: {len(text) / 1024:.0f} KiB")
+    for size in (1_000, 10_000, 50_000):
+        terms = synthetic_terms(size)
+        start = time.perf_counter()
+        automaton = AhoCorasick()
+        for term in terms:
+            automaton.add(term, term)
+        automaton.build()
+        build = time.perf_counter() - start
+        pattern = re.compile(
+            r"(?i)\b(?:"
+            + "|".join(sorted(map(re.escape, terms), key=len, reverse=True))
+            + r")\b"
+        )
+        scan = timed(lambda: list(automaton.iter_matches(text)))
+        alternation = timed(lambda: pattern.findall(text))
+        print(
+            f"{size:6d} terms  build {build * 1000:7.0f} ms"
+            f"  automaton {scan * 1000:7.1f} ms  regex alternation"
+            f" {alternation * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compare the PDF extractor with PyPDF2 on a generated multi-page job ad.
+
+PyPDF2 is not a registered backend: it orders and spaces page text
+differently from PyMuPDF, so choosing it by speed would change the extracted
+text. It is timed here as the reference when installed.
+
+Usage::
+
+    python -m benchmarks.bench_pdf
+"""
+
+from __future__ import annotations
+
+import time
+
+import fitz
+
+from utils.extractors import BufferReader, get_backend
+
+try:
+    from PyPDF2 import PdfReader
+except ImportError:  # pragma: no cover - optional reference
+    PdfReader = None
+
+
+def build_sample(pages: int = 50) -> bytes:
+    with fitz.open() as doc:
+        for number in range(pages):
+            page = doc.new_page()
+            page.insert_text(
+                (72, 72), f"Jobtitel: Data Scientist\nSeite {number}\n" * 20
+            )
+        return doc.tobytes()
+
+
+def pypdf2(buffer: memoryview):
+    for page in PdfReader(BufferReader(buffer)).pages:
+        yield page.extract_text() or ""
+
+
+def best_of(reader, sample: bytes, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _chunk in reader(memoryview(sample)):
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    sample = build_sample()
+    print(f"sample size: {len(sample) / 1024:.0f} KiB")
+    readers = {"pymupdf": get_backend("pdf")}
+    if PdfReader is not None:
+        readers["PyPDF2"] = pypdf2
+    else:
+        print("PyPDF2 is not installed; timing PyMuPDF only")
+    for name, reader in readers.items():
+        print(f"{name:8s} {best_of(reader, sample) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Worst-case timing of the extraction regexes on adversarial inputs.
+
+Compares the former unbounded patterns with their bounded replacements run
+through ``utils.safe_regex`` while the input size doubles. Linear patterns
+roughly double their time per row; the legacy ones quadruple. The second
+table times the whole ``basic_field_extraction`` on the adversarial inputs
+at 1x and 4x size; a ratio well above 4 points to super-linear behaviour and
+a ratio above ``MAX_GROWTH`` makes the benchmark exit with status 1.
+
+Usage::
+
+    python -m benchmarks.bench_redos
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import time
+
+from utils.safe_regex import REGEX_ENGINE, TimeBudget, safe_finditer
+from utils.salary import _SALARY_RE
+from utils.utils_jobinfo import _SKILL_RE, basic_field_extraction
+
+CASES = {
+    "skill_triggers": (
+        re.compile(
+            r"(?i)(?:proficiency in|experience with|knowledge of|proficient in)"
+            r"\s+(.+?)(?:\.|\n)"
+        ),
+        _SKILL_RE,
+        "experience with a ",
+    ),
+    "salary_labels": (
+        re.compile(
+            r"(?i)(?:Salary|Gehalt|Vergütung)[^\d]*(?P<min>\d{4,6})"
+            r"\s*(?:-|to|–)\s*\d{4,6}"
+        ),
+        _SALARY_RE,
+        "Gehalt ",
+    ),
+}
+
+
+# Repeated units that drive backtracking engines into quadratic behaviour.
+EXTRACTION_INPUTS = {
+    "skill_triggers": "experience with a ",
+    "salary_labels": "Gehalt ",
+    "label_separators": "Ort:",
+    "empty_labels": "Jobtitel:\n",
+    "line_hyphens": "a-\n",
+    "abbreviations": "e. g",
+    "blank_lines": " \n",
+}
+
+
+# Largest accepted 1x to 4x time ratio; quadratic growth would give 16.
+MAX_GROWTH = 8.0
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def best_of(func, *args, repeat: int = 3) -> float:
+    return min(timed(func, *args) for _ in range(repeat))
+
+
+def main() -> int:
+    print(f"engine: {REGEX_ENGINE}")
+    for name, (legacy, safe, unit) in CASES.items():
+        print(name)
+        for repeat in (1000, 2000, 4000, 8000):
+            text = unit * repeat
+            before = timed(legacy.findall, text)
+            after = timed(lambda: list(safe_finditer(safe, text, TimeBudget(None))))
+            print(
+                f"  {len(text) / 1024:6.0f} KiB  legacy {before * 1000:9.1f} ms"
+                f"  safe {after * 1000:7.2f} ms"
+            )
+    print("basic_field_extraction, 1x vs 4x input")
+    superlinear = []
+    for name, unit in EXTRACTION_INPUTS.items():
+        small, large = (
+            best_of(
+                lambda text: basic_field_extraction(text, budget=TimeBudget(None)),
+                unit * repeat,
+            )
+            for repeat in (1000, 4000)
+        )
+        print(
+            f"  {name:18} {small * 1000:8.1f} ms {large * 1000:8.1f} ms"
+            f"  x{large / small:4.1f}"
+        )
+        if large > MAX_GROWTH * small:
+            superlinear.append(name)
+    if superlinear:
+        print(f"super-linear: {', '.join(superlinear)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,384 @@
+"""Offline bulk field extraction through the OpenAI Batch API.
+
+Nightly re-processing does not need interactive latency, so instead of one
+synchronous call per document the ads are written as JSONL requests, uploaded
+once and processed by the provider's batch queue. Long ads are split into the
+same section chunks as the interactive extraction; every chunk becomes one
+request with the ``custom_id`` ``"<doc_id>#<chunk>"`` and the chunk results
+are merged back per document.
+
+Usage::
+
+    python -m functions.batch_extraction ads/ archive.zip -o llm_fields.jsonl
+
+Batches still running when the run gives up are listed as ``pending_batches``;
+their results can be collected later without submitting the ads again::
+
+    python -m functions.batch_extraction -o llm_fields.jsonl --resume batch_abc
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.chunking import CHUNK_TOKENS, merge_chunk_fields
+from utils.openai_client import chunk_text, extraction_request, get_client
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+# Provider limit of requests in one batch file; larger runs use several.
+MAX_BATCH_REQUESTS = 50_000
+# Seconds between two status checks of a running batch.
+POLL_INTERVAL = 30.0
+_FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+Document = Tuple[str, str]
+
+
+def _doc_id(custom_id: str) -> str:
+    return custom_id.rpartition("#")[0]
+
+
+def build_requests(
+    documents: Iterable[Document],
+    *,
+    language: str = "de",
+    max_tokens: int = CHUNK_TOKENS,
+) -> Iterator[Dict[str, Any]]:
+    """Yield one Batch API request per chunk of every ``(doc_id, text)``."""
+
+    for doc_id, text in documents:
+        for index, chunk in enumerate(chunk_text(text, max_tokens)):
+            yield {
+                "custom_id": f"{doc_id}#{index}",
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": extraction_request(chunk, language),
+            }
+
+
+def write_request_files(
+    requests: Iterable[Dict[str, Any]],
+    workdir: Path,
+    *,
+    max_requests: int = MAX_BATCH_REQUESTS,
+) -> List[Path]:
+    """Write ``requests`` to JSONL files of at most ``max_requests`` lines.
+
+    The chunks of one document stay in the same file unless they exceed
+    ``max_requests`` on their own, so every batch can be collected by itself.
+    """
+
+    workdir.mkdir(parents=True, exist_ok=True)
+    paths: List[Path] = []
+    out = None
+    count = 0
+    try:
+        for _, group in groupby(requests, key=lambda r: _doc_id(r["custom_id"])):
+            chunks = list(group)
+            for request in chunks:
+                full = out is None or count == max_requests
+                if not full and request is chunks[0]:
+                    full = count + len(chunks) > max_requests >= len(chunks)
+                if full:
+                    if out is not None:
+                        out.close()
+                    paths.append(workdir / f"requests-{len(paths):04d}.jsonl")
+                    out = paths[-1].open("w", encoding="utf-8")
+                    count = 0
+                out.write(json.dumps(request, ensure_ascii=False) + "\n")
+                count += 1
+    finally:
+        if out is not None:
+            out.close()
+    return paths
+
+
+def submit_batch(client: Any, path: Path) -> str:
+    """Upload the request file ``path`` and start a batch; return its ID."""
+
+    upload = client.files.create(file=path, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=upload.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=BATCH_COMPLETION_WINDOW,
+    )
+    logger.info("Submitted batch %s with %s", batch.id, path.name)
+    return batch.id
+
+
+def wait_for_batch(
+    client: Any,
+    batch_id: str,
+    *,
+    poll_interval: float = POLL_INTERVAL,
+    timeout: Optional[float] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Any:
+    """Poll ``batch_id`` until it reaches a final status and return it.
+
+    Raises:
+        RuntimeError: If the batch failed validation.
+        TimeoutError: If it is still running after ``timeout`` seconds.
+    """
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status in _FINAL_STATUSES:
+            break
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError(f"Batch {batch_id} still {batch.status}")
+        sleep(poll_interval)
+    if batch.status == "failed":
+        errors = getattr(batch.errors, "data", None) or []
+        message = "; ".join(e.message or e.code or "" for e in errors)
+        raise RuntimeError(f"Batch {batch_id} failed: {message or 'unknown error'}")
+    logger.info("Batch %s %s", batch_id, batch.status)
+    return batch
+
+
+def _parse_line(line: Dict[str, Any]) -> Dict[str, Any]:
+    response = line.get("response") or {}
+    if line.get("error") or response.get("status_code") != 200:
+        error = line.get("error") or response.get("body", {}).get("error") or {}
+        return {"error": error.get("message") or "request failed"}
+    try:
+        message = response["body"]["choices"][0]["message"]
+        return json.loads(message["tool_calls"][0]["function"]["arguments"])
+    except (KeyError, IndexError, TypeError, ValueError) as exc:
+        return {"error": f"invalid response: {exc}"}
+
+
+def read_results(client: Any, batch: Any) -> Dict[str, Dict[str, Any]]:
+    """Return the parsed fields or error of every request in ``batch``."""
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for raw in client.files.content(file_id).text.splitlines():
+            if raw.strip():
+                line = json.loads(raw)
+                results[line["custom_id"]] = _parse_line(line)
+    return results
+
+
+def _custom_ids(path: Path) -> List[str]:
+    with path.open(encoding="utf-8") as fh:
+        return [json.loads(line)["custom_id"] for line in fh if line.strip()]
+
+
+def collect_batches(
+    client: Any,
+    batch_ids: Iterable[str],
+    *,
+    request_files: Optional[Dict[str, Path]] = None,
+    poll_interval: float = POLL_INTERVAL,
+    timeout: Optional[float] = None,
+    pending: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Wait for every batch in ``batch_ids`` and return all request results.
+
+    A batch that failed or is still running after ``timeout`` does not
+    discard the results of the others. Its ID is logged and each of its
+    requests listed in ``request_files`` (batch ID to JSONL request file)
+    gets an ``error`` naming the batch; the IDs of batches still running are
+    appended to ``pending`` and their requests are marked with ``pending``.
+    """
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for batch_id in batch_ids:
+        try:
+            batch = wait_for_batch(
+                client, batch_id, poll_interval=poll_interval, timeout=timeout
+            )
+            results.update(read_results(client, batch))
+            continue
+        except TimeoutError as exc:
+            logger.warning("%s; collect it later with --resume %s", exc, batch_id)
+            error = {"error": str(exc), "pending": batch_id}
+            if pending is not None:
+                pending.append(batch_id)
+        except RuntimeError as exc:
+            logger.error("%s", exc)
+            error = {"error": str(exc)}
+        path = (request_files or {}).get(batch_id)
+        for custom_id in _custom_ids(path) if path else ():
+            results[custom_id] = dict(error)
+    return results
+
+
+def merge_results(
+    results: Dict[str, Dict[str, Any]], doc_ids: Iterable[str]
+) -> Dict[str, Dict[str, Any]]:
+    """Merge the chunk results of each document in ``doc_ids``.
+
+    A document whose chunks did not all succeed is reported with the first
+    chunk ``error`` instead of partial fields; a chunk of an unfinished batch
+    takes precedence so the document stays ``pending``.
+    """
+
+    chunks: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+    for custom_id, result in results.items():
+        doc_id, _, index = custom_id.rpartition("#")
+        chunks.setdefault(doc_id, []).append((int(index), result))
+    merged: Dict[str, Dict[str, Any]] = {}
+    for doc_id in doc_ids:
+        parts = [result for _, result in sorted(chunks.get(doc_id, []))]
+        errors = [part for part in parts if "pending" in part]
+        errors = errors or [part for part in parts if "error" in part]
+        if not parts:
+            merged[doc_id] = {"error": "no result"}
+        elif errors:
+            merged[doc_id] = dict(errors[0])
+        else:
+            merged[doc_id] = merge_chunk_fields(parts)
+    return merged
+
+
+def run_batch_extraction(
+    documents: Iterable[Document],
+    *,
+    workdir: Path,
+    language: str = "de",
+    max_tokens: int = CHUNK_TOKENS,
+    max_requests: int = MAX_BATCH_REQUESTS,
+    poll_interval: float = POLL_INTERVAL,
+    timeout: Optional[float] = None,
+    client: Optional[Any] = None,
+    pending: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Extract fields for all ``(doc_id, text)`` pairs in provider batches.
+
+    All request files are submitted before the first one is polled, so the
+    batches are processed side by side on the provider's side. Failed or
+    unfinished batches are handled as in :func:`collect_batches`.
+
+    Args:
+        documents: Document IDs and job ad texts; IDs must be unique.
+        workdir: Directory for the JSONL request files.
+        language: Target language for the response, ``"de"`` or ``"en"``.
+        max_tokens: Token budget per chunk.
+        max_requests: Maximum requests per batch.
+        poll_interval: Seconds between status checks.
+        timeout: Give up waiting after this many seconds.
+        client: OpenAI client, defaults to :func:`get_client`.
+        pending: Receives the IDs of batches still running after ``timeout``.
+
+    Returns:
+        Merged fields (or ``{"error": ...}``) per document ID.
+    """
+
+    client = client or get_client()
+    doc_ids: List[str] = []
+
+    def remember(docs: Iterable[Document]) -> Iterator[Document]:
+        for doc_id, text in docs:
+            doc_ids.append(doc_id)
+            yield doc_id, text
+
+    requests = build_requests(
+        remember(documents), language=language, max_tokens=max_tokens
+    )
+    paths = write_request_files(requests, Path(workdir), max_requests=max_requests)
+    request_files = {submit_batch(client, path): path for path in paths}
+    results = collect_batches(
+        client,
+        list(request_files),
+        request_files=request_files,
+        poll_interval=poll_interval,
+        timeout=timeout,
+        pending=pending,
+    )
+    return merge_results(results, doc_ids)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from batch_ingest import iter_documents, load_checkpoint
+    from utils.utils_jobinfo import extract_text
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="Files, directories or ZIP archives")
+    parser.add_argument("-o", "--output", required=True, help="JSONL output file")
+    parser.add_argument("-l", "--language", default="de", choices=["de", "en"])
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL)
+    parser.add_argument("--timeout", type=float, help="Seconds to wait for batches")
+    parser.add_argument(
+        "--resume",
+        nargs="+",
+        default=[],
+        metavar="BATCH_ID",
+        help="Collect the results of batches submitted by an earlier run",
+    )
+    args = parser.parse_args(argv)
+    if not args.paths and not args.resume:
+        parser.error("give paths to extract or --resume BATCH_ID")
+
+    output = Path(args.output)
+    done = load_checkpoint(output)
+    failed: Dict[str, Dict[str, Any]] = {}
+    pending: List[str] = []
+
+    def documents() -> Iterator[Document]:
+        for doc in iter_documents(args.paths):
+            if doc.doc_id in done:
+                continue
+            try:
+                yield doc.doc_id, extract_text(doc.source)
+            except Exception as exc:
+                failed[doc.doc_id] = {"error": str(exc)}
+
+    merged: Dict[str, Dict[str, Any]] = {}
+    if args.resume:
+        results = collect_batches(
+            get_client(),
+            args.resume,
+            poll_interval=args.poll_interval,
+            timeout=args.timeout,
+            pending=pending,
+        )
+        resumed = {_doc_id(custom_id) for custom_id in results} - done
+        merged.update(merge_results(results, sorted(resumed)))
+        # already submitted, so they are not sent again with the paths below
+        done |= resumed
+    if args.paths:
+        with tempfile.TemporaryDirectory() as workdir:
+            merged.update(
+                run_batch_extraction(
+                    documents(),
+                    workdir=Path(workdir),
+                    language=args.language,
+                    poll_interval=args.poll_interval,
+                    timeout=args.timeout,
+                    pending=pending,
+                )
+            )
+    merged.update(failed)
+    # documents of unfinished batches stay out of the checkpoint for --resume
+    merged = {k: v for k, v in merged.items() if "pending" not in v}
+    with output.open("a", encoding="utf-8") as out:
+        for doc_id, fields in merged.items():
+            if "error" in fields:
+                line = {"id": doc_id, "error": fields["error"]}
+            else:
+                line = {"id": doc_id, "fields": fields}
+            out.write(json.dumps(line, ensure_ascii=False) + "\n")
+    errors = sum(1 for fields in merged.values() if "error" in fields)
+    summary = {"documents": len(merged), "errors": errors, "pending_batches": pending}
+    print(json.dumps(summary), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+from functions.batch_extraction import run_batch_extraction
 from utils.openai_client import (
     call_extract_fields_function_calling,
     call_extract_fields_responses_api,
@@ -16,3 +17,14 @@ def extract_job_fields(text, language="de", mode="Function Calling (ChatCompleti
         return call_extract_fields_function_calling(text, language)
     else:
         return call_extract_fields_responses_api(text, language)
+
+
+def extract_job_fields_batch(documents, language="de", *, workdir, **kwargs):
+    """
+    documents: (doc_id, raw jobad) pairs
+    language: "de" or "en"
+    workdir: directory for the Batch API request files
+    Returns the merged fields (or {"error": ...}) per doc_id, see
+    functions.batch_extraction.run_batch_extraction.
+    """
+    return run_batch_extraction(documents, workdir=workdir, language=language, **kwargs)
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import Any
 
+from utils.salary import parse_salary
+
 
 def update_task_list(state: dict[str, Any]) -> None:
     """Populate ``task_list`` with generic tasks based on the role.
@@ -42,9 +44,13 @@ def update_nice_to_have_skills(state: dict[str, Any]) -> None:
 
 
 def update_salary_range(state: dict[str, Any]) -> None:
-    """Provide a simple salary range estimate if missing."""
-    current = str(state.get("salary_range", "")).strip().lower()
-    if current and current != "competitive":
+    """Provide a simple salary range estimate if no amount is stated.
+
+    Values without a pay amount such as "competitive" or "40 Stunden/Woche"
+    are replaced as well.
+    """
+    salary = parse_salary(str(state.get("salary_range", "")), strict=True)
+    if salary.min is not None:
         return
     state["salary_range"] = "45000 – 55000 EUR"
 
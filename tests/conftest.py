@@ -0,0 +1,13 @@
+import pytest
+
+from utils import llm_cache
+from utils.disk_cache import DiskLRUCache
+
+
+@pytest.fixture
+def llm_disk_cache(tmp_path, monkeypatch):
+    """Point the LLM answer cache at a fresh database in ``tmp_path``."""
+
+    cache = DiskLRUCache(tmp_path / "llm.sqlite3")
+    monkeypatch.setattr(llm_cache, "_llm_cache", lambda: cache)
+    return cache
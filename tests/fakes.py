@@ -0,0 +1,43 @@
+"""Fake clients shared by the test modules."""
+
+import asyncio
+from types import SimpleNamespace
+
+
+class FakeAsyncClient:
+    """Answers after a delay that depends on the prompt."""
+
+    def __init__(self, delays, fail=()):
+        self.delays = delays
+        self.fail = fail
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        prompt = messages[0]["content"]
+        try:
+            delay = next(d for word, d in self.delays.items() if word in prompt)
+            await asyncio.sleep(delay)
+            if any(word in prompt for word in self.fail):
+                raise RuntimeError("rate limited")
+        finally:
+            self.active -= 1
+        message = SimpleNamespace(content=f" {prompt.split()[0]} ")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def close(self):
+        self.closed = True
+
+
+DELAYS = {
+    "job ad": 0.2,
+    "Boolean": 0.05,
+    "interview": 0.1,
+    "email": 0.05,
+    "persona": 0.1,
+}
@@ -0,0 +1,75 @@
+from unittest.mock import patch
+
+import streamlit as st
+
+from utils import apply_edited_raw as module
+from utils.apply_edited_raw import apply_edited_raw, build_raw_index, split_paragraphs
+from utils.utils_jobinfo import basic_field_extraction
+
+TEXT = "Jobtitel: Data Engineer\n\nFirma: ACME\nOrt: Berlin\n\n \nExperience with SQL."
+
+
+def test_split_paragraphs_returns_offsets():
+    spans = split_paragraphs(TEXT)
+    assert [TEXT[s:e] for s, e in spans] == [
+        "Jobtitel: Data Engineer",
+        "Firma: ACME\nOrt: Berlin",
+        "Experience with SQL.",
+    ]
+
+
+def test_build_raw_index_maps_fields_to_spans():
+    index = build_raw_index(TEXT)
+    start, end = index.spans["city"][0]
+    assert "Ort: Berlin" in TEXT[start:end]
+    assert index.fields["job_title"] == "Data Engineer"
+    assert index.fields["must_have_skills"] == "SQL"
+
+
+def test_build_raw_index_rescans_only_changed_paragraphs():
+    previous = build_raw_index(TEXT)
+    edited = TEXT.replace("Berlin", "Hamburg")
+    with patch.object(module, "extract_parts", wraps=module.extract_parts) as extract:
+        index = build_raw_index(edited, previous)
+    extract.assert_called_once_with("Firma: ACME\nOrt: Hamburg")
+    assert index.fields["city"] == "Hamburg"
+
+
+def test_build_raw_index_matches_whole_text_extraction():
+    text = (
+        "Jobtitel:\n\nData Engineer\n\n"
+        "Gehalt: 60.000 - 70.000 EUR\nVollzeit, unbefristet.\n\n"
+        "Wir nutzen Python und Docker.\n\n"
+        "Hard Skills: Kafka\nWährung: USD\n\n"
+        "Must-have Skills: Git\n\nExperience with\n\nSpark and Airflow."
+    )
+    expected = {
+        key: value for key, value in basic_field_extraction(text).items() if value
+    }
+    index = build_raw_index(text)
+    assert index.fields == expected
+    assert index.fields["job_title"] == "Data Engineer"
+    assert build_raw_index(text.replace("Docker", "Go"), index).fields == {
+        key: value
+        for key, value in basic_field_extraction(text.replace("Docker", "Go")).items()
+        if value
+    }
+
+
+def test_apply_edited_raw_skips_unchanged_text_and_respects_user_edits():
+    st.session_state.clear()
+    st.session_state["edit_parsed_data_raw"] = TEXT
+    apply_edited_raw()
+    assert st.session_state["job_fields"]["city"] == "Berlin"
+
+    with patch.object(module, "build_raw_index") as build:
+        apply_edited_raw()
+    build.assert_not_called()
+
+    st.session_state["job_fields"]["job_title"] = "Senior Data Engineer"
+    st.session_state["edit_parsed_data_raw"] = TEXT.replace(
+        "Berlin", "Hamburg"
+    ).replace("Data Engineer", "Analyst")
+    apply_edited_raw()
+    assert st.session_state["job_fields"]["city"] == "Hamburg"
+    assert st.session_state["job_fields"]["job_title"] == "Senior Data Engineer"
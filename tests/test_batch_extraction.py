@@ -0,0 +1,302 @@
+import email
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from functions import batch_extraction
+from utils import openai_client
+
+
+class BatchStandIn(BaseHTTPRequestHandler):
+    """Minimal local stand-in for the Files and Batches endpoints."""
+
+    files = {}
+    batches = {}
+    # Status checks answered with "in_progress" before a batch completes.
+    polls_before_done = 1
+    # custom_ids answered with a server error.
+    failing = set()
+    # Batch IDs that fail validation or never finish.
+    failed_batches = set()
+    stuck = set()
+
+    def _send(self, payload, status=200, content_type="application/json"):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _file(self, content, purpose):
+        file_id = f"file-{len(self.files)}"
+        self.files[file_id] = content
+        return {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(content),
+            "created_at": 0,
+            "filename": f"{file_id}.jsonl",
+            "purpose": purpose,
+            "status": "processed",
+        }
+
+    def _batch(self, batch_id):
+        batch = self.batches[batch_id]
+        return {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": "/v1/chat/completions",
+            "completion_window": "24h",
+            "created_at": 0,
+            "input_file_id": batch["input_file_id"],
+            "status": batch["status"],
+            "output_file_id": batch.get("output_file_id"),
+            "error_file_id": batch.get("error_file_id"),
+            "errors": batch.get("errors"),
+        }
+
+    def _run(self, batch):
+        output, errors = [], []
+        for raw in self.files[batch["input_file_id"]].decode().splitlines():
+            request = json.loads(raw)
+            custom_id = request["custom_id"]
+            if custom_id in self.failing:
+                errors.append(
+                    {
+                        "custom_id": custom_id,
+                        "response": {
+                            "status_code": 500,
+                            "body": {"error": {"message": "server error"}},
+                        },
+                    }
+                )
+                continue
+            ad = request["body"]["messages"][-1]["content"]
+            fields = dict(re.findall(r"(\w+)=(\w+)", ad))
+            message = {
+                "role": "assistant",
+                "tool_calls": [
+                    {
+                        "id": "call_1",
+                        "type": "function",
+                        "function": {
+                            "name": "extract_job_fields",
+                            "arguments": json.dumps(fields),
+                        },
+                    }
+                ],
+            }
+            output.append(
+                {
+                    "custom_id": custom_id,
+                    "response": {
+                        "status_code": 200,
+                        "body": {"choices": [{"index": 0, "message": message}]},
+                    },
+                }
+            )
+        for name, lines in (("output_file_id", output), ("error_file_id", errors)):
+            if lines:
+                content = "".join(json.dumps(line) + "\n" for line in lines)
+                batch[name] = self._file(content.encode(), "batch_output")["id"]
+        batch["status"] = "completed"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path == "/v1/files":
+            header = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n"
+            form = email.message_from_bytes(header.encode() + body)
+            parts = {
+                part.get_param("name", header="content-disposition"): part
+                for part in form.get_payload()
+            }
+            content = parts["file"].get_payload(decode=True)
+            purpose = parts["purpose"].get_payload()
+            return self._send(self._file(content, purpose))
+        if self.path == "/v1/batches":
+            request = json.loads(body)
+            batch_id = f"batch-{len(self.batches)}"
+            self.batches[batch_id] = {
+                "input_file_id": request["input_file_id"],
+                "status": "validating",
+                "polls": 0,
+            }
+            return self._send(self._batch(batch_id))
+        self._send({"error": {"message": "not found"}}, status=404)
+
+    def do_GET(self):
+        match = re.fullmatch(r"/v1/batches/([\w-]+)", self.path)
+        if match:
+            batch = self.batches[match.group(1)]
+            batch["polls"] += 1
+            if match.group(1) in self.stuck:
+                batch["status"] = "in_progress"
+            elif match.group(1) in self.failed_batches:
+                batch["status"] = "failed"
+                batch["errors"] = {"data": [{"code": "invalid", "message": "bad"}]}
+            elif batch["polls"] > self.polls_before_done:
+                self._run(batch)
+            else:
+                batch["status"] = "in_progress"
+            return self._send(self._batch(match.group(1)))
+        match = re.fullmatch(r"/v1/files/([\w-]+)/content", self.path)
+        if match:
+            return self._send(self.files[match.group(1)], content_type="text/plain")
+        self._send({"error": {"message": "not found"}}, status=404)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in(monkeypatch):
+    BatchStandIn.files = {}
+    BatchStandIn.batches = {}
+    BatchStandIn.failing = set()
+    BatchStandIn.failed_batches = set()
+    BatchStandIn.stuck = set()
+    BatchStandIn.polls_before_done = 1
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BatchStandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    monkeypatch.setattr(openai_client, "_client", None)
+    yield BatchStandIn
+    server.shutdown()
+    server.server_close()
+
+
+def _long_ad(title):
+    sections = [f"Abschnitt {i}:\n" + "Text " * 150 for i in range(3)]
+    return "\n\n".join([f"job_title={title}"] + sections + ["benefits=Jobticket"])
+
+
+def test_build_requests_chunks_long_documents():
+    requests = list(
+        batch_extraction.build_requests(
+            [("a", "job_title=Engineer"), ("b", _long_ad("Analyst"))], max_tokens=300
+        )
+    )
+    ids = [r["custom_id"] for r in requests]
+    assert ids[0] == "a#0"
+    assert ids[1:] == [f"b#{i}" for i in range(len(ids) - 1)]
+    assert len(ids) > 3
+    assert requests[0]["url"] == "/v1/chat/completions"
+    assert requests[0]["body"]["tool_choice"]["function"]["name"] == (
+        "extract_job_fields"
+    )
+
+
+def test_run_batch_extraction_merges_results_by_document(stand_in, tmp_path):
+    documents = [
+        ("ads/one.txt", "job_title=Engineer\ncity=Berlin"),
+        ("ads/two.txt", _long_ad("Analyst")),
+        ("archive.zip:three#1.txt", "job_title=Designer"),
+    ]
+    merged = batch_extraction.run_batch_extraction(
+        documents,
+        workdir=tmp_path,
+        max_tokens=300,
+        max_requests=3,
+        poll_interval=0,
+    )
+    assert merged == {
+        "ads/one.txt": {"job_title": "Engineer", "city": "Berlin"},
+        "ads/two.txt": {"job_title": "Analyst", "benefits": "Jobticket"},
+        "archive.zip:three#1.txt": {"job_title": "Designer"},
+    }
+    # Requests were split across several batch files, all submitted at once.
+    assert len(list(tmp_path.glob("requests-*.jsonl"))) == len(stand_in.batches) > 1
+    assert all(batch["polls"] == 2 for batch in stand_in.batches.values())
+
+
+def test_failed_chunk_marks_document_as_error(stand_in, tmp_path):
+    stand_in.failing = {"b#1"}
+    merged = batch_extraction.run_batch_extraction(
+        [("a", "job_title=Engineer"), ("b", _long_ad("Analyst"))],
+        workdir=tmp_path,
+        max_tokens=300,
+        poll_interval=0,
+    )
+    assert merged["a"] == {"job_title": "Engineer"}
+    assert merged["b"] == {"error": "server error"}
+
+
+def test_wait_for_batch_times_out(stand_in, tmp_path):
+    stand_in.polls_before_done = 100
+    paths = batch_extraction.write_request_files(
+        batch_extraction.build_requests([("a", "x")]), tmp_path
+    )
+    client = openai_client.get_client()
+    batch_id = batch_extraction.submit_batch(client, paths[0])
+    with pytest.raises(TimeoutError):
+        batch_extraction.wait_for_batch(
+            client, batch_id, poll_interval=0, timeout=0, sleep=lambda s: None
+        )
+
+
+def test_failed_batch_keeps_results_of_other_batches(stand_in, tmp_path, caplog):
+    stand_in.failed_batches = {"batch-1"}
+    merged = batch_extraction.run_batch_extraction(
+        [("a", "job_title=A"), ("b", "job_title=B"), ("c", "job_title=C")],
+        workdir=tmp_path,
+        max_requests=1,
+        poll_interval=0,
+    )
+    assert merged == {
+        "a": {"job_title": "A"},
+        "b": {"error": "Batch batch-1 failed: bad"},
+        "c": {"job_title": "C"},
+    }
+    assert "batch-1" in caplog.text
+
+
+def test_request_files_keep_the_chunks_of_a_document_together(tmp_path):
+    chunks = {"a": 1, "b": 2, "c": 2, "d": 4}
+    requests = [{"custom_id": f"{d}#{i}"} for d, n in chunks.items() for i in range(n)]
+    paths = batch_extraction.write_request_files(requests, tmp_path, max_requests=3)
+    files = [
+        [json.loads(line)["custom_id"] for line in path.read_text().splitlines()]
+        for path in paths
+    ]
+    # "d" has more chunks than fit in one file and is split
+    assert files == [
+        ["a#0", "b#0", "b#1"],
+        ["c#0", "c#1", "d#0"],
+        ["d#1", "d#2", "d#3"],
+    ]
+
+
+def test_unfinished_batches_are_left_for_resume(stand_in, tmp_path, capsys):
+    ads = tmp_path / "ads"
+    ads.mkdir()
+    (ads / "one.txt").write_text("job_title=Engineer", encoding="utf-8")
+    (ads / "two.txt").write_text("job_title=Analyst", encoding="utf-8")
+    output = tmp_path / "out.jsonl"
+    stand_in.polls_before_done = 0
+    stand_in.stuck = {"batch-0"}
+    options = ["-o", str(output), "--poll-interval", "0", "--timeout", "0"]
+
+    batch_extraction.main([str(ads), *options])
+    assert json.loads(capsys.readouterr().err.splitlines()[-1]) == {
+        "documents": 0,
+        "errors": 0,
+        "pending_batches": ["batch-0"],
+    }
+    assert output.read_text() == ""
+
+    stand_in.stuck = set()
+    batch_extraction.main([*options, "--resume", "batch-0"])
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(line["fields"]["job_title"] for line in lines) == [
+        "Analyst",
+        "Engineer",
+    ]
+    # the resumed documents are checkpointed, so a rerun submits nothing new
+    batch_extraction.main([str(ads), *options])
+    assert len(stand_in.batches) == 1
@@ -0,0 +1,42 @@
+import json
+import zipfile
+
+from batch_ingest import load_checkpoint, run_batch
+
+
+def _write_corpus(tmp_path):
+    ads = tmp_path / "ads"
+    ads.mkdir()
+    (ads / "one.txt").write_text("Jobtitel: Data Scientist\nStadt: Berlin")
+    (ads / "ignored.png").write_bytes(b"\x89PNG")
+    with zipfile.ZipFile(ads / "old.zip", "w") as archive:
+        archive.writestr("two.txt", "Firma: ACME\nPosition: Engineer")
+    return ads
+
+
+def test_run_batch_streams_jsonl_and_summary(tmp_path):
+    ads = _write_corpus(tmp_path)
+    output = tmp_path / "out.jsonl"
+
+    summary = run_batch([ads], output, workers=2)
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    by_id = {line["id"]: line for line in lines}
+    assert by_id[str(ads / "one.txt")]["fields"]["city"] == "Berlin"
+    assert by_id[f"{ads / 'old.zip'}:two.txt"]["fields"]["company_name"] == "ACME"
+    assert summary["documents"] == 2
+    assert set(summary["p95_seconds"]) == {"txt"}
+
+
+def test_run_batch_resumes_from_checkpoint(tmp_path):
+    ads = _write_corpus(tmp_path)
+    output = tmp_path / "out.jsonl"
+    run_batch([ads], output, workers=1)
+    with output.open("a") as fh:
+        fh.write('{"id": "trunc')  # simulate a crash mid-write
+
+    summary = run_batch([ads], output, workers=1)
+
+    assert summary["documents"] == 0
+    assert len(load_checkpoint(output)) == 2
+    assert output.read_text().endswith("\n")
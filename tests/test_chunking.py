@@ -0,0 +1,79 @@
+import pytest
+
+from utils.chunking import estimate_tokens, merge_chunk_fields, split_sections
+
+AD = """Senior Data Scientist (m/w/d)
+ACME GmbH, Berlin
+
+Ihre Aufgaben:
+- Modelle entwickeln
+- Daten analysieren
+
+## Ihr Profil
+- Python und SQL
+- 5 Jahre Erfahrung
+
+Benefits:
+- 30 Tage Urlaub
+- Jobticket
+
+Bewerbung an jobs@acme.de"""
+
+
+def test_split_sections_keeps_short_text_in_one_chunk():
+    assert split_sections(AD) == [AD]
+
+
+def test_split_sections_cuts_at_section_boundaries():
+    chunks = split_sections(AD, max_tokens=25)
+    assert all(estimate_tokens(chunk) <= 25 for chunk in chunks)
+    assert chunks[1] == "Ihre Aufgaben:\n- Modelle entwickeln\n- Daten analysieren"
+    # Small neighbouring sections share a chunk.
+    assert chunks[2].startswith("## Ihr Profil") and "\n\nBenefits:\n" in chunks[2]
+    assert [c.split("\n")[0] for c in split_sections(AD, max_tokens=15)] == [
+        "Senior Data Scientist (m/w/d)",
+        "Ihre Aufgaben:",
+        "## Ihr Profil",
+        "Benefits:",
+        "Bewerbung an jobs@acme.de",
+    ]
+    # No section is lost or duplicated.
+    assert " ".join(chunks).split() == AD.split()
+
+
+def test_split_sections_splits_overlong_sections():
+    text = "\n".join(f"Zeile {i} mit etwas Text" for i in range(200))
+    chunks = split_sections(text, max_tokens=50)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 50 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+    word = "x" * 1000
+    assert all(estimate_tokens(c) <= 50 for c in split_sections(word, max_tokens=50))
+
+
+def test_split_sections_rejects_empty_budget():
+    with pytest.raises(ValueError):
+        split_sections(AD, max_tokens=0)
+
+
+def test_merge_chunk_fields_resolves_conflicts():
+    merged = merge_chunk_fields(
+        [
+            {"job_title": "Data Scientist", "city": "Berlin", "skills": ["Python"]},
+            {"job_title": "", "city": "München", "skills": ["SQL", "Python"]},
+            {"city": "münchen ", "benefits": ["Jobticket"], "salary": {"max": 70}},
+            {"salary": {"min": 60, "max": 70}},
+        ]
+    )
+    assert merged == {
+        "job_title": "Data Scientist",
+        "city": "München",
+        "skills": ["Python", "SQL"],
+        "benefits": ["Jobticket"],
+        "salary": {"max": 70, "min": 60},
+    }
+
+
+def test_merge_chunk_fields_prefers_earliest_chunk_on_tie():
+    merged = merge_chunk_fields([{"city": "Berlin"}, {"city": "Hamburg"}])
+    assert merged == {"city": "Berlin"}
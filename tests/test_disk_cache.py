@@ -0,0 +1,39 @@
+from utils.disk_cache import DiskLRUCache
+
+
+def test_disk_cache_persists_across_instances(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    DiskLRUCache(path).put("abc", {"text": "Hallo", "fields": {"city": "Berlin"}})
+    assert DiskLRUCache(path).get("abc") == {
+        "text": "Hallo",
+        "fields": {"city": "Berlin"},
+    }
+    assert DiskLRUCache(path).get("missing") is None
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskLRUCache(tmp_path / "cache.sqlite3", max_bytes=30)
+    cache.put("a", "x" * 10)
+    cache.put("b", "y" * 10)
+    assert cache.get("a") == "x" * 10  # refresh "a"
+    cache.put("c", "z" * 10)
+    assert cache.get("b") is None
+    assert cache.get("a") == "x" * 10
+    assert cache.get("c") == "z" * 10
+
+
+def test_disk_cache_update_is_atomic(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    path = tmp_path / "cache.sqlite3"
+
+    def append(i):
+        # A separate instance per call, like separate server processes.
+        DiskLRUCache(path).update("keys", lambda old: (old or []) + [i])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(append, range(50)))
+    cache = DiskLRUCache(path)
+    assert sorted(cache.get("keys")) == list(range(50))
+    assert cache.update("keys", lambda old: None) is not None
+    assert cache.get("keys") is None
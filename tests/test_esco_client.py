@@ -8,7 +8,8 @@ def test_get_skills_for_job_title():
     related_resp = {
         "_embedded": {"hasEssentialSkill": [{"title": "Skill A"}, {"title": "Skill B"}]}
     }
-    with patch("utils.esco_client.requests.get") as mock_get:
+    with patch("utils.esco_client.get_session") as mock_session:
+        mock_get = mock_session.return_value.get
         mock_get.side_effect = [
             Mock(status_code=200, json=lambda: search_resp),
             Mock(status_code=200, json=lambda: related_resp),
@@ -20,7 +21,8 @@ def test_get_skills_for_job_title():
 def test_get_tasks_for_job_title():
     search_resp = {"_embedded": {"results": [{"uri": "http://example.com/occ"}]}}
     occupation_resp = {"description": {"en": {"literal": "Task one. Task two. Other."}}}
-    with patch("utils.esco_client.requests.get") as mock_get:
+    with patch("utils.esco_client.get_session") as mock_session:
+        mock_get = mock_session.return_value.get
         mock_get.side_effect = [
             Mock(status_code=200, json=lambda: search_resp),
             Mock(status_code=200, json=lambda: occupation_resp),
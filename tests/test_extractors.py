@@ -0,0 +1,179 @@
+from io import BytesIO
+
+import pytest
+
+from utils import extractors
+
+
+def test_get_backend_picks_fastest_registered(monkeypatch):
+    monkeypatch.setattr(extractors, "_BACKENDS", {})
+    monkeypatch.setattr(extractors, "_SAMPLES", {})
+    monkeypatch.setattr(extractors, "_SELECTED", {})
+
+    @extractors.register_extractor("demo", "slow")
+    def slow(buffer):
+        for _ in range(20000):
+            pass
+        yield str(buffer, "utf-8")
+
+    @extractors.register_extractor("demo", "fast")
+    def fast(buffer):
+        yield str(buffer, "utf-8")
+
+    @extractors.register_extractor("demo", "broken")
+    def broken(buffer):
+        raise RuntimeError("missing dependency")
+        yield ""
+
+    extractors.register_benchmark_sample("demo")(lambda: b"sample")
+
+    assert set(extractors.benchmark_backends("demo")) == {"slow", "fast"}
+    assert extractors.get_backend("demo") is fast
+    assert list(extractors.iter_chunks(BytesIO(b"abc"), "demo")) == ["abc"]
+
+    extractors.select_backend("demo", "slow")
+    assert extractors.get_backend("demo") is slow
+
+
+def test_get_backend_rejects_unknown_type():
+    with pytest.raises(ValueError):
+        extractors.get_backend("exe")
+
+
+def test_pdf_uses_pymupdf_only():
+    import fitz
+
+    assert extractors.available_backends("pdf") == ["pymupdf"]
+    with fitz.open() as doc:
+        doc.new_page().insert_text((72, 72), "Jobtitel: Data Scientist")
+        sample = doc.tobytes()
+    text = "".join(extractors.iter_chunks(BytesIO(sample), "pdf"))
+    assert "Jobtitel: Data Scientist" in text
+
+
+def test_open_buffer_shares_memory_with_uploads():
+    upload = BytesIO(b"Jobtitel: Data Scientist")
+    with extractors.open_buffer(upload) as view:
+        assert view.readonly is False  # BytesIO exposes its own buffer
+        assert bytes(view[:8]) == b"Jobtitel"
+    upload.write(b"resizable again")  # buffer export was released
+
+
+def test_open_buffer_memory_maps_paths(tmp_path):
+    path = tmp_path / "ad.txt"
+    path.write_bytes(b"Stadt: Berlin")
+    with extractors.open_buffer(path) as view:
+        assert view.readonly is True
+        assert bytes(view) == b"Stadt: Berlin"
+    assert list(extractors.iter_chunks(str(path), "txt")) == ["Stadt: Berlin"]
+
+
+def test_buffer_reader_supports_docx(tmp_path):
+    from docx import Document
+
+    doc = Document()
+    doc.add_paragraph("Firma: ACME")
+    path = tmp_path / "ad.docx"
+    doc.save(path)
+    data = memoryview(path.read_bytes())
+    assert "Firma: ACME" in list(extractors.iter_chunks(data, "docx"))
+
+
+def test_stream_xml_docx_keeps_order_and_skips_merged_cells():
+    from docx import Document
+
+    doc = Document()
+    doc.add_paragraph("Jobtitel: Data Scientist")
+    table = doc.add_table(rows=2, cols=3)
+    table.cell(0, 0).merge(table.cell(0, 1)).text = "Firma: ACME"
+    table.cell(0, 2).merge(table.cell(1, 2)).text = "Stadt: Berlin"
+    table.cell(1, 0).text = "Vollzeit"
+    doc.add_paragraph("Experience with SQL.")
+    buffer = BytesIO()
+    doc.save(buffer)
+
+    chunks = list(extractors._docx_stream_xml(buffer.getbuffer()))
+
+    assert [c for c in chunks if c] == [
+        "Jobtitel: Data Scientist",
+        "Firma: ACME",
+        "Stadt: Berlin",
+        "Vollzeit",
+        "Experience with SQL.",
+    ]
+
+
+def test_docx_has_a_single_backend():
+    assert extractors.available_backends("docx") == ["stream-xml"]
+
+
+def test_stream_xml_docx_memory_stays_flat():
+    import tracemalloc
+
+    from docx import Document
+
+    def peak(paragraphs):
+        doc = Document()
+        for number in range(paragraphs):
+            doc.add_paragraph(f"Abschnitt {number}: Experience with Python.")
+        buffer = BytesIO()
+        doc.save(buffer)
+        tracemalloc.start()
+        for _chunk in extractors._docx_stream_xml(buffer.getbuffer()):
+            pass
+        result = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result
+
+    assert peak(5000) < 1.5 * peak(500)
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (b"%PDF-1.7\n%\xe2\xe3\xcf\xd3", "pdf"),
+        (b"{\\rtf1\\ansi Jobtitel: Koch\\par}", "rtf"),
+        (b"<!DOCTYPE html><html><body>Jobs</body></html>", "html"),
+        ("Stadt: München".encode("utf-8"), "txt"),
+        ("Stadt: München".encode("cp1252"), "txt"),
+        (b"PK\x03\x04not a word document", None),
+        (b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR", None),
+    ],
+)
+def test_sniff_file_type(data, expected):
+    assert extractors.sniff_file_type(memoryview(data)) == expected
+
+
+def test_sniff_file_type_detects_docx_container():
+    from docx import Document
+
+    buffer = BytesIO()
+    Document().save(buffer)
+    assert extractors.sniff_file_type(buffer.getbuffer()) == "docx"
+
+
+@pytest.mark.parametrize(
+    "member, expected", [("word/document.xml", "docx"), ("data.csv", None)]
+)
+def test_sniff_file_type_reads_member_list_behind_long_zip_comment(member, expected):
+    import zipfile
+
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr(member, "<w:document/>")
+        # pushes the central directory out of the last 64 KiB
+        archive.comment = b"x" * 65535
+    assert extractors.sniff_file_type(buffer.getbuffer()) == expected
+
+
+def test_text_backend_decodes_legacy_encoding():
+    data = "Stadt: München".encode("cp1252")
+    assert list(extractors.iter_chunks(data, "txt")) == ["Stadt: München"]
+
+
+def test_rtf_to_text():
+    rtf = (
+        r"{\rtf1\ansi{\fonttbl{\f0 Arial;}}{\*\generator Word;}"
+        r"\f0 Jobtitel: Koch\par Stadt: M\'fcnchen\par Caf\u233\'e9}"
+    )
+    assert extractors.rtf_to_text(rtf) == "Jobtitel: Koch\nStadt: München\nCafé"
@@ -0,0 +1,45 @@
+from utils.field_scanner import FieldScanner, build_label_index, scan_fields
+from utils.utils_jobinfo import basic_field_extraction
+
+
+def test_build_label_index_splits_language_variants():
+    index = build_label_index({"city": ("Standort (Stadt) / Job Location (City)",)})
+    assert {"standort (stadt)", "standort", "stadt", "job location", "city"} <= set(
+        index
+    )
+    assert set(index.values()) == {"city"}
+
+
+def test_scan_fields_resolves_wizard_labels():
+    text = (
+        "Stellentitel: Data Engineer\n"
+        "- Unternehmensname: ACME GmbH\n"
+        "Berichtet an - Head of Data\n"
+        "Kontakt E-Mail: jobs@acme.example\n"
+        "Urlaubstage: 30"
+    )
+    assert scan_fields(text) == {
+        "job_title": "Data Engineer",
+        "company_name": "ACME GmbH",
+        "reports_to": "Head of Data",
+        "recruitment_contact_email": "jobs@acme.example",
+        "vacation_days": "30",
+    }
+
+
+def test_scanner_first_value_wins_and_label_on_own_line():
+    scanner = FieldScanner({"city": ("Ort",), "job_title": ("Position",)})
+    text = "Position:\n\nEngineer\nOrt: Berlin\nOrt: Hamburg\nSenior-Entwickler"
+    assert scanner.scan(text) == {"job_title": "Engineer", "city": "Berlin"}
+
+
+def test_basic_field_extraction_combines_scanner_and_keywords():
+    fields = basic_field_extraction(
+        "Firma: ACME\nWebsite: https://acme.example (Karriere)\n"
+        "Beschäftigungsart: Vollzeit\nSenior role, full-time, unbefristet."
+    )
+    assert fields["company_name"] == "ACME"
+    assert fields["company_website"] == "https://acme.example"
+    assert fields["job_type"] == "Vollzeit"
+    assert fields["contract_type"] == "Unbefristet"
+    assert fields["job_level"] == "Senior"
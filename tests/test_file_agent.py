@@ -1,6 +1,6 @@
 from io import BytesIO
 
-from agents.file_agent import extract_text_from_pdf
+from agents.file_agent import extract_text_from_pdf, iter_pdf_pages
 
 
 class DummyPage:
@@ -31,9 +31,21 @@ def test_extract_text_from_pdf_closes_doc(monkeypatch):
     def fake_open(*args, **kwargs):
         return dummy_doc
 
-    import agents.file_agent as file_agent
+    import utils.extractors as extractors
 
-    monkeypatch.setattr(file_agent.fitz, "open", fake_open)
+    monkeypatch.setattr(extractors.fitz, "open", fake_open)
     text = extract_text_from_pdf(BytesIO(b"dummy"))
     assert text == "dummy"
     assert dummy_doc.closed is True
+
+
+def test_iter_pdf_pages_closes_doc_on_early_stop(monkeypatch):
+    dummy_doc = DummyDoc()
+
+    import utils.extractors as extractors
+
+    monkeypatch.setattr(extractors.fitz, "open", lambda *a, **k: dummy_doc)
+    pages = iter_pdf_pages(BytesIO(b"dummy"))
+    assert next(pages) == "dummy"
+    pages.close()
+    assert dummy_doc.closed is True
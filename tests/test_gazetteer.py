@@ -0,0 +1,70 @@
+import pytest
+
+from utils.aho_corasick import AhoCorasick, longest_matches
+from utils.gazetteer import load_skill_terms, scan_gazetteer
+from utils.utils_jobinfo import basic_field_extraction
+
+
+def test_aho_corasick_finds_overlapping_terms_in_one_pass():
+    automaton = AhoCorasick(whole_words=False)
+    for term in ("he", "she", "his", "hers"):
+        automaton.add(term, term)
+    automaton.build()
+    matches = list(automaton.iter_matches("uSHErs"))
+    assert sorted((s, e, p) for s, e, p in matches) == [
+        (1, 4, "she"),
+        (2, 4, "he"),
+        (2, 6, "hers"),
+    ]
+    assert len(automaton) == 4
+
+
+def test_aho_corasick_whole_words_and_longest():
+    automaton = AhoCorasick()
+    for term in ("java", "javascript", "machine learning", "learning"):
+        automaton.add(term, term)
+    automaton.build()
+    text = "Javascript, Java und Machine Learning; e-learning"
+    chosen = [p for _, _, p in longest_matches(automaton.iter_matches(text))]
+    assert chosen == ["javascript", "java", "machine learning", "learning"]
+
+
+def test_aho_corasick_requires_build():
+    automaton = AhoCorasick()
+    automaton.add("sql", 1)
+    with pytest.raises(ValueError):
+        list(automaton.iter_matches("sql"))
+    automaton.build()
+    with pytest.raises(ValueError):
+        automaton.add("python", 2)
+
+
+def test_scan_gazetteer_employment_terms_and_skills():
+    found = scan_gazetteer(
+        "Senior Data Engineer (Vollzeit, unbefristet) mit Python, Apache Spark "
+        "und REST APIs. Der Rest ist Teamwork."
+    )
+    assert found["job_level"] == ["Senior"]
+    assert found["job_type"] == ["Vollzeit"]
+    assert found["contract_type"] == ["Unbefristet"]
+    assert found["hard_skills"] == ["Python", "Apache Spark", "REST", "Teamwork"]
+
+
+def test_load_skill_terms_skips_comments(tmp_path):
+    path = tmp_path / "skills.txt"
+    path.write_text("# comment\nPython\n\nSQL\n", encoding="utf-8")
+    assert load_skill_terms(path) == ["Python", "SQL"]
+
+
+def test_basic_field_extraction_fills_hard_skills_from_gazetteer():
+    fields = basic_field_extraction("Wir nutzen Kubernetes, Terraform und AWS.")
+    assert fields["hard_skills"] == "Kubernetes, Terraform, AWS"
+    assert fields["must_have_skills"] == ""
+
+
+def test_scan_gazetteer_line_cache_gives_same_result():
+    text = "Senior Python Entwickler\nVollzeit, Kubernetes\nPython und SQL"
+    cache = {}
+    assert scan_gazetteer(text, cache) == scan_gazetteer(text)
+    assert "Vollzeit, Kubernetes" in cache
+    assert scan_gazetteer(text, cache) == scan_gazetteer(text)
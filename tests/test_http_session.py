@@ -0,0 +1,36 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils import http_session
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_get_session_reuses_connections(monkeypatch):
+    monkeypatch.setattr(http_session, "_session", None)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        session = http_session.get_session()
+        assert http_session.get_session() is session
+        url = f"http://127.0.0.1:{server.server_port}/search"
+        for _ in range(4):
+            assert session.get(url, timeout=5).text == "ok"
+        stats = http_session.connection_stats()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert stats == {"requests": 4, "connections": 1, "reuse_rate": 0.75}
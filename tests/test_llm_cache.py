@@ -0,0 +1,196 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from utils import llm_cache
+
+
+class FakeCreate:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        message = SimpleNamespace(content=f" answer {len(self.calls)} ")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _prompt(text):
+    return [{"role": "user", "content": text}]
+
+
+def test_cached_completion_reuses_answer(llm_disk_cache):
+    create = FakeCreate()
+    first = llm_cache.cached_completion(_prompt("Write an ad"), create=create)
+    again = llm_cache.cached_completion(_prompt("  Write\n an ad "), create=create)
+    assert first == again == "answer 1"
+    assert len(create.calls) == 1
+    assert create.calls[0]["model"] == "gpt-4o"
+
+
+def test_cache_key_includes_model_and_params():
+    messages = _prompt("Write an ad")
+    base = llm_cache.cache_key("gpt-4o", messages)
+    assert llm_cache.cache_key("gpt-4o-mini", messages) != base
+    assert llm_cache.cache_key("gpt-4o", messages, temperature=0) != base
+    assert llm_cache.cache_key("gpt-4o", messages, top_p=1, temperature=0) == (
+        llm_cache.cache_key("gpt-4o", messages, temperature=0, top_p=1)
+    )
+
+
+def test_cached_completion_expires_after_ttl(llm_disk_cache, monkeypatch):
+    create = FakeCreate()
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    llm_cache.cached_completion(_prompt("x"), create=create, ttl=60)
+    now[0] += 30
+    assert llm_cache.cached_completion(_prompt("x"), create=create, ttl=60) == (
+        "answer 1"
+    )
+    now[0] += 60
+    assert llm_cache.cached_completion(_prompt("x"), create=create, ttl=60) == (
+        "answer 2"
+    )
+
+
+def test_changed_fields_invalidate_scope(llm_disk_cache):
+    create = FakeCreate()
+    old = {"job_title": "Data Scientist"}
+    new = {"job_title": "Data Engineer"}
+    llm_cache.cached_completion(_prompt("a"), scope="job_ad", fields=old, create=create)
+    llm_cache.cached_completion(_prompt("b"), scope="job_ad", fields=new, create=create)
+    # The answer to "a" was generated from the old fields and is gone.
+    llm_cache.cached_completion(_prompt("a"), scope="job_ad", fields=new, create=create)
+    assert len(create.calls) == 3
+
+
+def test_invalidate_drops_scope_entries(llm_disk_cache):
+    create = FakeCreate()
+    fields = {"job_title": "Data Scientist"}
+    llm_cache.cached_completion(
+        _prompt("a"), scope="job_ad", fields=fields, create=create
+    )
+    llm_cache.invalidate("job_ad")
+    llm_cache.cached_completion(
+        _prompt("a"), scope="job_ad", fields=fields, create=create
+    )
+    assert len(create.calls) == 2
+
+
+class FakeStream:
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.calls = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        for piece in self.pieces:
+            delta = SimpleNamespace(content=piece)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+        yield SimpleNamespace(choices=[])
+
+
+def test_stream_completion_yields_tokens_and_caches_text(llm_disk_cache):
+    create = FakeStream(["Senior ", None, "Data ", "Scientist\n"])
+    pieces = list(llm_cache.stream_completion(_prompt("ad"), create=create))
+    assert pieces == ["Senior ", "Data ", "Scientist\n"]
+    assert create.calls[0]["stream"] is True
+    # The stored text is shared with the non-streaming entry point.
+    assert llm_cache.cached_completion(_prompt("ad"), create=FakeCreate()) == (
+        "Senior Data Scientist"
+    )
+    assert list(llm_cache.stream_completion(_prompt("ad"), create=create)) == [
+        "Senior Data Scientist"
+    ]
+    assert len(create.calls) == 1
+
+
+def test_abandoned_stream_is_not_cached(llm_disk_cache):
+    create = FakeStream(["Senior ", "Data"])
+    next(llm_cache.stream_completion(_prompt("ad"), create=create))
+    assert list(llm_cache.stream_completion(_prompt("ad"), create=create)) == [
+        "Senior ",
+        "Data",
+    ]
+    assert len(create.calls) == 2
+
+
+def test_vacancies_keep_separate_scopes(llm_disk_cache):
+    create = FakeCreate()
+    one = {"job_title": "Data Scientist"}
+    two = {"job_title": "Data Engineer"}
+    for _ in range(2):
+        for vacancy, fields in (("v1", one), ("v2", two)):
+            llm_cache.cached_completion(
+                _prompt(fields["job_title"]),
+                scope="job_ad",
+                vacancy=vacancy,
+                fields=fields,
+                create=create,
+            )
+    assert len(create.calls) == 2
+    llm_cache.invalidate("job_ad", vacancy="v1")
+    llm_cache.cached_completion(
+        _prompt("Data Engineer"),
+        scope="job_ad",
+        vacancy="v2",
+        fields=two,
+        create=create,
+    )
+    assert len(create.calls) == 2
+
+
+def test_parallel_stores_keep_every_scope_key(llm_disk_cache):
+    from concurrent.futures import ThreadPoolExecutor
+
+    fields = {"job_title": "Data Scientist"}
+
+    def generate(i):
+        llm_cache.cached_completion(
+            _prompt(f"prompt {i}"), scope="job_ad", fields=fields, create=FakeCreate()
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(generate, range(40)))
+    assert len(llm_disk_cache.get("scope:job_ad")["keys"]) == 40
+    llm_cache.invalidate("job_ad")
+    key = llm_cache.cache_key("gpt-4o", _prompt("prompt 7"))
+    assert llm_disk_cache.get(key) is None
+
+
+def test_savings_are_only_computed_for_sent_prompts(llm_disk_cache, monkeypatch):
+    from utils import prompt_encoding
+
+    counted = []
+    monkeypatch.setattr(
+        prompt_encoding, "prompt_savings", lambda *a, **k: counted.append(a) or (2, 1)
+    )
+    prompt = prompt_encoding.render_prompt(
+        "Write an ad:\n{data}", {"job_title": "Data Scientist"}
+    )
+    create = FakeCreate()
+    llm_cache.cached_completion(_prompt(prompt), create=create)
+    llm_cache.cached_completion(_prompt(prompt), create=create)
+    assert len(create.calls) == 1
+    assert len(counted) == 1
+
+
+def test_async_cache_lookup_does_not_block_the_event_loop(monkeypatch):
+    released = threading.Event()
+
+    def lookup(*args):
+        # only set by a coroutine, so this waits in vain on the event loop
+        assert released.wait(5)
+        return "cached"
+
+    async def release():
+        released.set()
+
+    async def main():
+        return await asyncio.gather(
+            llm_cache.cached_completion_async(_prompt("a"), create=None),
+            release(),
+        )
+
+    monkeypatch.setattr(llm_cache, "_lookup", lookup)
+    assert asyncio.run(main())[0] == "cached"
@@ -0,0 +1,229 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils import openai_client
+
+
+def _completion(content):
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }
+        ],
+    }
+
+
+def _tool_call(arguments):
+    completion = _completion(None)
+    completion["choices"][0]["message"]["tool_calls"] = [
+        {
+            "id": "call_1",
+            "type": "function",
+            "function": {
+                "name": "extract_job_fields",
+                "arguments": json.dumps(arguments),
+            },
+        }
+    ]
+    return completion
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Status codes returned before the successful answer.
+    failures = []
+    requests = []
+    # Builds the tool call arguments from the request; plain text if unset.
+    extract = None
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        type(self).requests.append((self.path, json.loads(body)))
+        if type(self).failures:
+            self.send_response(type(self).failures.pop(0))
+            self.send_header("retry-after-ms", "1")
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+            return
+        request = json.loads(body)
+        if type(self).extract and request.get("tools"):
+            answer = _tool_call(type(self).extract(request))
+        else:
+            answer = _completion("Hallo")
+        payload = json.dumps(answer).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_api(monkeypatch):
+    StubHandler.failures = []
+    StubHandler.requests = []
+    StubHandler.extract = None
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    monkeypatch.setattr(openai_client, "_client", None)
+    yield StubHandler
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_is_created_lazily_and_shared(stub_api):
+    assert openai_client._client is None
+    client = openai_client.get_client()
+    assert openai_client.get_client() is client
+    scoped = openai_client.get_client(timeout=5)
+    assert scoped.timeout == 5
+    assert scoped._client is client._client
+    assert client.max_retries == openai_client.MAX_RETRIES
+
+
+def test_client_retries_rate_limits_and_server_errors(stub_api):
+    stub_api.failures = [429, 503]
+    response = openai_client.get_client().chat.completions.create(
+        model="gpt-4o", messages=[{"role": "user", "content": "Hi"}]
+    )
+    assert response.choices[0].message.content == "Hallo"
+    assert [path for path, _ in stub_api.requests] == ["/v1/chat/completions"] * 3
+
+
+def test_cached_completion_uses_shared_client(stub_api, tmp_path, monkeypatch):
+    from utils import llm_cache
+    from utils.disk_cache import DiskLRUCache
+
+    cache = DiskLRUCache(tmp_path / "llm.sqlite3")
+    monkeypatch.setattr(llm_cache, "_llm_cache", lambda: cache)
+    messages = [{"role": "user", "content": "Write an ad"}]
+    assert llm_cache.cached_completion(messages, temperature=0) == "Hallo"
+    assert stub_api.requests[0][1]["temperature"] == 0
+
+
+def test_function_calling_extracts_all_chunks_in_parallel(monkeypatch):
+    import threading
+    import time
+
+    seen = []
+    lock = threading.Lock()
+    active = peak = 0
+
+    def fake_extract(text, language, model, **options):
+        nonlocal active, peak
+        with lock:
+            seen.append(text)
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.1)
+        with lock:
+            active -= 1
+        if "Benefits" in text:
+            return {"benefits": ["Jobticket"], "job_title": "Data Scientist"}, 0, 0
+        return {"job_title": "Data Scientist", "city": "Berlin"}, 0, 0
+
+    monkeypatch.setattr(openai_client, "_extract_chunk", fake_extract)
+    sections = [f"Abschnitt {i}:\n" + "Text " * 150 for i in range(5)]
+    text = "\n\n".join(sections + ["Benefits:\n- Jobticket"])
+
+    fields = openai_client.call_extract_fields_function_calling(text, max_tokens=300)
+
+    assert len(seen) > 2
+    assert peak > 1
+    assert any("Jobticket" in chunk for chunk in seen)
+    assert fields == {
+        "job_title": "Data Scientist",
+        "city": "Berlin",
+        "benefits": ["Jobticket"],
+    }
+
+
+def test_function_calling_reports_errors(monkeypatch):
+    def failing(text, language, model, **options):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(openai_client, "_extract_chunk", failing)
+    assert openai_client.call_extract_fields_function_calling("x") == {"error": "boom"}
+
+
+def test_function_schema_declares_the_job_fields():
+    properties = openai_client._EXTRACT_FUNCTION["parameters"]["properties"]
+    assert "text" not in properties
+    assert "uploaded_file" not in properties
+    assert properties["job_title"]["type"] == "string"
+    assert properties["role_type"]["type"] == "array"
+    assert properties["vacation_days"]["type"] == "number"
+    assert "Vollzeit (Full-time)" in properties["job_type"]["description"]
+
+
+def test_extraction_request_limits_keys_and_encodes_known_fields():
+    request = openai_client.extraction_request(
+        "Wir suchen in Berlin.",
+        model="gpt-4o-mini",
+        keys=["city", "work_location_city", "uploaded_file"],
+        known={"job_title": "Data Scientist", "hard_skills": ["SQL", "SQL"]},
+    )
+    schema = request["tools"][0]["function"]["parameters"]["properties"]
+    # keys without a wizard field, or never extracted, are not requested
+    assert list(schema) == ["city"]
+    content = request["messages"][-1]["content"]
+    assert "job_title: Data Scientist\nhard_skills: SQL\n" in content
+    assert content.endswith("Wir suchen in Berlin.")
+    assert request["model"] == "gpt-4o-mini"
+
+
+def test_function_calling_merges_fields_from_every_section(stub_api):
+    def extract(request):
+        chunk = request["messages"][-1]["content"]
+        fields = {}
+        if "Data Scientist" in chunk:
+            fields.update(job_title="Data Scientist", city="Berlin")
+        if "Python" in chunk:
+            fields.update(hard_skills="Python, SQL", role_type=["Technisch"])
+        if "Urlaub" in chunk:
+            fields.update(vacation_days=30, job_title="Data Scientist")
+        if "Bewerbung" in chunk:
+            fields["application_instructions"] = "Bewerbung über das Portal"
+        return fields
+
+    stub_api.extract = extract
+    filler = "Wir bieten spannende Aufgaben im Team. " * 40
+    text = "\n\n".join(
+        [
+            "Data Scientist (m/w/d) in Berlin",
+            "Profil:\n" + filler + "Python und SQL",
+            "Benefits:\n" + filler + "30 Tage Urlaub",
+            "Bewerbung:\n" + filler + "Bewerbung über das Portal",
+        ]
+    )
+    fields = openai_client.call_extract_fields_function_calling(
+        text, language="en", max_tokens=300
+    )
+
+    assert len(stub_api.requests) > 2
+    request = stub_api.requests[0][1]
+    assert "English" in request["messages"][0]["content"]
+    assert fields == {
+        "job_title": "Data Scientist",
+        "city": "Berlin",
+        "hard_skills": "Python, SQL",
+        "role_type": ["Technisch"],
+        "vacation_days": 30,
+        "application_instructions": "Bewerbung über das Portal",
+    }
@@ -2,6 +2,7 @@ from functions.processors import (
     update_bonus_scheme,
     update_commission_structure,
     update_publication_channels,
+    update_salary_range,
     update_translation_required,
 )
 
@@ -31,3 +32,14 @@ def test_update_translation_required():
     }
     update_translation_required(state)
     assert state["translation_required"] == "No"
+
+
+def test_update_salary_range_keeps_stated_amounts():
+    state = {"salary_range": "€4.500/Monat"}
+    update_salary_range(state)
+    assert state["salary_range"] == "€4.500/Monat"
+
+    for value in ("Competitive", "nach Vereinbarung, 40 Stunden/Woche"):
+        state = {"salary_range": value}
+        update_salary_range(state)
+        assert state["salary_range"] == "45000 – 55000 EUR"
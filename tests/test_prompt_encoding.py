@@ -0,0 +1,59 @@
+import logging
+
+from utils import prompt_encoding
+from utils.prompt_encoding import (
+    count_tokens,
+    encode_fields,
+    log_prompt_savings,
+    render_prompt,
+)
+
+FIELDS = {
+    "job_title": "Data Scientist",
+    "role_purpose": "",
+    "work_location_city": "  Berlin \n",
+    "industry": None,
+    "hard_skills": ["Python", "SQL", "python", ""],
+    "must_have_skills": "Python, SQL",
+    "salary_range_min": "60000",
+    "salary_range_max": "",
+}
+
+
+def test_encode_fields_drops_empty_values_and_shortens_labels():
+    assert encode_fields(FIELDS) == (
+        "job_title: Data Scientist\n"
+        "city: Berlin\n"
+        "hard_skills: Python, SQL\n"
+        "must_skills: =hard_skills\n"
+        "salary_min: 60000"
+    )
+
+
+def test_encode_fields_keeps_labels_unique():
+    encoded = encode_fields({"work_location_city": "Berlin", "city": "Potsdam"})
+    assert encoded == "work_location_city: Berlin\ncity: Potsdam"
+
+
+def test_encode_fields_is_stable():
+    assert encode_fields(dict(FIELDS)) == encode_fields(FIELDS)
+    assert encode_fields({}) == ""
+
+
+def test_render_prompt_logs_token_savings_when_sent(caplog):
+    template = "Write a job ad for {target}:\n{data}"
+    with caplog.at_level(logging.INFO, logger=prompt_encoding.__name__):
+        prompt = render_prompt(template, FIELDS, name="job_ad", target="Berlin")
+        assert not caplog.records
+        log_prompt_savings(prompt)
+    assert prompt.startswith("Write a job ad for Berlin:\njob_title: Data Scientist")
+    raw = template.format(data=FIELDS, target="Berlin")
+    assert count_tokens(prompt) < count_tokens(raw)
+    message = caplog.records[-1].getMessage()
+    assert message.startswith("Prompt job_ad: ")
+    assert f"instead of {count_tokens(raw)}" in message
+
+
+def test_count_tokens_falls_back_to_estimate(monkeypatch):
+    monkeypatch.setattr(prompt_encoding, "tiktoken", None)
+    assert count_tokens("x" * 10) == 3
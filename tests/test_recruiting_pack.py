@@ -0,0 +1,60 @@
+import pytest
+
+from tests.fakes import DELAYS, FakeAsyncClient
+from utils import recruiting_pack
+from utils.keys import GENERATED_KEYS
+
+pytestmark = pytest.mark.usefixtures("llm_disk_cache")
+
+
+def test_artifacts_cover_generated_keys():
+    assert sorted(recruiting_pack.ARTIFACTS) == sorted(GENERATED_KEYS)
+
+
+def test_generate_pack_runs_prompts_concurrently():
+    client = FakeAsyncClient(DELAYS)
+    store = {}
+    order = []
+    values = {"job_title": "Data Scientist"}
+
+    results = recruiting_pack.generate_pack_sync(
+        values,
+        client=client,
+        store=store,
+        on_result=lambda r, done, total: order.append(r.key),
+    )
+
+    # One wave: every prompt is in flight at the same time.
+    assert client.peak == len(GENERATED_KEYS) == recruiting_pack.PACK_CONCURRENCY
+    assert [r.key for r in results] == GENERATED_KEYS
+    assert order[-1] == "generated_job_ad"
+    assert store["generated_job_ad"] == "Write"
+    assert store["generated_boolean_query"] == "As"
+
+
+def test_generate_pack_bounds_parallelism_and_reports_errors():
+    client = FakeAsyncClient(DELAYS, fail=("persona",))
+    store = {}
+    results = recruiting_pack.generate_pack_sync(
+        {}, concurrency=2, client=client, store=store
+    )
+    assert client.peak == 2
+    failed = [r for r in results if r.error]
+    assert [r.key for r in failed] == ["target_group_analysis"]
+    assert "target_group_analysis" not in store
+    assert len(store) == 4
+
+
+def test_generate_pack_serves_cached_artifacts():
+    client = FakeAsyncClient(DELAYS)
+    values = {"job_title": "Data Scientist"}
+    recruiting_pack.generate_pack_sync(values, client=client)
+    recruiting_pack.generate_pack_sync(values, client=client)
+    assert client.calls == len(GENERATED_KEYS)
+    recruiting_pack.generate_pack_sync({"job_title": "Data Engineer"}, client=client)
+    assert client.calls == 2 * len(GENERATED_KEYS)
+
+
+def test_generate_pack_rejects_unknown_keys():
+    with pytest.raises(ValueError):
+        recruiting_pack.generate_pack_sync({}, keys=["job_title"], client=object())
@@ -0,0 +1,116 @@
+import random
+import time
+
+import pytest
+
+import tools
+from utils import safe_regex, salary, utils_jobinfo
+from utils.safe_regex import (
+    TimeBudget,
+    _slices,
+    compile_safe,
+    is_linear,
+    safe_finditer,
+)
+from utils.utils_jobinfo import basic_field_extraction
+
+# Inputs that drive backtracking engines into quadratic behaviour.
+ADVERSARIAL = {
+    "skill_triggers": "experience with a ",
+    "salary_labels": "Gehalt ",
+    "label_separators": "Ort:",
+    "empty_labels": "Jobtitel:\n",
+    "line_hyphens": "a-\n",
+    "abbreviations": "e. g",
+    "blank_lines": " \n",
+}
+# Every pattern compiled with compile_safe for the extraction.
+EXTRACTION_PATTERNS = {
+    "skills": utils_jobinfo._SKILL_RE,
+    "salary": salary._SALARY_RE,
+    "period": salary._PERIOD_RE,
+    "basis": salary._BASIS_RE,
+    "salary_line": tools.SALARY_LINE_PATTERN,
+}
+FUZZ_TOKENS = ["experience with", "Gehalt", ":", "-", "\n", " ", "e.g.", "(", "a"]
+
+
+class CountingPattern:
+    """Records the length of every slice handed to the regex engine."""
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.slices = []
+
+    def finditer(self, text):
+        self.slices.append(len(text))
+        return self.pattern.finditer(text)
+
+
+def _fuzz_text(size, seed):
+    rng = random.Random(seed)
+    return "".join(rng.choice(FUZZ_TOKENS) for _ in range(size))
+
+
+# Wall-clock scaling on these inputs is measured by benchmarks/bench_redos.py;
+# the tests check the work bound deterministically.
+@pytest.mark.parametrize(
+    "text",
+    [unit * 4000 for unit in ADVERSARIAL.values()]
+    + [_fuzz_text(8000, seed) for seed in range(3)],
+    ids=list(ADVERSARIAL) + [f"fuzz{seed}" for seed in range(3)],
+)
+def test_engine_sees_each_character_once_in_bounded_slices(text):
+    pattern = CountingPattern(compile_safe(r"(?i)experience with\s+([^.\n]{1,300})"))
+    list(safe_finditer(pattern, text, TimeBudget(None)))
+    assert sum(pattern.slices) == len(text)
+    assert max(pattern.slices) <= safe_regex.MAX_SLICE_CHARS
+
+
+@pytest.mark.parametrize("unit", ADVERSARIAL.values(), ids=ADVERSARIAL.keys())
+def test_exhausted_budget_stops_adversarial_extraction(unit):
+    budget = TimeBudget(0)
+    time.sleep(0.001)
+    fields = basic_field_extraction(unit * 4000, budget=budget)
+    assert budget.exhausted
+    assert fields["must_have_skills"] == ""
+
+
+@pytest.mark.parametrize(
+    "pattern", EXTRACTION_PATTERNS.values(), ids=EXTRACTION_PATTERNS.keys()
+)
+def test_extraction_patterns_stay_linear(pattern):
+    assert is_linear(pattern.pattern)
+
+
+@pytest.mark.parametrize(
+    "pattern", EXTRACTION_PATTERNS.values(), ids=EXTRACTION_PATTERNS.keys()
+)
+def test_extraction_patterns_compile_under_re2(pattern):
+    re2 = pytest.importorskip("re2")
+    re2.compile(pattern.pattern)
+
+
+@pytest.mark.parametrize(
+    "pattern", [r"(a+)+$", r"(?:\w+\s?)*$", r"(?:x|y\s*)*z", r"(a)\1", r"(?<=x)y"]
+)
+def test_is_linear_rejects_backtracking_constructs(pattern):
+    assert not is_linear(pattern)
+
+
+def test_safe_finditer_stops_when_budget_expires():
+    budget = TimeBudget(0)
+    time.sleep(0.001)
+    assert list(safe_finditer(compile_safe("a"), "aaa", budget)) == []
+    assert budget.exhausted
+
+
+def test_slices_prefer_line_breaks():
+    assert list(_slices("abc\ndef\nghijkl", 9)) == ["abc\ndef\n", "ghijkl"]
+    assert list(_slices("abcdefgh", 3)) == ["abc", "def", "gh"]
+
+
+def test_compile_safe_falls_back_to_re(monkeypatch):
+    monkeypatch.setattr(safe_regex, "re2", None)
+    pattern = compile_safe(r"(?i)gehalt (\d{4,6})")
+    assert [m.group(1) for m in safe_finditer(pattern, "GEHALT 50000")] == ["50000"]
@@ -0,0 +1,73 @@
+import math
+
+import pytest
+
+from utils.salary import SalaryInfo, parse_amount, parse_salaries, parse_salary
+from utils.utils_jobinfo import basic_field_extraction
+
+CASES = {
+    "45k": SalaryInfo(45000, 45000),
+    "45.000": SalaryInfo(45000, 45000),
+    "€4.500/Monat": SalaryInfo(4500, 4500, "EUR", "month"),
+    "50.000 - 60.000 EUR brutto p.a.": SalaryInfo(50000, 60000, "EUR", "year", "gross"),
+    "45-55k": SalaryInfo(45000, 55000),
+    "$120,000 - $150,000 per year": SalaryInfo(120000, 150000, "USD", "year"),
+    "25 $/h netto": SalaryInfo(25, 25, "USD", "hour", "net"),
+    "45.000 € - 55.000 €": SalaryInfo(45000, 55000, "EUR"),
+    "CHF 95 000": SalaryInfo(95000, 95000, "CHF"),
+    "60 Tsd. € jährlich": SalaryInfo(60000, 60000, "EUR", "year"),
+    "Competitive": SalaryInfo(),
+}
+
+
+@pytest.mark.parametrize("text, expected", CASES.items())
+def test_parse_salary(text, expected):
+    assert parse_salary(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Salary review after 6 months", SalaryInfo()),
+        ("Gehalt: nach Vereinbarung, 40 Stunden/Woche", SalaryInfo()),
+        ("Salary after 3 months: 52.000 EUR", SalaryInfo(52000, 52000, "EUR")),
+        ("Gehalt: 4500", SalaryInfo(4500, 4500)),
+        ("Salary: 45-55k", SalaryInfo(45000, 55000)),
+        ("Stundenlohn 25 €", SalaryInfo(25, 25, "EUR", "hour")),
+    ],
+)
+def test_parse_salary_strict_skips_numbers_that_are_not_pay(text, expected):
+    assert parse_salary(text, strict=True) == expected
+
+
+@pytest.mark.parametrize(
+    "number, value",
+    [("45.000", 45000), ("45,000", 45000), ("4.500,50", 4500.5), ("45,5", 45.5)],
+)
+def test_parse_amount(number, value):
+    assert parse_amount(number) == value
+
+
+def test_annualized_converts_period():
+    assert parse_salary("4.000 €/Monat").annualized() == SalaryInfo(
+        48000, 48000, "EUR", "year"
+    )
+
+
+def test_parse_salaries_matches_scalar_parser():
+    frame = parse_salaries(list(CASES) * 50)
+    assert len(frame) == len(CASES) * 50
+    for (_, row), expected in zip(frame.iterrows(), CASES.values()):
+        for key, value in vars(expected).items():
+            if value is None:
+                assert row[key] is None or (
+                    isinstance(row[key], float) and math.isnan(row[key])
+                )
+            else:
+                assert row[key] == value
+
+
+def test_basic_field_extraction_fills_currency_from_salary():
+    fields = basic_field_extraction("Gehaltsspanne: 50.000 - 60.000 € brutto")
+    assert fields["salary_range"] == "50.000 - 60.000 € brutto"
+    assert fields["currency"] == "EUR"
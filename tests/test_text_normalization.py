@@ -0,0 +1,45 @@
+from unittest.mock import patch
+
+from utils import text_normalization
+from utils.text_normalization import normalize_text, remember_normalized
+from utils.utils_jobinfo import basic_field_extraction
+
+
+def test_normalize_text_single_pass_rules():
+    text = (
+        "Soft\u00adware-Ent-\n  wicklung  in\tKöln \n\n Kenntnisse z. B. SQL, e.g., Python"
+    )
+    assert normalize_text(text) == (
+        "Software-Entwicklung in Köln\n\nKenntnisse SQL, Python"
+    )
+
+
+def test_normalize_text_keeps_capitalised_hyphenation_and_applies_nfkc():
+    assert normalize_text("E-\nMail \ufb01nance") == "E-\nMail finance"
+
+
+def test_normalize_text_keeps_hyphen_before_conjunctions():
+    text = "Daten-\nund Analyseplattform, Vor-\noder Nachname, Front-\nand Backend"
+    assert normalize_text(text) == text
+    assert normalize_text("Daten-\nundurchlässig") == "Datenundurchlässig"
+
+
+def test_normalize_text_is_memoised():
+    text = "Unternehmen:  ACME  GmbH"
+    first = normalize_text(text)
+    with patch.object(text_normalization, "_NORMALIZE_RE") as pattern:
+        assert normalize_text(text) == first
+    pattern.sub.assert_not_called()
+
+
+def test_remember_normalized_is_reused():
+    remember_normalized("raw text ##", "cached text")
+    assert normalize_text("raw text ##") == "cached text"
+
+
+def test_basic_field_extraction_uses_normalized_text():
+    text = "Jobtitel:  Daten\u00adanalyst\nExperience with SQL (e.g. Postgres) and Python."
+    fields = basic_field_extraction(text)
+    assert fields["job_title"] == "Datenanalyst"
+    assert fields["must_have_skills"] == "SQL, Postgres, Python"
+    assert fields["parsed_data_raw"] == text
@@ -0,0 +1,143 @@
+import itertools
+import logging
+
+import pytest
+
+from utils import openai_client, tiered_extraction
+from utils.tiered_extraction import FieldValue, extract_tiered, gazetteer_values
+
+AD = (
+    "Data Scientist bei ACME in Berlin. Python, SQL und Docker. Sie entwickeln Modelle."
+)
+KEYS = ["job_title", "company_name", "city", "hard_skills", "role_description"]
+
+
+class FakeModels:
+    def __init__(self, answers):
+        self.answers = answers
+        self.calls = []
+
+    def __call__(self, text, keys, *, model, language, known):
+        self.calls.append((model, keys, dict(known)))
+        data = {key: self.answers[model].get(key, "") for key in keys}
+        return data, 500, 40
+
+
+def test_confident_rules_skip_the_models():
+    rules = {key: FieldValue(key.upper(), 0.9) for key in KEYS}
+    models = FakeModels({})
+    result = extract_tiered(AD, KEYS, rules, extract=models)
+    assert models.calls == []
+    assert result.values() == {key: key.upper() for key in KEYS}
+    rules_stats = result.stats[0]
+    assert (rules_stats.name, rules_stats.filled) == ("rules", 5)
+    assert rules_stats.saved_cost > 0 and rules_stats.saved_seconds > 0
+
+
+def test_small_model_handles_simple_leftovers_and_large_the_rest():
+    rules = {
+        "job_title": FieldValue("Data Scientist", 0.95),
+        "city": FieldValue("Berlin, Hamburg", 0.6),
+        "hard_skills": FieldValue("Python, SQL", 0.8),
+    }
+    models = FakeModels(
+        {
+            "gpt-4o-mini": {"city": "Berlin"},
+            "gpt-4o": {"company_name": "ACME", "role_description": "Modelle"},
+        }
+    )
+    result = extract_tiered(AD, KEYS, rules, extract=models)
+
+    confident = {"job_title": "Data Scientist", "hard_skills": "Python, SQL"}
+    assert models.calls == [
+        ("gpt-4o-mini", ["company_name", "city"], confident),
+        (
+            "gpt-4o",
+            ["company_name", "role_description"],
+            {**confident, "city": "Berlin"},
+        ),
+    ]
+    assert result.values() == {
+        "job_title": "Data Scientist",
+        "hard_skills": "Python, SQL",
+        "city": "Berlin",
+        "company_name": "ACME",
+        "role_description": "Modelle",
+    }
+    assert result.fields["city"].tier == "small"
+    assert result.fields["role_description"].tier == "large"
+    small, large = result.stats[1], result.stats[2]
+    assert (small.requested, small.filled) == (2, 1)
+    assert small.cost < large.cost
+    assert small.saved_cost > 0
+    assert large.saved_cost == 0.0
+    assert large.cost == tiered_extraction.price("gpt-4o", 500, 40)
+
+
+def test_low_confidence_rule_value_is_kept_when_models_find_nothing(caplog):
+    rules = {"city": FieldValue("Berlin, Hamburg", 0.6)}
+
+    def failing(text, keys, **options):
+        raise RuntimeError("rate limited")
+
+    with caplog.at_level(logging.INFO, logger=tiered_extraction.__name__):
+        result = extract_tiered(AD, ["city"], rules, extract=failing)
+    assert result.values() == {"city": "Berlin, Hamburg"}
+    assert [s.name for s in result.stats] == ["rules", "small", "large"]
+    assert "Extraction tier small failed: rate limited" in caplog.text
+    assert "Tier large: 0/1 fields" in caplog.text
+
+
+def test_gazetteer_values_carry_confidence():
+    values = gazetteer_values(AD, {"hard_skills": "skills"})
+    assert values["skills"].confidence == tiered_extraction.GAZETTEER_CONFIDENCE
+    assert "Python" in values["skills"].value
+
+
+def test_model_tiers_use_chunked_function_calling(monkeypatch):
+    calls = []
+
+    def fake_chunk(text, language, model, *, keys, known):
+        calls.append((model, list(keys), dict(known)))
+        fields = {"city": "Berlin", "role_description": "Modelle entwickeln"}
+        return {key: fields.get(key, "") for key in keys}, 300, 20
+
+    monkeypatch.setattr(openai_client, "_extract_chunk", fake_chunk)
+    rules = {"job_title": FieldValue("Data Scientist", 0.95)}
+    result = extract_tiered(AD, ["job_title", "city", "role_description"], rules)
+
+    assert calls == [
+        ("gpt-4o-mini", ["city"], {"job_title": "Data Scientist"}),
+        (
+            "gpt-4o",
+            ["role_description"],
+            {"job_title": "Data Scientist", "city": "Berlin"},
+        ),
+    ]
+    assert result.values()["role_description"] == "Modelle entwickeln"
+    assert result.stats[1].cost == tiered_extraction.price("gpt-4o-mini", 300, 20)
+
+
+def test_extract_fields_raises_on_extraction_error(monkeypatch):
+    def failing(text, language, model, **options):
+        raise RuntimeError("timeout")
+
+    monkeypatch.setattr(openai_client, "_extract_chunk", failing)
+    with pytest.raises(RuntimeError, match="timeout"):
+        tiered_extraction.extract_fields(AD, ["city"], model="gpt-4o-mini")
+
+
+def test_rule_pass_is_timed_and_extra_rule_values_are_kept(monkeypatch):
+    clock = itertools.count(step=2.0)
+    monkeypatch.setattr(tiered_extraction.time, "perf_counter", lambda: next(clock))
+
+    def rules(text):
+        assert text == AD
+        return {
+            "city": FieldValue("Berlin", 0.9),
+            "work_location_city": FieldValue("Berlin", 0.9),
+        }
+
+    result = extract_tiered(AD, ["city"], rules, extract=FakeModels({}))
+    assert result.stats[0].seconds == 2.0
+    assert result.values() == {"city": "Berlin", "work_location_city": "Berlin"}
@@ -0,0 +1,85 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import streamlit as st
+
+import tools
+from tests.fakes import DELAYS, FakeAsyncClient
+from utils import llm_cache, openai_client, recruiting_pack
+from utils.keys import GENERATED_KEYS
+
+pytestmark = pytest.mark.usefixtures("llm_disk_cache")
+
+
+def test_generate_all_fills_every_output_and_reports_progress(monkeypatch):
+    st.session_state.clear()
+    st.session_state["job_title"] = "Data Scientist"
+    client = FakeAsyncClient(DELAYS, fail=("persona",))
+    monkeypatch.setattr(recruiting_pack, "new_async_client", lambda: client)
+    progress = MagicMock()
+
+    with (
+        patch("tools.st.button", return_value=True),
+        patch("tools.st.progress", return_value=progress),
+        patch("tools.st.error") as error,
+        patch("tools.show_adjustable_output") as show,
+    ):
+        tools.generate_all()
+
+    assert client.calls == len(GENERATED_KEYS)
+    assert client.peak == len(GENERATED_KEYS)
+    assert progress.progress.call_args.args[0] == 1.0
+    assert error.call_args.args[0] == "Candidate Persona: rate limited"
+    assert st.session_state["generated_job_ad"] == "Write"
+    shown = [c.kwargs["output_label"] for c in show.call_args_list]
+    assert shown == [
+        "Job Ad",
+        "Interview Prep Sheet",
+        "Contact Email",
+        "Boolean String",
+    ]
+    # Answers are cached under this session's vacancy scope.
+    scope = llm_cache._scope_key(
+        recruiting_pack.JOB_AD.scope, st.session_state["vacancy_id"]
+    )
+    assert llm_cache._llm_cache().get(scope)["keys"]
+
+
+def test_extract_all_fields_settles_field_map_keys_from_regex(monkeypatch):
+    calls = []
+
+    def fake_chunk(text, language, model, *, keys, known):
+        calls.append((model, list(keys)))
+        return {key: "" for key in keys}, 100, 10
+
+    monkeypatch.setattr(openai_client, "_extract_chunk", fake_chunk)
+    text = (
+        "Job Title: Data Engineer\nLocation: Berlin\n"
+        "Employment Type: Permanent\nSeniority Level: Senior\n"
+        "Sprachen: Deutsch, Englisch\nBewerbungsfrist: 31.05.\n"
+        "Gehalt: 60.000 - 70.000 EUR"
+    )
+    values = tools.extract_all_fields(text, tools.FIELD_MAP)
+
+    assert values["city"] == "Berlin"
+    assert values["contract_type"] == "Unbefristet (Permanent)"
+    assert values["job_level"] == "Senior"
+    assert values["language_requirements"] == "Deutsch, Englisch"
+    assert values["salary_range"] == "60000 - 70000"
+    assert values["currency"] == "EUR"
+    # regex keys outside FIELD_MAP are returned as before
+    assert values["application_deadline"] == "31.05."
+    assert values["work_location_city"] == "Berlin"
+    requested = {key for _, keys in calls for key in keys}
+    assert not requested & {"city", "contract_type", "job_level", "salary_range"}
+    assert not requested & {"input_url", "uploaded_file"}
+    assert requested <= openai_client.EXTRACTABLE_KEYS
+
+
+def test_regex_salary_ignores_numbers_that_are_not_pay():
+    for text in (
+        "Salary review after 6 months",
+        "Gehalt: nach Vereinbarung, 40 Stunden/Woche",
+    ):
+        assert "salary_range_min" not in tools.extract_with_regex(text)
+    assert tools.extract_with_regex("Salary: 55k")["salary_range_max"] == "55000"
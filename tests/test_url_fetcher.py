@@ -0,0 +1,92 @@
+from unittest.mock import patch
+
+import pytest
+
+from utils import url_fetcher
+from utils.disk_cache import DiskLRUCache
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=b"", headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+        self._body = body
+        self.read_bytes = 0
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self._body), chunk_size):
+            self.read_bytes += chunk_size
+            yield self._body[start : start + chunk_size]
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = DiskLRUCache(tmp_path / "urls.sqlite3")
+    monkeypatch.setattr(url_fetcher, "_url_cache", lambda: cache)
+    return cache
+
+
+def test_html_to_text_strips_markup():
+    html = (
+        "<html><head><title>x</title><style>p{}</style></head><body>"
+        "<h1>Jobtitel: Data&nbsp;Scientist</h1><script>var a;</script>"
+        "<p>Stadt:  <b>Berlin</b></p></body></html>"
+    )
+    assert url_fetcher.html_to_text(html) == "Jobtitel: Data Scientist\nStadt: Berlin"
+
+
+def test_fetch_url_text_uses_conditional_get(cache):
+    first = FakeResponse(
+        body=b"<p>Firma: ACME</p>",
+        headers={"Content-Type": "text/html", "ETag": '"v1"'},
+    )
+    with patch("utils.url_fetcher.get_session") as mock_session:
+        mock_session.return_value.get.return_value = first
+        assert url_fetcher.fetch_url_text("https://jobs.example/1") == "Firma: ACME"
+
+    with patch("utils.url_fetcher.get_session") as mock_session:
+        mock_get = mock_session.return_value.get
+        mock_get.return_value = FakeResponse(304)
+        assert url_fetcher.fetch_url_text("https://jobs.example/1") == "Firma: ACME"
+    assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+@pytest.mark.parametrize(
+    "content_type, body, expected",
+    [
+        ("text/html", "<p>Stadt: München</p>".encode("utf-8"), "Stadt: München"),
+        (
+            "text/html",
+            '<meta charset="windows-1252"><p>Größe</p>'.encode("cp1252"),
+            "Größe",
+        ),
+        ("text/html; charset=utf-8", "<p>Köln</p>".encode("utf-8"), "Köln"),
+        ("text/plain; charset=iso-8859-1", "Düren".encode("latin-1"), "Düren"),
+    ],
+)
+def test_fetch_url_text_ignores_default_latin1_without_charset(
+    cache, content_type, body, expected
+):
+    response = FakeResponse(body=body, headers={"Content-Type": content_type})
+    # what requests reports for text/* without a charset parameter
+    response.encoding = "ISO-8859-1"
+    with patch("utils.url_fetcher.get_session") as mock_session:
+        mock_session.return_value.get.return_value = response
+        assert url_fetcher.fetch_url_text("https://jobs.example/de") == expected
+
+
+def test_fetch_url_text_aborts_oversized_body(cache):
+    big = FakeResponse(body=b"x" * 500_000)
+    with patch("utils.url_fetcher.get_session") as mock_session:
+        mock_session.return_value.get.return_value = big
+        with pytest.raises(ValueError):
+            url_fetcher.fetch_url_text("https://jobs.example/big", max_bytes=100_000)
+    assert big.read_bytes < 500_000
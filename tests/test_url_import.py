@@ -0,0 +1,99 @@
+import asyncio
+
+import httpx
+import pytest
+
+from utils import url_fetcher
+from utils.disk_cache import DiskLRUCache
+from utils.url_import import import_urls
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    cache = DiskLRUCache(tmp_path / "urls.sqlite3")
+    monkeypatch.setattr(url_fetcher, "_url_cache", lambda: cache)
+    return cache
+
+
+def test_import_urls_limits_per_host_and_reports_progress():
+    active = {}
+    peak = {}
+
+    async def handler(request):
+        host = request.url.host
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(0.01)
+        active[host] -= 1
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        return httpx.Response(
+            200,
+            html=f"<p>Jobtitel: Job {request.url.path[1:]}</p><p>Stadt: Berlin</p>",
+        )
+
+    urls = [f"https://a.example/{i}" for i in range(6)]
+    urls += ["https://b.example/1", "https://b.example/missing", urls[0]]
+    progress = []
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            return await import_urls(
+                urls,
+                per_host=2,
+                client=client,
+                on_result=lambda r, done, total: progress.append((done, total)),
+            )
+
+    results = asyncio.run(run())
+
+    assert [r.url for r in results] == urls[:-1]
+    assert results[0].fields["job_title"] == "Job 0"
+    assert results[0].fields["input_url"] == urls[0]
+    assert results[-1].error
+    assert peak["a.example"] == 2
+    assert progress[-1] == (8, 8)
+
+
+def test_import_urls_enforces_deadline():
+    async def handler(request):
+        if request.url.path == "/slow":
+            await asyncio.sleep(5)
+        return httpx.Response(200, text="Firma: ACME")
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            return await import_urls(
+                ["https://c.example/fast", "https://c.example/slow"],
+                deadline=0.2,
+                client=client,
+            )
+
+    fast, slow = asyncio.run(run())
+    assert fast.fields["company_name"] == "ACME"
+    assert slow.error == "deadline exceeded"
+
+
+def test_busy_host_does_not_starve_other_hosts():
+    finished = []
+
+    async def handler(request):
+        if request.url.host == "slow.example":
+            await asyncio.sleep(0.2)
+        finished.append(str(request.url))
+        return httpx.Response(200, text="Firma: ACME")
+
+    urls = [f"https://slow.example/{i}" for i in range(3)]
+    urls.append("https://fast.example/1")
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            return await import_urls(urls, concurrency=2, per_host=1, client=client)
+
+    results = asyncio.run(run())
+    assert all(r.error is None for r in results)
+    # The fast host gets the free global slot while the slow URLs queue.
+    assert finished[0] == "https://fast.example/1"
@@ -32,3 +32,157 @@ def test_extract_text_from_docx_with_table(tmp_path):
         == "Python, machine learning libraries, scikit-learn, TensorFlow"
     )
     assert fields["parsed_data_raw"] == text
+
+
+def test_extract_fields_cached_skips_parsing_on_repeat(tmp_path, monkeypatch):
+    from io import BytesIO
+
+    import utils.utils_jobinfo as jobinfo
+    from utils.disk_cache import DiskLRUCache
+
+    cache = DiskLRUCache(tmp_path / "extraction.sqlite3")
+    monkeypatch.setattr(jobinfo, "_extraction_cache", lambda: cache)
+
+    upload = BytesIO(b"Jobtitel: Data Scientist\nStadt: Berlin")
+    upload.name = "ad.txt"
+    text, fields = jobinfo.extract_fields_cached(upload)
+    assert fields["job_title"] == "Data Scientist"
+
+    def fail(_file):
+        raise AssertionError("extract_text should not run for cached uploads")
+
+    monkeypatch.setattr(jobinfo, "extract_text", fail)
+    again = BytesIO(b"Jobtitel: Data Scientist\nStadt: Berlin")
+    again.name = "copy.txt"
+    assert jobinfo.extract_fields_cached(again) == (text, fields)
+
+
+def test_extract_fields_cached_ignores_older_extraction_versions(tmp_path, monkeypatch):
+    from io import BytesIO
+
+    import utils.utils_jobinfo as jobinfo
+    from utils.disk_cache import DiskLRUCache
+
+    cache = DiskLRUCache(tmp_path / "extraction.sqlite3")
+    monkeypatch.setattr(jobinfo, "_extraction_cache", lambda: cache)
+    content = b"Jobtitel: Data Scientist\nStadt: Berlin"
+    jobinfo.extract_fields_cached(BytesIO(content))
+
+    monkeypatch.setattr(jobinfo, "EXTRACTION_VERSION", jobinfo.EXTRACTION_VERSION + 1)
+    calls = []
+    extract = jobinfo.basic_field_extraction
+
+    def counting(text):
+        calls.append(text)
+        return extract(text)
+
+    monkeypatch.setattr(jobinfo, "basic_field_extraction", counting)
+    _, fields = jobinfo.extract_fields_cached(BytesIO(content))
+    assert fields["job_title"] == "Data Scientist"
+    assert len(calls) == 1
+
+
+def test_extract_fields_from_pages_stops_when_mandatory_filled(monkeypatch):
+    from utils import utils_jobinfo
+    from utils.utils_jobinfo import extract_fields_from_pages
+
+    consumed = []
+    scanned = []
+    extract = utils_jobinfo.basic_field_extraction
+
+    def counting(text, *args, **kwargs):
+        scanned.append(text)
+        return extract(text, *args, **kwargs)
+
+    monkeypatch.setattr(utils_jobinfo, "basic_field_extraction", counting)
+
+    def pages():
+        for page in [
+            "Jobtitel: Data Scientist\nFirma: ACME\n",
+            "Stadt: Berlin\nFull-time, unbefristet, Senior\n",
+            "Experience with SQL.\n",
+            "Brochure page\n",
+        ]:
+            consumed.append(page)
+            yield page
+
+    fields = extract_fields_from_pages(pages())
+    assert scanned == consumed[:3]
+    assert fields["job_title"] == "Data Scientist"
+    assert fields["city"] == "Berlin"
+    assert fields["job_level"] == "Senior"
+    assert fields["must_have_skills"] == "SQL"
+    assert fields["parsed_data_raw"] == "".join(consumed)
+
+
+def test_extract_fields_from_pages_respects_page_cap():
+    from utils.utils_jobinfo import extract_fields_from_pages
+
+    fields = extract_fields_from_pages(["Page one\n", "Jobtitel: Late\n"], max_pages=1)
+    assert fields["job_title"] == ""
+    # the cap only limits the field scan, never the text
+    assert fields["parsed_data_raw"] == "Page one\nJobtitel: Late\n"
+
+
+def test_extract_text_sniffs_content_instead_of_extension():
+    from io import BytesIO
+
+    import pytest
+
+    misnamed = BytesIO(b"<html><body><p>Firma: ACME</p></body></html>")
+    misnamed.name = "ad.pdf"
+    assert extract_text(misnamed) == "Firma: ACME"
+
+    image = BytesIO(b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR")
+    image.name = "ad.txt"
+    with pytest.raises(ValueError):
+        extract_text(image)
+
+
+def test_extract_fields_batch_returns_aligned_columns():
+    from utils.utils_jobinfo import extract_fields_batch
+
+    texts = [
+        "Jobtitel: Engineer\nExperience with SQL.",
+        "Ort: Berlin",
+        "Jobtitel: Engineer\nExperience with SQL.",
+    ]
+    columns = extract_fields_batch(texts)
+    assert columns["job_title"] == ["Engineer", "", "Engineer"]
+    assert columns["city"] == ["", "Berlin", ""]
+    for text, row in zip(texts, zip(*columns.values())):
+        expected = basic_field_extraction(text)
+        assert dict(zip(columns, row)) == {k: expected[k] for k in columns}
+
+
+def test_extract_fields_batch_selected_keys_as_frame():
+    from utils.utils_jobinfo import extract_fields_batch
+
+    frame = extract_fields_batch(
+        ["Firma: ACME", "Ort: Hamburg"],
+        keys=["company_name", "job_title"],
+        as_frame=True,
+    )
+    assert list(frame.columns) == ["company_name", "job_title"]
+    assert frame["company_name"].tolist() == ["ACME", ""]
+    assert frame["job_title"].tolist() == ["", ""]
+
+
+def test_extract_fields_batch_bounds_the_dedup_memory(monkeypatch):
+    from utils import utils_jobinfo
+
+    calls = []
+    extract = utils_jobinfo._extract_fields
+
+    def counting(text, *args):
+        calls.append(text)
+        return extract(text, *args)
+
+    monkeypatch.setattr(utils_jobinfo, "BATCH_DEDUP_SIZE", 2)
+    monkeypatch.setattr(utils_jobinfo, "_extract_fields", counting)
+    texts = ["Ort: A", "Ort: B", "Ort: A", "Ort: C", "Ort: B", "Ort: A"]
+    columns = utils_jobinfo.extract_fields_batch(texts)
+    assert columns["city"] == ["A", "B", "A", "C", "B", "A"]
+    # "Ort: C" evicts "Ort: B" (the repeated "Ort: A" is more recent), and
+    # extracting "Ort: B" again in turn evicts "Ort: A"
+    assert calls == ["Ort: A", "Ort: B", "Ort: C", "Ort: B", "Ort: A"]
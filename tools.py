@@ -1,10 +1,29 @@
 import streamlit as st
-import openai
-from field_map import FIELD_MAP
 import re
-import requests
-import docx
-from PyPDF2 import PdfReader
+import uuid
+from utils.extractors import iter_chunks
+from utils.field_map import field_map
+from utils.field_scanner import FieldScanner
+from utils.llm_cache import stream_completion
+from utils.openai_client import EXTRACTABLE_KEYS, get_client
+from utils.prompt_encoding import log_prompt_savings, render_prompt
+from utils.recruiting_pack import (
+    ARTIFACTS,
+    BOOLEAN_SEARCH,
+    CANDIDATE_PERSONA,
+    CONTACT_EMAIL,
+    INTERVIEW_PREP,
+    JOB_AD,
+    generate_pack_sync,
+)
+from utils.safe_regex import TimeBudget, compile_safe, safe_finditer
+from utils.salary import SalaryInfo, parse_salary
+from utils.url_fetcher import fetch_url_text
+from utils.text_normalization import normalize_text
+from utils.tiered_extraction import FieldValue, extract_tiered, gazetteer_values
+
+# Wizard fields as a list of {"key", "label", ...} entries.
+FIELD_MAP = [{"key": key, **meta} for key, meta in field_map.items()]
 
 
 def collect_fields(keys=None):
@@ -13,6 +32,28 @@ def collect_fields(keys=None):
     return {key: st.session_state.get(key, "") for key in keys}
 
 
+def vacancy_id():
+    # LLM cache scopes are kept per session, so other sessions editing other
+    # vacancies do not invalidate this one's cached answers.
+    return st.session_state.setdefault("vacancy_id", uuid.uuid4().hex)
+
+
+def stream_output(prompt, scope=None, data=None):
+    # Render tokens as they arrive, then hand the full text to the editor.
+    placeholder = st.empty()
+    with placeholder.container():
+        text = st.write_stream(
+            stream_completion(
+                [{"role": "user", "content": prompt}],
+                scope=scope,
+                vacancy=vacancy_id(),
+                fields=data,
+            )
+        )
+    placeholder.empty()
+    return (text if isinstance(text, str) else "").strip()
+
+
 def show_adjustable_output(
     output,
     regen_prompt_func,
@@ -31,93 +72,63 @@ def show_adjustable_output(
     )
     if st.button("Regenerate", key="regen_" + output_label):
         prompt = regen_prompt_func(adjusted, feedback, extra_context)
-        response = openai.chat.completions.create(
-            model="gpt-4o", messages=[{"role": "user", "content": prompt}]
-        )
         st.markdown("#### Adjusted Output")
-        st.markdown(response.choices[0].message.content.strip())
+        st.write_stream(stream_completion([{"role": "user", "content": prompt}]))
     st.caption("Edit the text or provide feedback, then regenerate.")
 
 
 def jobad_regen_prompt(adjusted, feedback, data):
-    return f"""Rewrite the following job ad with these user requests:\n\n{feedback}\n\nHere is the latest user-edited text:\n{adjusted}\n\nOriginal vacancy context (for reference):\n{data}\nReturn Markdown only."""
+    return render_prompt(
+        """Rewrite the following job ad with these user requests:\n\n{feedback}\n\nHere is the latest user-edited text:\n{adjusted}\n\nOriginal vacancy context (for reference):\n{data}\nReturn Markdown only.""",
+        data,
+        name="jobad_regen",
+        adjusted=adjusted,
+        feedback=feedback,
+    )
 
 
 def generate_job_ad():
-    keys = [
-        "job_title",
-        "role_purpose",
-        "employment_type",
-        "seniority_level",
-        "company_name",
-        "company_size",
-        "industry",
-        "work_location_city",
-        "department_name",
-        "primary_responsibilities",
-        "hard_skills",
-        "soft_skills",
-        "salary_currency",
-        "salary_range_min",
-        "salary_range_max",
-        "recruiter_email",
-    ]
-    data = collect_fields(keys)
-    prompt = f"""
-Write a concise, attractive job ad (Markdown) for the following vacancy. Use job title, role, skills, salary, location, company and recruiter contact.
-{data}
-"""
-    response = openai.chat.completions.create(
-        model="gpt-4o", messages=[{"role": "user", "content": prompt}]
-    )
-    jobad = response.choices[0].message.content.strip()
+    data = collect_fields(JOB_AD.fields)
+    prompt = JOB_AD.prompt(data)
+    jobad = stream_output(prompt, JOB_AD.scope, data)
     show_adjustable_output(
         jobad, jobad_regen_prompt, extra_context=data, output_label="Job Ad"
     )
 
 
 def boolean_regen_prompt(adjusted, feedback, data):
-    return f"""Rewrite this Boolean search string for the job, using user feedback:\n{feedback}\nUser's adjusted search:\n{adjusted}\nOriginal context:\n{data}\nReturn only the search string."""
+    return render_prompt(
+        """Rewrite this Boolean search string for the job, using user feedback:\n{feedback}\nUser's adjusted search:\n{adjusted}\nOriginal context:\n{data}\nReturn only the search string.""",
+        data,
+        name="boolean_regen",
+        adjusted=adjusted,
+        feedback=feedback,
+    )
 
 
 def generate_boolean_search():
-    keys = ["job_title", "hard_skills", "work_location_city", "industry"]
-    data = collect_fields(keys)
-    prompt = f"""
-As a sourcing expert, write an advanced Boolean search string for this role, with title, must-have skills, city, and industry. Output only the search string.
-{data}
-"""
-    response = openai.chat.completions.create(
-        model="gpt-4o", messages=[{"role": "user", "content": prompt}]
-    )
-    search = response.choices[0].message.content.strip()
+    data = collect_fields(BOOLEAN_SEARCH.fields)
+    prompt = BOOLEAN_SEARCH.prompt(data)
+    search = stream_output(prompt, BOOLEAN_SEARCH.scope, data)
     show_adjustable_output(
         search, boolean_regen_prompt, extra_context=data, output_label="Boolean String"
     )
 
 
 def interview_regen_prompt(adjusted, feedback, data):
-    return f"""Rewrite this interview sheet with user feedback:\n{feedback}\nUser's adjusted text:\n{adjusted}\nContext:\n{data}\nMarkdown only."""
+    return render_prompt(
+        """Rewrite this interview sheet with user feedback:\n{feedback}\nUser's adjusted text:\n{adjusted}\nContext:\n{data}\nMarkdown only.""",
+        data,
+        name="interview_regen",
+        adjusted=adjusted,
+        feedback=feedback,
+    )
 
 
 def generate_interview_prep_sheet():
-    keys = [
-        "job_title",
-        "hard_skills",
-        "soft_skills",
-        "primary_responsibilities",
-        "company_name",
-        "department_name",
-    ]
-    data = collect_fields(keys)
-    prompt = f"""
-Create a line manager/HR interview prep sheet (Markdown) for this role, including suggested questions for all must-have skills.
-{data}
-"""
-    response = openai.chat.completions.create(
-        model="gpt-4o", messages=[{"role": "user", "content": prompt}]
-    )
-    sheet = response.choices[0].message.content.strip()
+    data = collect_fields(INTERVIEW_PREP.fields)
+    prompt = INTERVIEW_PREP.prompt(data)
+    sheet = stream_output(prompt, INTERVIEW_PREP.scope, data)
     show_adjustable_output(
         sheet,
         interview_regen_prompt,
@@ -127,44 +138,43 @@ Create a line manager/HR interview prep sheet (Markdown) for this role, includin
 
 
 def email_regen_prompt(adjusted, feedback, data):
-    return f"""Rewrite this recruiting email with user feedback:\n{feedback}\nAdjusted text:\n{adjusted}\nContext:\n{data}\nOutput only the email."""
+    return render_prompt(
+        """Rewrite this recruiting email with user feedback:\n{feedback}\nAdjusted text:\n{adjusted}\nContext:\n{data}\nOutput only the email.""",
+        data,
+        name="email_regen",
+        adjusted=adjusted,
+        feedback=feedback,
+    )
 
 
 def draft_contact_email():
     contact_target = st.selectbox(
         "Contact Target", ["Candidate", "Line Manager", "HR", "Finance"]
     )
-    keys = ["job_title", "company_name", "department_name", "recruiter_email"]
-    data = collect_fields(keys)
-    prompt = f"""
-Draft a businesslike email for the {contact_target} about this vacancy: {data}. Subject and signature included. Use recruiter email if present.
-"""
+    data = collect_fields(CONTACT_EMAIL.fields)
+    prompt = CONTACT_EMAIL.prompt(data, contact_target=contact_target)
     if st.button("Generate Email"):
-        response = openai.chat.completions.create(
-            model="gpt-4o", messages=[{"role": "user", "content": prompt}]
-        )
-        email = response.choices[0].message.content.strip()
+        email = stream_output(prompt, CONTACT_EMAIL.scope, data)
         show_adjustable_output(
             email, email_regen_prompt, extra_context=data, output_label="Contact Email"
         )
 
 
 def persona_regen_prompt(adjusted, feedback, data):
-    return f"""Rewrite this candidate persona with feedback:\n{feedback}\nUser-edited version:\n{adjusted}\nContext:\n{data}\nMarkdown only."""
+    return render_prompt(
+        """Rewrite this candidate persona with feedback:\n{feedback}\nUser-edited version:\n{adjusted}\nContext:\n{data}\nMarkdown only.""",
+        data,
+        name="persona_regen",
+        adjusted=adjusted,
+        feedback=feedback,
+    )
 
 
 def generate_candidate_persona():
-    keys = ["job_title", "hard_skills", "soft_skills", "company_name", "industry"]
-    data = collect_fields(keys)
-    prompt = f"""
-Write a short, vivid candidate persona for this vacancy, summarizing background, motivators, where to source, what attracts.
-{data}
-"""
+    data = collect_fields(CANDIDATE_PERSONA.fields)
+    prompt = CANDIDATE_PERSONA.prompt(data)
     if st.button("Generate Persona"):
-        response = openai.chat.completions.create(
-            model="gpt-4o", messages=[{"role": "user", "content": prompt}]
-        )
-        persona = response.choices[0].message.content.strip()
+        persona = stream_output(prompt, CANDIDATE_PERSONA.scope, data)
         show_adjustable_output(
             persona,
             persona_regen_prompt,
@@ -173,13 +183,54 @@ Write a short, vivid candidate persona for this vacancy, summarizing background,
         )
 
 
+# Regenerate prompt and output label per GENERATED_KEYS slot.
+PACK_OUTPUTS = {
+    JOB_AD.key: (jobad_regen_prompt, "Job Ad"),
+    INTERVIEW_PREP.key: (interview_regen_prompt, "Interview Prep Sheet"),
+    CONTACT_EMAIL.key: (email_regen_prompt, "Contact Email"),
+    CANDIDATE_PERSONA.key: (persona_regen_prompt, "Candidate Persona"),
+    BOOLEAN_SEARCH.key: (boolean_regen_prompt, "Boolean String"),
+}
+
+
+def generate_all():
+    if st.button("Generate All"):
+        progress = st.progress(0.0)
+
+        def on_result(result, done, total):
+            label = PACK_OUTPUTS[result.key][1]
+            progress.progress(done / total, text=f"{done}/{total} {label}")
+            if result.error:
+                st.error(f"{label}: {result.error}")
+
+        generate_pack_sync(
+            st.session_state,
+            vacancy=vacancy_id(),
+            store=st.session_state,
+            on_result=on_result,
+        )
+    for key, (regen_prompt_func, label) in PACK_OUTPUTS.items():
+        if st.session_state.get(key):
+            show_adjustable_output(
+                st.session_state[key],
+                regen_prompt_func,
+                extra_context=collect_fields(ARTIFACTS[key].fields),
+                output_label=label,
+            )
+
+
 def export_vacancy_markdown():
     if st.button("Export Vacancy Profile as Markdown"):
         data = collect_fields()
-        prompt = f"""
+        prompt = render_prompt(
+            """
 Write a Markdown vacancy profile for documentation or sharing, using all available fields:\n{data}
-"""
-        response = openai.chat.completions.create(
+""",
+            data,
+            name="vacancy_markdown",
+        )
+        log_prompt_savings(prompt)
+        response = get_client().chat.completions.create(
             model="gpt-4o", messages=[{"role": "user", "content": prompt}]
         )
         md = response.choices[0].message.content.strip()
@@ -191,86 +242,149 @@ Write a Markdown vacancy profile for documentation or sharing, using all availab
 
 # ---------- PDF & DOCX TEXT EXTRACTORS ----------
 def extract_text_from_pdf(uploaded_file):
-    reader = PdfReader(uploaded_file)
-    return "\n".join(
-        page.extract_text() for page in reader.pages if page.extract_text()
-    )
+    return "\n".join(page for page in iter_chunks(uploaded_file, "pdf") if page)
 
 
 def extract_text_from_docx(uploaded_file):
-    doc = docx.Document(uploaded_file)
-    return "\n".join(para.text for para in doc.paragraphs)
+    return "\n".join(iter_chunks(uploaded_file, "docx"))
 
 
 def extract_text_from_url(url):
-    r = requests.get(url)
-    return r.text  # For advanced use, use readability-lxml to grab only article body.
+    return fetch_url_text(url)
 
 
 # ---------- REGEX PATTERNS ----------
 # Tweak/add per field and target language/format
-REGEX_PATTERNS = {
-    "job_title": r"(?:Job\s*Title|Position)\s*:?\s*(?P<job_title>[^\n,]+)",
-    "company_name": r"(?:Company|Employer)\s*:?\s*(?P<company_name>[^\n,]+)",
-    "work_location_city": r"(?:Location|Work City|Ort)\s*:?\s*(?P<work_location_city>[^\n,]+)",
-    "employment_type": r"(?:Employment Type|Vertragsart)\s*:?\s*(?P<employment_type>Permanent|Fixed-term|Internship|Freelance|Working Student)",
-    "seniority_level": r"(?:Seniority Level|Karrierelevel)\s*:?\s*(?P<seniority_level>Intern|Junior|Mid|Senior|Lead|Head|Director)",
-    "salary_range_min": r"(?:Salary|Gehalt|Vergütung)[^\d]*(?P<salary_range_min>\d{4,6})\s*(?:-|to|–)\s*\d{4,6}",
-    "salary_range_max": r"(?:Salary|Gehalt|Vergütung)[^\d]*\d{4,6}\s*(?:-|to|–)\s*(?P<salary_range_max>\d{4,6})",
-    "languages_required": r"(?:Languages Required|Sprachen)[^\n:]*:\s*(?P<languages_required>.+)",
-    "application_deadline": r"(?:Application Deadline|Bewerbungsfrist)[^\n:]*:\s*(?P<application_deadline>[^\n,]+)",
+REGEX_LABELS = {
+    "job_title": ("Job Title", "Jobtitel", "Position"),
+    "company_name": ("Company", "Employer"),
+    "work_location_city": ("Location", "Work City", "Ort"),
+    "employment_type": ("Employment Type", "Vertragsart"),
+    "seniority_level": ("Seniority Level", "Karrierelevel"),
+    "languages_required": ("Languages Required", "Sprachen"),
+    "application_deadline": ("Application Deadline", "Bewerbungsfrist"),
     # Add more per FIELD_MAP!
 }
+REGEX_SCANNER = FieldScanner(REGEX_LABELS)
+# Allowed values of option fields, matched at the start of the labelled value.
+REGEX_OPTIONS = {
+    "employment_type": re.compile(
+        r"(?i)Permanent|Fixed-term|Internship|Freelance|Working Student"
+    ),
+    "seniority_level": re.compile(r"(?i)Intern|Junior|Mid|Senior|Lead|Head|Director"),
+}
+# Line announcing the salary; amounts are read by utils.salary.parse_salary.
+SALARY_LINE_PATTERN = compile_safe(r"(?i)(?:Salary|Gehalt|Vergütung)[^\n]{0,200}")
+
+
+# Confidence of regex results by how the value was matched.
+REGEX_CONFIDENCE = {
+    "option": 0.95,  # validated against REGEX_OPTIONS
+    "salary": 0.9,  # amount with currency
+    "label": 0.85,  # complete "Label: value"
+    "list": 0.8,  # split language list
+    "truncated": 0.6,  # value cut at the first comma
+    "amount": 0.6,  # amount without currency
+}
+# Gazetteer keys used for FIELD_MAP keys the regex patterns do not cover.
+GAZETTEER_KEYS = {"hard_skills": "hard_skills"}
 
 
-def extract_with_regex(text):
+def extract_with_regex_scored(text):
+    text = normalize_text(text)
     result = {}
-    for key, pattern in REGEX_PATTERNS.items():
-        m = re.search(pattern, text, re.IGNORECASE)
-        if m and m.group(key):
-            val = m.group(key).strip()
-            if key == "languages_required":
-                val = [lang.strip() for lang in re.split(",|/|und|and", val)]
-            result[key] = val
+    for key, val in REGEX_SCANNER.scan(text).items():
+        kind = "label"
+        if key in REGEX_OPTIONS:
+            m = REGEX_OPTIONS[key].match(val)
+            if not m:
+                continue
+            val, kind = m.group(0), "option"
+        elif key == "languages_required":
+            val = [lang.strip() for lang in re.split(",|/|und|and", val)]
+            kind = "list"
+        else:
+            first = val.split(",")[0].strip()
+            if first != val.strip():
+                kind = "truncated"
+            val = first
+        if val:
+            result[key] = FieldValue(val, REGEX_CONFIDENCE[kind])
+    m = next(safe_finditer(SALARY_LINE_PATTERN, text, TimeBudget()), None)
+    salary = parse_salary(m.group(0), strict=True) if m else SalaryInfo()
+    confidence = REGEX_CONFIDENCE["salary" if salary.currency else "amount"]
+    if salary.min is not None:
+        result["salary_range_min"] = FieldValue(f"{salary.min:.0f}", confidence)
+        result["salary_range_max"] = FieldValue(f"{salary.max:.0f}", confidence)
+    if salary.currency:
+        result["salary_currency"] = FieldValue(salary.currency, confidence)
+    for key, value in gazetteer_values(text, GAZETTEER_KEYS).items():
+        result.setdefault(key, value)
     return result
 
 
-# ---------- AI Fallback ----------
-def ai_extract_fields(text, field_map):
-    # Prepare extraction schema for GPT
-    fields = "\n".join(f"- {f['label']} ({f['key']})" for f in field_map)
-    prompt = f"""Extract the following fields from this job ad (if not present, leave empty):
-{fields}
-
-Return a valid JSON object with each key. 
-Job Ad:
-{text}
-"""
-    response = openai.chat.completions.create(
-        model="gpt-4o", messages=[{"role": "user", "content": prompt}], temperature=0
-    )
-    import json
-
-    raw = response.choices[0].message.content.strip()
-    # Remove code block if needed
-    if raw.startswith("```"):
-        raw = raw.strip("```").strip("json").strip()
-    try:
-        return json.loads(raw)
-    except Exception:
-        return {}
+def extract_with_regex(text):
+    return {key: item.value for key, item in extract_with_regex_scored(text).items()}
+
+
+# FIELD_MAP option of the matched employment type / seniority level.
+OPTION_FIELDS = {
+    "employment_type": {
+        "permanent": ("contract_type", "Unbefristet (Permanent)"),
+        "fixed-term": ("contract_type", "Befristet (Temporary)"),
+        "internship": ("contract_type", "Praktikum (Internship)"),
+        "freelance": ("job_type", "Freelance"),
+        "working student": ("job_type", "Werkstudent (Working Student)"),
+    },
+    "seniority_level": {
+        "intern": ("job_level", "Einsteiger (Entry)"),
+        "junior": ("job_level", "Junior"),
+        "mid": ("job_level", "Mid-Level"),
+        "senior": ("job_level", "Senior"),
+        "lead": ("job_level", "Lead"),
+        "head": ("job_level", "Lead"),
+        "director": ("job_level", "Direktor (Director)"),
+    },
+}
+CURRENCY_OPTIONS = field_map["currency"]["options"]
+
+
+def field_map_rules(rules):
+    # The regex patterns use their own keys; add the FIELD_MAP fields they fill
+    # so confident matches settle those fields in the rules tier.
+    mapped = {}
+    if "work_location_city" in rules:
+        mapped["city"] = rules["work_location_city"]
+    for key, options in OPTION_FIELDS.items():
+        if key in rules:
+            target, option = options[rules[key].value.lower()]
+            mapped[target] = FieldValue(option, rules[key].confidence)
+    if "languages_required" in rules:
+        languages = rules["languages_required"]
+        value = ", ".join(lang for lang in languages.value if lang)
+        mapped["language_requirements"] = FieldValue(value, languages.confidence)
+    if "salary_range_min" in rules:
+        low, high = rules["salary_range_min"], rules["salary_range_max"]
+        value = low.value if low.value == high.value else f"{low.value} - {high.value}"
+        mapped["salary_range"] = FieldValue(value, low.confidence)
+    if "salary_currency" in rules:
+        currency = rules["salary_currency"]
+        value = currency.value if currency.value in CURRENCY_OPTIONS else "Other"
+        mapped["currency"] = FieldValue(value, currency.confidence)
+    return {**rules, **mapped}
+
+
+def extract_rules(text):
+    return field_map_rules(extract_with_regex_scored(text))
 
 
+# ---------- AI Fallback ----------
 def extract_all_fields(text, field_map):
-    regex_data = extract_with_regex(text)
-    # Only extract via AI for missing/ambiguous fields
-    missing_keys = [f["key"] for f in field_map if f["key"] not in regex_data]
-    if missing_keys:
-        ai_data = ai_extract_fields(
-            text, [f for f in field_map if f["key"] in missing_keys]
-        )
-        regex_data.update(ai_data)
-    return regex_data
+    # Confident regex/gazetteer values are final; the small model handles
+    # simple leftovers and the large model only sees what is still missing.
+    # Regex keys outside FIELD_MAP are returned as found.
+    keys = [f["key"] for f in field_map if f["key"] in EXTRACTABLE_KEYS]
+    return extract_tiered(text, keys, extract_rules).values()
 
 
 # ----------- PRO-TIPS -----------
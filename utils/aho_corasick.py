@@ -0,0 +1,126 @@
+"""Aho-Corasick automaton for finding many keywords in one pass."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Generic, Iterable, Iterator, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# (start, end, payload) of a match; ``text[start:end]`` is the matched term.
+Match = Tuple[int, int, T]
+
+
+def _fold(char: str) -> str:
+    """Lower-case ``char`` without changing the text length."""
+
+    lowered = char.lower()
+    return lowered if len(lowered) == 1 else char
+
+
+class AhoCorasick(Generic[T]):
+    """Case-insensitive multi-pattern matcher.
+
+    Terms are added with :meth:`add` and the automaton is finalised with
+    :meth:`build`. :meth:`iter_matches` then reports every occurrence of every
+    term in a single left-to-right pass, so the scan time depends on the
+    length of the text and the number of matches, not on the number of terms.
+
+    Args:
+        whole_words: Only report matches not surrounded by letters or digits.
+    """
+
+    def __init__(self, *, whole_words: bool = True) -> None:
+        self.whole_words = whole_words
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[Tuple[int, T], ...]] = [()]
+        self._terms = 0
+        self._built = False
+
+    def __len__(self) -> int:
+        return self._terms
+
+    def add(self, term: str, payload: T) -> None:
+        """Register ``term``; matches report ``payload``.
+
+        Raises:
+            ValueError: If the automaton was already built or ``term`` is empty.
+        """
+
+        if self._built:
+            raise ValueError("Automaton already built")
+        if not term:
+            raise ValueError("Empty term")
+        state = 0
+        for char in term:
+            char = _fold(char)
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] += ((len(term), payload),)
+        self._terms += 1
+
+    def build(self) -> "AhoCorasick[T]":
+        """Compute failure links; returns ``self`` for chaining."""
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+        self._built = True
+        return self
+
+    def iter_matches(self, text: str) -> Iterator[Match]:
+        """Yield ``(start, end, payload)`` for every occurrence in ``text``.
+
+        Raises:
+            ValueError: If :meth:`build` has not been called.
+        """
+
+        if not self._built:
+            raise ValueError("Automaton not built")
+        goto, fail, out = self._goto, self._fail, self._out
+        whole_words = self.whole_words
+        folded = text.lower()
+        if len(folded) != len(text):
+            folded = "".join(map(_fold, text))
+        state = 0
+        for index, char in enumerate(folded):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+            end = index + 1
+            for length, payload in out[state]:
+                start = end - length
+                if whole_words and (
+                    (start > 0 and text[start - 1].isalnum())
+                    or (end < len(text) and text[end].isalnum())
+                ):
+                    continue
+                yield start, end, payload
+
+
+def longest_matches(matches: Iterable[Match]) -> List[Match]:
+    """Return the leftmost-longest non-overlapping subset of ``matches``."""
+
+    chosen: List[Match] = []
+    for match in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+        if chosen and match[0] < chosen[-1][1]:
+            continue
+        chosen.append(match)
+    return chosen
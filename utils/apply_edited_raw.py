@@ -2,10 +2,18 @@
 
 This helper is meant to be imported in *app.py* right after the call that renders
 `display_fields_editable()` (or wherever you place the free‑text editor).  It
-re‑runs the existing regex pipeline from *basic_field_extraction()* on the
+runs the existing regex pipeline from *basic_field_extraction()* on the
 current contents of the textarea with the Streamlit key `edit_parsed_data_raw`
 and merges the resulting field dictionary back into *st.session_state['job_fields']*.
 
+The text is split into paragraphs that are hashed individually; a paragraph
+ending in a label or skill phrase whose value follows after the blank line is
+kept together with the next one.  The findings of every paragraph are kept in a
+:class:`RawTextIndex` and combined with the same rules as a whole-text run, so
+after an edit only new or changed paragraphs are scanned again and the result
+still equals *basic_field_extraction()* on the complete text.  An unchanged
+textarea costs a single hash comparison.
+
 Because it re‑uses *basic_field_extraction* you only have to maintain a single
 extraction logic.  If you later switch to spaCy, GPT, etc. you can do so inside
 *basic_field_extraction* without touching this glue code.
@@ -13,19 +21,136 @@ extraction logic.  If you later switch to spaCy, GPT, etc. you can do so inside
 
 from __future__ import annotations
 
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
 import streamlit as st
 
-from utils.utils_jobinfo import basic_field_extraction, save_fields_to_session
+from utils.utils_jobinfo import (
+    combine_parts,
+    ends_open,
+    extract_parts,
+    merge_parts,
+    save_fields_to_session,
+)
+
+Span = Tuple[int, int]
+
+_BLANK_LINES_RE = re.compile(r"\n[^\S\n]*\n\s*")
+
+
+@dataclass
+class RawTextIndex:
+    """Extraction state of one version of the raw text.
+
+    Attributes
+    ----------
+    digest:
+        Hash of the complete text.
+    results:
+        Findings of :func:`~utils.utils_jobinfo.extract_parts` per paragraph,
+        keyed by the paragraph hash.
+    spans:
+        ``(start, end)`` character offsets of the paragraphs each field was
+        found in, in document order.
+    fields:
+        Non-empty fields of the whole text, equal to those of
+        :func:`~utils.utils_jobinfo.basic_field_extraction`.
+    """
+
+    digest: str
+    results: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    spans: Dict[str, List[Span]] = field(default_factory=dict)
+    fields: Dict[str, str] = field(default_factory=dict)
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def split_paragraphs(text: str) -> List[Span]:
+    """Return the ``(start, end)`` offsets of the blank-line separated paragraphs."""
+
+    spans: List[Span] = []
+    start = 0
+    for match in _BLANK_LINES_RE.finditer(text):
+        if text[start : match.start()].strip():
+            spans.append((start, match.start()))
+        start = match.end()
+    if text[start:].strip():
+        spans.append((start, len(text)))
+    return spans
+
+
+def _blocks(text: str) -> List[Span]:
+    """Return the paragraphs of ``text``, joining those that :func:`ends_open`."""
+
+    blocks: List[Span] = []
+    for start, end in split_paragraphs(text):
+        if blocks and ends_open(text[blocks[-1][0] : blocks[-1][1]]):
+            start = blocks.pop()[0]
+        blocks.append((start, end))
+    return blocks
+
+
+def _found_keys(parts: Dict[str, Any]) -> List[str]:
+    keys = list(parts["labels"]) + [k for k, v in parts["gazetteer"].items() if v]
+    if parts["skills"]:
+        keys.append("must_have_skills")
+    return list(dict.fromkeys(keys))
+
+
+def build_raw_index(text: str, previous: Optional[RawTextIndex] = None) -> RawTextIndex:
+    """Extract fields from ``text`` paragraph by paragraph.
+
+    The findings of all paragraphs are merged in document order and combined
+    like a single run over the whole text, so document-wide rules such as a
+    labelled currency taking precedence over the one in the salary still hold.
+
+    Parameters
+    ----------
+    text:
+        The edited raw text.
+    previous:
+        Index of the previous version; paragraphs whose hash is already known
+        reuse its results instead of being scanned again.
+    """
+
+    known = previous.results if previous is not None else {}
+    index = RawTextIndex(_digest(text))
+    ordered: List[Dict[str, Any]] = []
+    for start, end in _blocks(text):
+        paragraph = text[start:end]
+        digest = _digest(paragraph)
+        found = index.results.get(digest)
+        if found is None:
+            found = known.get(digest)
+        if found is None:
+            found = extract_parts(paragraph)
+        index.results[digest] = found
+        ordered.append(found)
+        for key in _found_keys(found):
+            index.spans.setdefault(key, []).append((start, end))
+    index.fields = combine_parts(merge_parts(ordered))
+    index.fields["parsed_data_raw"] = text
+    return index
 
 
 def apply_edited_raw(prefix: str = "edit_") -> None:
     """Detect a change in the editable *parsed_data_raw* textarea and update fields.
 
+    Empty fields are filled from the edited text.  Fields whose extracted
+    value changed since the last run are updated as well, unless the user has
+    edited them by hand in the meantime.
+
     Parameters
     ----------
     prefix:
         The key prefix used by ``display_fields_editable``.  By default the
-        function creates widgets whose keys start with ``"edit_"``.
+        function creates widgets whose keys start with ``"edit_"``.  The
+        :class:`RawTextIndex` is kept under ``f"{prefix}raw_index"``.
     """
     raw_key = f"{prefix}parsed_data_raw"
     # Nothing to do if the widget hasn't been rendered yet
@@ -37,13 +162,25 @@ def apply_edited_raw(prefix: str = "edit_") -> None:
     if not edited_raw:
         return  # user cleared the field – don't overwrite existing data
 
-    # Run the same extraction logic that we already use for fresh uploads/URLs
-    new_fields = basic_field_extraction(edited_raw)
+    index_key = f"{prefix}raw_index"
+    previous: Optional[RawTextIndex] = st.session_state.get(index_key)
+    if previous is not None and previous.digest == _digest(edited_raw):
+        return  # unchanged since the last rerun
+
+    # Only new or changed paragraphs run through the extraction logic
+    index = build_raw_index(edited_raw, previous)
+    st.session_state[index_key] = index
 
     # Merge: keep existing non‑empty values that the user might have refined
     current = st.session_state.get("job_fields", {})
-    for k, v in new_fields.items():
-        if v and not current.get(k):
+    before = previous.fields if previous is not None else {}
+    for k in set(index.fields) | set(before):
+        v = index.fields.get(k, "")
+        old = before.get(k, "")
+        if not current.get(k):
+            if v:
+                current[k] = v
+        elif v != old and current.get(k) == old:
             current[k] = v
 
     save_fields_to_session(current)
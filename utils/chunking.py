@@ -0,0 +1,139 @@
+"""Split long job ads into prompt-sized chunks and merge the chunk results.
+
+:func:`split_sections` cuts the text at section boundaries (blank lines and
+heading lines such as ``Benefits:`` or ``## Ihre Aufgaben``) and packs
+consecutive sections into chunks that stay within a token budget, so every
+part of the ad reaches the model without splitting a section in half.
+:func:`merge_chunk_fields` combines the field dictionaries returned for the
+individual chunks.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, List, Sequence
+
+# Token budget of the job ad text in one extraction prompt.
+CHUNK_TOKENS = 1000
+# Average characters per token of German and English job ads.
+CHARS_PER_TOKEN = 4
+
+# Blank lines, or the start of a Markdown heading / "Label:" line.
+_SECTION_BREAK_RE = re.compile(
+    r"\n[^\S\n]*\n\s*|\n(?=[^\S\n]*(?:#{1,6}[^\S\n]|[^\n.:]{2,60}:[^\S\n]*\n))"
+)
+
+TokenCounter = Callable[[str], int]
+
+
+def estimate_tokens(text: str) -> int:
+    """Return a rough token count of ``text`` without loading a tokenizer."""
+
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _split_long(section: str, max_tokens: int, count: TokenCounter) -> List[str]:
+    """Split a section above the budget at line breaks, then hard at spaces."""
+
+    pieces: List[str] = []
+    current = ""
+    for line in section.split("\n"):
+        candidate = f"{current}\n{line}" if current else line
+        if count(candidate) <= max_tokens:
+            current = candidate
+            continue
+        if current:
+            pieces.append(current)
+        while count(line) > max_tokens:
+            cut = max_tokens * CHARS_PER_TOKEN
+            space = line.rfind(" ", 0, cut)
+            cut = space if space > 0 else cut
+            pieces.append(line[:cut])
+            line = line[cut:].lstrip()
+        current = line
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_sections(
+    text: str,
+    max_tokens: int = CHUNK_TOKENS,
+    count_tokens: TokenCounter = estimate_tokens,
+) -> List[str]:
+    """Split ``text`` into chunks of whole sections within ``max_tokens``.
+
+    Args:
+        text: Normalised job ad text.
+        max_tokens: Token budget per chunk.
+        count_tokens: Function returning the token count of a string.
+
+    Returns:
+        Chunks in document order; together they contain every section.
+        Sections longer than the budget are split at line breaks.
+
+    Raises:
+        ValueError: If ``max_tokens`` is not positive.
+    """
+
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    chunks: List[str] = []
+    current = ""
+    for section in _SECTION_BREAK_RE.split(text):
+        section = section.strip()
+        if not section:
+            continue
+        candidate = f"{current}\n\n{section}" if current else section
+        if count_tokens(candidate) <= max_tokens:
+            current = candidate
+            continue
+        if current:
+            chunks.append(current)
+            current = ""
+        if count_tokens(section) <= max_tokens:
+            current = section
+        else:
+            chunks.extend(_split_long(section, max_tokens, count_tokens))
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _merge_values(values: Sequence[Any]) -> Any:
+    if all(isinstance(v, list) for v in values):
+        merged: List[Any] = []
+        for value in values:
+            merged.extend(item for item in value if item not in merged)
+        return merged
+    if all(isinstance(v, dict) for v in values):
+        return merge_chunk_fields(values)
+    # Scalars: the value most chunks agree on, ties go to the earliest chunk.
+    counts = Counter(str(v).strip().casefold() for v in values)
+    best = max(counts.values())
+    return next(v for v in values if counts[str(v).strip().casefold()] == best)
+
+
+def merge_chunk_fields(results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge the field dictionaries extracted from the chunks of one ad.
+
+    Empty values are ignored. Lists are joined without duplicates and nested
+    dictionaries merged recursively. Conflicting scalar values are resolved
+    by majority across chunks; on a tie the value from the earliest chunk,
+    usually the ad's header, wins.
+
+    Args:
+        results: Field dictionaries in chunk order.
+
+    Returns:
+        One merged dictionary with the keys in order of first appearance.
+    """
+
+    found: Dict[str, List[Any]] = {}
+    for result in results:
+        for key, value in result.items():
+            if value in (None, "", [], {}):
+                continue
+            found.setdefault(key, []).append(value)
+    return {key: _merge_values(values) for key, values in found.items()}
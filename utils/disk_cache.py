@@ -0,0 +1,136 @@
+"""Disk-backed, size-bounded LRU cache shared across sessions and restarts."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+CACHE_DIR = Path(
+    os.getenv("NEED_ANALYSIS_CACHE_DIR", Path.home() / ".cache" / "need_analysis")
+)
+
+
+class DiskLRUCache:
+    """Persist JSON-serialisable values in SQLite and evict least recently used.
+
+    Each instance maps to one SQLite file, so the cache survives Streamlit
+    reruns, multiple sessions and server restarts. The total size of the
+    stored payloads is kept below ``max_bytes`` by dropping the entries with
+    the oldest access time.
+
+    Args:
+        path: Location of the SQLite database file.
+        max_bytes: Upper bound for the summed size of all stored payloads.
+    """
+
+    def __init__(self, path: os.PathLike | str, max_bytes: int = 256 * 2**20):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored for ``key`` or ``None`` and mark it as used."""
+
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key`` and evict old entries if needed."""
+
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, size, time.time()),
+            )
+            self._evict(conn)
+
+    def update(self, key: str, func: Callable[[Optional[Any]], Optional[Any]]) -> Any:
+        """Replace the value of ``key`` with ``func(old_value)`` atomically.
+
+        The read and the write happen in one ``IMMEDIATE`` transaction, so
+        concurrent updates from other threads or processes are serialised
+        instead of overwriting each other. Returning ``None`` deletes the
+        key. Returns the value ``func`` was called with.
+        """
+
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            old = None if row is None else json.loads(row[0])
+            value = func(old)
+            payload = None if value is None else json.dumps(value, ensure_ascii=False)
+            size = 0 if payload is None else len(payload.encode("utf-8"))
+            if payload is None or size > self.max_bytes:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            else:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, accessed) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, payload, size, time.time()),
+                )
+                self._evict(conn)
+        return old
+
+    def delete(self, key: str) -> None:
+        """Remove ``key`` from the cache if present."""
+
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Remove all entries."""
+
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed ASC"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", stale)
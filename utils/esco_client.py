@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 from typing import Dict, List, Optional, Union
 
-import requests
+from utils.http_session import get_session
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +30,7 @@ def search_skills(query: str, *, language: str = "en", limit: int = 10) -> List[
         "limit": limit,
     }
     try:
-        response = requests.get(f"{BASE_URL}/search", params=params, timeout=10)
+        response = get_session().get(f"{BASE_URL}/search", params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         results = data.get("_embedded", {}).get("results", [])
@@ -50,7 +50,7 @@ def _find_occupation_uri(job_title: str, *, language: str) -> Optional[str]:
         "limit": 1,
         "full": "true",
     }
-    response = requests.get(f"{BASE_URL}/search", params=params, timeout=10)
+    response = get_session().get(f"{BASE_URL}/search", params=params, timeout=10)
     response.raise_for_status()
     results = response.json().get("_embedded", {}).get("results", [])
     if not results:
@@ -74,7 +74,9 @@ def get_skills_for_job_title(
             "limit": limit,
             "full": "false",
         }
-        resp = requests.get(f"{BASE_URL}/resource/related", params=params, timeout=10)
+        resp = get_session().get(
+            f"{BASE_URL}/resource/related", params=params, timeout=10
+        )
         resp.raise_for_status()
         skills = resp.json().get("_embedded", {}).get("hasEssentialSkill", [])
         return [s.get("title") for s in skills if s.get("title")]
@@ -96,7 +98,7 @@ def get_tasks_for_job_title(
             "uri": occ_uri,
             "language": language,
         }
-        resp = requests.get(
+        resp = get_session().get(
             f"{BASE_URL}/resource/occupation", params=params, timeout=10
         )
         resp.raise_for_status()
@@ -0,0 +1,437 @@
+"""Registry of document text extractors keyed by file type.
+
+Every file type can have several interchangeable backends. A backend takes a
+read-only ``memoryview`` of the document and yields text chunks (pages for
+PDFs, blocks for DOCX). If more than one backend is available for a file type,
+the first request runs a small micro-benchmark on a generated sample document
+and keeps the fastest backend for the rest of the process.
+
+Sources are turned into buffers without copying where possible: ``bytes`` and
+``memoryview`` are used as-is, in-memory uploads expose their internal buffer
+and files on disk are memory-mapped.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import mmap
+import os
+import re
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+from io import BytesIO
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Union
+from xml.etree import ElementTree
+
+import fitz  # PyMuPDF
+
+from utils.text_encoding import SNIFF_BYTES, detect_text_encoding
+from utils.url_fetcher import html_to_text
+
+logger = logging.getLogger(__name__)
+
+Source = Union[bytes, bytearray, memoryview, str, os.PathLike, BinaryIO]
+Backend = Callable[[memoryview], Iterator[str]]
+
+_BACKENDS: Dict[str, Dict[str, Backend]] = {}
+_SAMPLES: Dict[str, Callable[[], bytes]] = {}
+_SELECTED: Dict[str, str] = {}
+_LOCK = threading.Lock()
+
+
+class BufferReader(io.RawIOBase):
+    """Seekable, read-only file object over a buffer that never copies it whole.
+
+    Libraries expecting a file (python-docx, PyPDF2) can read from uploads and
+    memory-mapped files through this wrapper; only the requested slices are
+    copied.
+    """
+
+    def __init__(self, buffer: memoryview):
+        self._buffer = buffer
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._buffer)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def readinto(self, target) -> int:  # type: ignore[override]
+        chunk = self._buffer[self._pos : self._pos + len(target)]
+        size = len(chunk)
+        target[:size] = chunk
+        self._pos += size
+        return size
+
+
+@contextmanager
+def open_buffer(source: Source) -> Iterator[memoryview]:
+    """Yield a read-only byte view of ``source`` avoiding intermediate copies.
+
+    Args:
+        source: Raw bytes, a ``memoryview``, a path on disk or a binary file
+            object. ``BytesIO`` objects (including Streamlit uploads) expose
+            their internal buffer, real files and paths are memory-mapped.
+            Other file objects are read once as a fallback.
+    """
+
+    mapped: Optional[mmap.mmap] = None
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fh:
+            mapped = _map_file(fh)
+        view = memoryview(mapped) if mapped is not None else memoryview(b"")
+    elif isinstance(source, io.BytesIO):
+        view = source.getbuffer()
+    else:
+        mapped = _map_file(source)
+        if mapped is not None:
+            view = memoryview(mapped)
+        else:
+            source.seek(0)
+            view = memoryview(source.read())
+    if view.format != "B":
+        view = view.cast("B")
+    try:
+        yield view
+    finally:
+        view.release()
+        if mapped is not None:
+            try:
+                mapped.close()
+            except BufferError:  # pragma: no cover - view still referenced
+                pass
+
+
+def _map_file(fh) -> Optional[mmap.mmap]:
+    """Return a read-only memory map of ``fh`` or ``None`` if unsupported."""
+
+    try:
+        fileno = fh.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+    if os.fstat(fileno).st_size == 0:
+        return None
+    return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+
+
+def sniff_file_type(buffer: memoryview) -> Optional[str]:
+    """Return the file type of ``buffer`` from its content or ``None``.
+
+    Only the first :data:`SNIFF_BYTES` bytes (and, for ZIP containers, the
+    central directory at the end) are inspected, so unsupported inputs are
+    rejected without attempting a full parse. ZIP files whose member list is
+    not within the last 64 KiB, e.g. because of a long archive comment or a
+    large central directory, are checked by reading the member names.
+    """
+
+    head = bytes(buffer[:SNIFF_BYTES])
+    if b"%PDF-" in head[:1024]:
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        # The central directory listing all member names sits at the end.
+        if b"word/document.xml" in bytes(buffer[-65536:]):
+            return "docx"
+        try:
+            with zipfile.ZipFile(BufferReader(buffer)) as archive:
+                names = archive.namelist()
+        except (zipfile.BadZipFile, OSError, EOFError):
+            return None
+        return "docx" if "word/document.xml" in names else None
+    if head.startswith(b"{\\rtf"):
+        return "rtf"
+    encoding = detect_text_encoding(buffer)
+    if encoding is None:
+        return None
+    text = head.decode(encoding, errors="ignore").lstrip().lower()
+    if text.startswith(("<!doctype html", "<html")) or "<body" in text:
+        return "html"
+    return "txt"
+
+
+def register_extractor(file_type: str, name: str) -> Callable[[Backend], Backend]:
+    """Register the decorated function as backend ``name`` for ``file_type``."""
+
+    def decorator(func: Backend) -> Backend:
+        with _LOCK:
+            _BACKENDS.setdefault(file_type, {})[name] = func
+            _SELECTED.pop(file_type, None)
+        return func
+
+    return decorator
+
+
+def register_benchmark_sample(
+    file_type: str,
+) -> Callable[[Callable[[], bytes]], Callable[[], bytes]]:
+    """Register a factory producing sample bytes used to benchmark ``file_type``."""
+
+    def decorator(factory: Callable[[], bytes]) -> Callable[[], bytes]:
+        _SAMPLES[file_type] = factory
+        return factory
+
+    return decorator
+
+
+def available_backends(file_type: str) -> List[str]:
+    """Return the names of all backends registered for ``file_type``."""
+
+    return list(_BACKENDS.get(file_type, {}))
+
+
+def benchmark_backends(
+    file_type: str, sample: Optional[bytes] = None, *, repeat: int = 3
+) -> Dict[str, float]:
+    """Time every backend for ``file_type`` and return the best run per backend.
+
+    Backends raising an exception on the sample are left out of the result.
+    """
+
+    if sample is None:
+        sample = _SAMPLES[file_type]()
+    timings: Dict[str, float] = {}
+    for name, backend in _BACKENDS.get(file_type, {}).items():
+        best = float("inf")
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for _chunk in backend(memoryview(sample)):
+                    pass
+                best = min(best, time.perf_counter() - start)
+        except Exception as exc:
+            logger.warning("Extractor %s/%s failed benchmark: %s", file_type, name, exc)
+            continue
+        timings[name] = best
+    return timings
+
+
+def select_backend(file_type: str, name: str) -> None:
+    """Force backend ``name`` for ``file_type`` instead of benchmarking."""
+
+    if name not in _BACKENDS.get(file_type, {}):
+        raise ValueError(f"Unknown {file_type} extractor: {name}")
+    _SELECTED[file_type] = name
+
+
+def get_backend(file_type: str) -> Backend:
+    """Return the selected backend for ``file_type``, benchmarking on first use."""
+
+    backends = _BACKENDS.get(file_type)
+    if not backends:
+        raise ValueError("Unsupported file type")
+    with _LOCK:
+        name = _SELECTED.get(file_type)
+        if name is None:
+            if len(backends) == 1 or file_type not in _SAMPLES:
+                name = next(iter(backends))
+            else:
+                timings = benchmark_backends(file_type)
+                name = (
+                    min(timings, key=timings.__getitem__)
+                    if timings
+                    else next(iter(backends))
+                )
+                logger.info("Extractor benchmark for %s: %s", file_type, timings)
+            _SELECTED[file_type] = name
+    return backends[name]
+
+
+def iter_chunks(source: Source, file_type: str) -> Iterator[str]:
+    """Yield text chunks of ``source`` using the selected backend."""
+
+    backend = get_backend(file_type)
+    with open_buffer(source) as buffer:
+        yield from backend(buffer)
+
+
+# ---------- PDF ----------
+# A single backend on purpose: PyPDF2 orders and spaces page text differently,
+# and the text (and the cached results) must not depend on which backend
+# benchmarks fastest. benchmarks/bench_pdf.py compares the two.
+@register_extractor("pdf", "pymupdf")
+def _pdf_pymupdf(buffer: memoryview) -> Iterator[str]:
+    with fitz.open(stream=buffer, filetype="pdf") as doc:
+        for page in doc:
+            yield page.get_text()
+
+
+# ---------- DOCX ----------
+# A single backend on purpose: body order and merged-cell handling decide the
+# text users get, so it must not depend on which backend benchmarks fastest.
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+@register_extractor("docx", "stream-xml")
+def _docx_stream_xml(buffer: memoryview) -> Iterator[str]:
+    """Walk ``word/document.xml`` once and yield blocks in body order.
+
+    Paragraphs are yielded as they close; table cells are yielded once per
+    ``w:tc`` element, so horizontally merged cells appear a single time and
+    vertically merged continuation cells are skipped. Processed elements are
+    cleared and finished blocks are removed from ``w:body``, so memory stays
+    flat on large documents.
+    """
+
+    with zipfile.ZipFile(BufferReader(buffer)) as archive:
+        with archive.open("word/document.xml") as xml:
+            paragraphs: List[List[str]] = []
+            cells: List[List[str]] = []
+            continued: List[bool] = []
+            body = None
+            depth = 0
+            for event, elem in ElementTree.iterparse(xml, events=("start", "end")):
+                tag = elem.tag
+                if event == "start":
+                    depth += 1
+                    if tag == _W + "body":
+                        body = elem
+                    elif tag == _W + "p":
+                        paragraphs.append([])
+                    elif tag == _W + "tc":
+                        cells.append([])
+                        continued.append(False)
+                    continue
+
+                depth -= 1
+                if tag == _W + "t" and paragraphs:
+                    paragraphs[-1].append(elem.text or "")
+                elif tag == _W + "tab" and paragraphs:
+                    paragraphs[-1].append("\t")
+                elif tag in (_W + "br", _W + "cr") and paragraphs:
+                    paragraphs[-1].append("\n")
+                elif tag == _W + "vMerge" and continued:
+                    continued[-1] = elem.get(_W + "val") != "restart"
+                elif tag == _W + "p":
+                    text = "".join(paragraphs.pop())
+                    if cells and not paragraphs:
+                        cells[-1].append(text)
+                    else:
+                        yield text
+                elif tag == _W + "tc":
+                    text = "\n".join(cells.pop())
+                    if not continued.pop() and text:
+                        yield text
+                if tag in (_W + "p", _W + "tc", _W + "tbl"):
+                    elem.clear()
+                # A finished top-level block (document > body > block).
+                if depth == 2 and body is not None:
+                    body.remove(elem)
+
+
+# ---------- TXT / HTML / RTF ----------
+def _decode(buffer: memoryview) -> str:
+    return str(buffer, detect_text_encoding(buffer) or "utf-8", "replace")
+
+
+@register_extractor("txt", "text")
+def _txt_text(buffer: memoryview) -> Iterator[str]:
+    yield _decode(buffer)
+
+
+@register_extractor("html", "html-parser")
+def _html_parser(buffer: memoryview) -> Iterator[str]:
+    yield html_to_text(_decode(buffer))
+
+
+_RTF_TOKEN = re.compile(
+    r"\\([a-z]{1,32})(-?\d{1,10})? ?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+"
+    r"|([^\\{}\r\n]+)",
+    re.IGNORECASE,
+)
+_RTF_DESTINATIONS = {
+    "colortbl",
+    "datastore",
+    "fldinst",
+    "fonttbl",
+    "footer",
+    "footerf",
+    "footerl",
+    "footerr",
+    "generator",
+    "header",
+    "headerf",
+    "headerl",
+    "headerr",
+    "info",
+    "latentstyles",
+    "listoverridetable",
+    "listtable",
+    "object",
+    "pict",
+    "rsidtbl",
+    "stylesheet",
+    "themedata",
+    "xmlnstbl",
+}
+_RTF_BREAKS = {"par": "\n", "line": "\n", "row": "\n", "page": "\n", "sect": "\n"}
+_RTF_SYMBOLS = {"\\": "\\", "{": "{", "}": "}", "~": " ", "_": "-", "-": ""}
+
+
+def rtf_to_text(rtf: str) -> str:
+    """Return the plain text of an RTF document in a single linear scan."""
+
+    out: List[str] = []
+    stack: List[tuple] = []
+    skip = False
+    uc = 1
+    pending = 0  # fallback characters to drop after a \\u escape
+    for word, arg, hexcode, symbol, brace, text in _RTF_TOKEN.findall(rtf):
+        if brace == "{":
+            stack.append((skip, uc))
+        elif brace == "}":
+            skip, uc = stack.pop() if stack else (False, 1)
+        elif symbol == "*":
+            skip = True
+        elif word:
+            if word in _RTF_DESTINATIONS:
+                skip = True
+            elif word == "uc" and arg:
+                uc = int(arg)
+            elif skip:
+                continue
+            elif word == "u" and arg:
+                out.append(chr(int(arg) % 65536))
+                pending = uc
+            elif word in _RTF_BREAKS:
+                out.append(_RTF_BREAKS[word])
+            elif word in ("tab", "cell"):
+                out.append("\t")
+        elif skip:
+            continue
+        elif hexcode:
+            if pending:
+                pending -= 1
+            else:
+                out.append(bytes([int(hexcode, 16)]).decode("cp1252", "replace"))
+        elif symbol:
+            if symbol in "\r\n":
+                out.append("\n")
+            else:
+                out.append(_RTF_SYMBOLS.get(symbol, ""))
+        elif text:
+            dropped = min(pending, len(text))
+            pending -= dropped
+            out.append(text[dropped:])
+    lines = "".join(out).split("\n")
+    return "\n".join(line.strip() for line in lines).strip()
+
+
+@register_extractor("rtf", "rtf-scanner")
+def _rtf_scanner(buffer: memoryview) -> Iterator[str]:
+    yield rtf_to_text(str(buffer, "latin-1"))
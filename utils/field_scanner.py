@@ -0,0 +1,140 @@
+"""One-pass ``Label: value`` scanner built from the wizard's label vocabulary.
+
+Instead of running one regex search per field over the whole document, the
+text is walked once line by line. Each line is split at its first ``:`` (or
+``-``) and the part in front is looked up in a dictionary of known labels, so
+the cost grows with the length of the text, not with the number of fields.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from utils.field_map import field_map
+
+# Extra spellings seen in job ads that are not part of the wizard labels.
+LABEL_SYNONYMS: Dict[str, Tuple[str, ...]] = {
+    "job_title": ("Stellenbezeichnung", "Jobtitel", "Position", "Job Title"),
+    "company_name": ("Unternehmen", "Company", "Firma", "Arbeitgeber", "Employer"),
+    "city": ("Stadt", "Ort", "City", "Arbeitsort", "Location"),
+    "company_website": (
+        "Unternehmenswebsite",
+        "Website",
+        "Webseite",
+        "Company Website",
+    ),
+}
+
+# Wizard fields that describe the input itself rather than the job ad.
+_SKIP_KEYS = {"input_url", "uploaded_file"}
+_SEPARATORS = (":", "-")
+_LABEL_STRIP = " \t-*•·?"
+
+
+def _label_variants(label: str) -> Iterable[str]:
+    """Yield lookup forms of a wizard label such as ``Standort (Stadt)``."""
+
+    for part in label.split("/"):
+        part = part.strip(_LABEL_STRIP)
+        if not part:
+            continue
+        yield part
+        outer = re.sub(r"\s*\(.*?\)", "", part).strip()
+        if outer and outer != part:
+            yield outer
+        for inner in re.findall(r"\((.*?)\)", part):
+            yield inner
+
+
+def build_label_index(
+    labels: Mapping[str, Iterable[str]],
+) -> Dict[str, str]:
+    """Return a case-folded ``label -> field key`` lookup table.
+
+    Earlier entries win when two fields share a label.
+    """
+
+    index: Dict[str, str] = {}
+    for key, names in labels.items():
+        for name in names:
+            for variant in _label_variants(name):
+                index.setdefault(variant.casefold(), key)
+    return index
+
+
+def _default_labels() -> Dict[str, Tuple[str, ...]]:
+    labels: Dict[str, Tuple[str, ...]] = dict(LABEL_SYNONYMS)
+    for key, meta in field_map.items():
+        if key in _SKIP_KEYS:
+            continue
+        labels[key] = labels.get(key, ()) + (meta["label"],)
+    return labels
+
+
+class FieldScanner:
+    """Resolve ``Label: value`` lines against a fixed label vocabulary.
+
+    Args:
+        labels: Mapping of field key to the label spellings that announce it.
+            Labels containing ``/`` are split into their language variants.
+    """
+
+    def __init__(self, labels: Mapping[str, Iterable[str]]) -> None:
+        self._index = build_label_index(labels)
+
+    def _split(self, line: str) -> Tuple[Optional[str], str]:
+        for separator in _SEPARATORS:
+            head, found, tail = line.partition(separator)
+            if not found:
+                continue
+            key = self._index.get(head.strip(_LABEL_STRIP).casefold())
+            if key is not None:
+                return key, tail.strip()
+        return None, ""
+
+    def is_label(self, line: str) -> bool:
+        """Return ``True`` if ``line`` is a known label without a value."""
+
+        key, value = self._split(line.strip())
+        return key is not None and not value
+
+    def scan(self, text: str) -> Dict[str, str]:
+        """Return the first value found for every labelled field in ``text``.
+
+        A label on a line of its own takes its value from the next non-empty
+        line, as is common in PDF exports.
+        """
+
+        found: Dict[str, str] = {}
+        pending: Optional[str] = None
+        for line in text.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+            key, value = self._split(line)
+            if key is None:
+                if pending is not None:
+                    found[pending] = line
+                pending = None
+            elif value:
+                found.setdefault(key, value)
+                pending = None
+            else:
+                pending = key if key not in found else None
+        return found
+
+
+DEFAULT_SCANNER = FieldScanner(_default_labels())
+
+
+def scan_fields(text: str) -> Dict[str, str]:
+    """Scan ``text`` with the German/English wizard label vocabulary."""
+
+    return DEFAULT_SCANNER.scan(text)
+
+
+def is_label_line(line: str) -> bool:
+    """Return ``True`` if ``line`` is a wizard label without a value."""
+
+    return DEFAULT_SCANNER.is_label(line)
@@ -0,0 +1,136 @@
+"""Gazetteer lookup of employment terms and skills in job ad text.
+
+All terms are compiled into one :class:`utils.aho_corasick.AhoCorasick`
+automaton on first use, so a document is scanned once regardless of how many
+terms the dictionaries contain.
+"""
+
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.aho_corasick import AhoCorasick, Match, longest_matches
+
+# Skill dictionary, one term per line; override for larger lists.
+SKILLS_FILE = Path(
+    os.getenv(
+        "NEED_ANALYSIS_SKILLS_FILE", Path(__file__).with_name("data") / "skills.txt"
+    )
+)
+
+# Lines kept by a shared ``line_cache`` before it is reset.
+LINE_CACHE_SIZE = 200_000
+
+# Field key -> term found in the text -> value stored in the field.
+EMPLOYMENT_TERMS: Dict[str, Dict[str, str]] = {
+    "job_type": {
+        "full-time": "Full Time",
+        "full time": "Full Time",
+        "fulltime": "Full Time",
+        "vollzeit": "Vollzeit",
+        "part-time": "Part Time",
+        "part time": "Part Time",
+        "parttime": "Part Time",
+        "teilzeit": "Teilzeit",
+        "praktikum": "Praktikum",
+        "internship": "Internship",
+        "freelance": "Freelance",
+        "werkstudent": "Werkstudent",
+        "working student": "Working Student",
+        "minijob": "Minijob",
+    },
+    "contract_type": {
+        "unbefristet": "Unbefristet",
+        "permanent": "Permanent",
+        "befristet": "Befristet",
+        "fixed-term": "Fixed Term",
+        "fixed term": "Fixed Term",
+        "fixedterm": "Fixed Term",
+        "werkvertrag": "Werkvertrag",
+        "contract for work": "Contract For Work",
+    },
+    "job_level": {
+        "junior": "Junior",
+        "berufseinsteiger": "Junior",
+        "entry level": "Junior",
+        "mid": "Mid",
+        "mid-level": "Mid",
+        "senior": "Senior",
+        "lead": "Lead",
+        "principal": "Principal",
+        "management": "Management",
+    },
+}
+
+# payload: (field key, value, whether the term must match case-sensitively)
+Payload = Tuple[str, str, bool]
+
+
+def load_skill_terms(path: Path = SKILLS_FILE) -> List[str]:
+    """Return the skill terms listed in ``path``, skipping comments."""
+
+    with open(path, encoding="utf-8") as handle:
+        lines = (line.strip() for line in handle)
+        return [line for line in lines if line and not line.startswith("#")]
+
+
+@lru_cache(maxsize=1)
+def get_automaton() -> AhoCorasick[Payload]:
+    """Return the automaton over all employment terms and skills."""
+
+    automaton: AhoCorasick[Payload] = AhoCorasick()
+    for key, terms in EMPLOYMENT_TERMS.items():
+        for term, value in terms.items():
+            automaton.add(term, (key, value, False))
+    for skill in load_skill_terms():
+        # short acronyms such as "SPS" or "REST" would match ordinary words
+        exact = skill.isupper() and len(skill) <= 5
+        automaton.add(skill, ("hard_skills", skill, exact))
+    return automaton.build()
+
+
+def _case_ok(text: str, match: Match) -> bool:
+    start, end, (_, value, exact) = match
+    return not exact or text[start:end] == value
+
+
+def _line_hits(line: str) -> List[Tuple[str, str]]:
+    matches = (m for m in get_automaton().iter_matches(line) if _case_ok(line, m))
+    return [(key, value) for _, _, (key, value, _) in longest_matches(matches)]
+
+
+def scan_gazetteer(
+    text: str, line_cache: Optional[Dict[str, List[Tuple[str, str]]]] = None
+) -> Dict[str, List[str]]:
+    """Return the gazetteer values found in ``text`` per field key.
+
+    Overlapping hits are resolved leftmost-longest (``Machine Learning`` wins
+    over ``Learning``); values keep the order of their first occurrence.
+
+    Args:
+        text: Text to scan.
+        line_cache: Optional dict shared across documents. Terms never span
+            line breaks, so hits are cached per line and boilerplate lines
+            repeated across a corpus are scanned only once.
+    """
+
+    found: Dict[str, List[str]] = {}
+    if line_cache is None:
+        hits: Iterable[Tuple[str, str]] = _line_hits(text)
+    else:
+        if len(line_cache) > LINE_CACHE_SIZE:
+            line_cache.clear()
+        hits = []
+        for line in text.split("\n"):
+            cached = line_cache.get(line)
+            if cached is None:
+                cached = line_cache[line] = _line_hits(line)
+            hits.extend(cached)
+    for key, value in hits:
+        values = found.setdefault(key, [])
+        if value not in values:
+            values.append(value)
+    return found
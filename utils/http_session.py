@@ -0,0 +1,86 @@
+"""Shared HTTP session with keep-alive pooling and retries.
+
+All outbound HTTP (ESCO API, URL imports) goes through :func:`get_session`
+so TCP and TLS connections to the same host are reused across calls, wizard
+steps and Streamlit sessions. ``requests.Session`` is used read-only after
+construction; the underlying urllib3 connection pools are thread-safe.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Number of hosts whose connection pools are kept alive.
+POOL_CONNECTIONS = 10
+# Maximum concurrent connections per host; further requests wait for a slot.
+POOL_MAXSIZE = 4
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+_session: Optional[requests.Session] = None
+_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    retry = Retry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=True,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def connection_stats() -> Dict[str, float]:
+    """Return request and connection counters of the shared session.
+
+    ``reuse_rate`` is the share of requests that were served over an already
+    open connection instead of a new TCP/TLS handshake.
+    """
+
+    requests_sent = 0
+    connections = 0
+    if _session is not None:
+        adapters = {id(a): a for a in _session.adapters.values()}.values()
+        for adapter in adapters:
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                requests_sent += pool.num_requests
+                connections += pool.num_connections
+    reuse_rate = 1 - connections / requests_sent if requests_sent else 0.0
+    return {
+        "requests": requests_sent,
+        "connections": connections,
+        "reuse_rate": round(reuse_rate, 3),
+    }
@@ -115,3 +115,22 @@ GENERATED_KEYS: list[str] = [
 
 # Flattened list of all user-facing field keys for convenience
 ALL_STEP_KEYS: list[str] = [key for step in STEP_KEYS.values() for key in step]
+
+# Mandatory (★) fields across all steps
+MANDATORY_KEYS: list[str] = [
+    "job_title",
+    "company_name",
+    "city",
+    "job_type",
+    "contract_type",
+    "job_level",
+    "role_description",
+    "role_type",
+    "task_list",
+    "must_have_skills",
+    "salary_range",
+    "currency",
+    "pay_frequency",
+    "recruitment_contact_email",
+    "language_of_ad",
+]
@@ -0,0 +1,298 @@
+"""Persistent cache for the chat completions of the recruiting toolkit.
+
+Streamlit reruns the whole script on every widget interaction, so a generator
+that calls the API at the top level pays for a fresh completion each time.
+:func:`cached_completion` keeps the answers in a :class:`DiskLRUCache` keyed
+by model, normalised prompt and sampling parameters. Entries expire after
+``LLM_CACHE_TTL`` seconds and are dropped as soon as the vacancy fields they
+were generated from change. :func:`stream_completion` serves the same cache
+while yielding fresh answers token by token.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import unicodedata
+from functools import lru_cache
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from utils.disk_cache import CACHE_DIR, DiskLRUCache
+from utils.openai_client import get_client
+from utils.prompt_encoding import log_prompt_savings
+
+logger = logging.getLogger(__name__)
+
+Message = Dict[str, str]
+
+# Seconds a cached completion stays valid (default: one week).
+LLM_CACHE_TTL = float(os.getenv("NEED_ANALYSIS_LLM_CACHE_TTL", 7 * 24 * 3600))
+
+
+@lru_cache(maxsize=1)
+def _llm_cache() -> DiskLRUCache:
+    return DiskLRUCache(CACHE_DIR / "llm.sqlite3", max_bytes=64 * 2**20)
+
+
+def _normalize_prompt(content: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", str(content)).split())
+
+
+def _digest(payload: Any) -> str:
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def cache_key(model: str, messages: List[Message], **params: Any) -> str:
+    """Return the cache key of a chat completion request.
+
+    Prompts that only differ in whitespace or Unicode compatibility forms map
+    to the same key; any difference in model or sampling parameters does not.
+    """
+
+    normalized = [
+        {"role": m["role"], "content": _normalize_prompt(m["content"])}
+        for m in messages
+    ]
+    return _digest({"model": model, "messages": normalized, "params": params})
+
+
+def fields_fingerprint(fields: Mapping[str, Any]) -> str:
+    """Return a hash of the vacancy fields a generator works on."""
+
+    return _digest(dict(fields))
+
+
+def _scope_key(scope: str, vacancy: Optional[str] = None) -> str:
+    if vacancy is None:
+        return f"scope:{scope}"
+    return f"scope:{vacancy}:{scope}"
+
+
+def invalidate(scope: str, vacancy: Optional[str] = None) -> None:
+    """Drop all completions cached for ``scope`` (e.g. ``"job_ad"``).
+
+    Args:
+        scope: Name of the generator.
+        vacancy: Vacancy or session the entries belong to, as passed to
+            :func:`cached_completion`.
+    """
+
+    cache = _llm_cache()
+    entry = cache.update(_scope_key(scope, vacancy), lambda old: None)
+    for key in (entry or {}).get("keys", []):
+        cache.delete(key)
+
+
+def _keep_if(
+    entry: Optional[Dict[str, Any]], fingerprint: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    if entry is None or entry["fingerprint"] != fingerprint:
+        return None
+    return entry
+
+
+def _lookup(
+    key: str,
+    scope_key: Optional[str],
+    fingerprint: Optional[str],
+    ttl: float,
+) -> Optional[str]:
+    """Return the cached text for ``key``.
+
+    Drops the scope first if its vacancy fields changed.
+    """
+
+    cache = _llm_cache()
+    if scope_key is not None:
+        entry = cache.get(scope_key)
+        if entry is not None and entry["fingerprint"] != fingerprint:
+            # Re-checked inside the transaction: another writer may have
+            # stored the new fingerprint in the meantime.
+            entry = cache.update(scope_key, lambda old: _keep_if(old, fingerprint))
+            if entry is not None and entry["fingerprint"] != fingerprint:
+                for stale in entry["keys"]:
+                    cache.delete(stale)
+
+    entry = cache.get(key)
+    if entry is not None and time.time() - entry["created"] <= ttl:
+        return entry["text"]
+    return None
+
+
+def _store(
+    key: str, text: str, scope_key: Optional[str], fingerprint: Optional[str]
+) -> None:
+    cache = _llm_cache()
+    cache.put(key, {"text": text, "created": time.time()})
+    if scope_key is None:
+        return
+
+    def add_key(entry: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        # Keys recorded under an older fingerprint stay listed, so they are
+        # still dropped by the next invalidation.
+        keys = list((entry or {}).get("keys", []))
+        if key not in keys:
+            keys.append(key)
+        return {"fingerprint": fingerprint, "keys": keys}
+
+    cache.update(scope_key, add_key)
+
+
+def _log_sent(messages: List[Message]) -> None:
+    # Only prompts that are actually sent are worth tokenizing for the log.
+    for message in messages:
+        log_prompt_savings(message["content"])
+
+
+def _scope(
+    scope: Optional[str], vacancy: Optional[str], fields: Optional[Mapping[str, Any]]
+) -> Tuple[Optional[str], Optional[str]]:
+    """Return the scope index key and the fingerprint of ``fields``."""
+
+    if scope is None:
+        return None, None
+    return _scope_key(scope, vacancy), fields_fingerprint(fields or {})
+
+
+def cached_completion(
+    messages: List[Message],
+    *,
+    model: str = "gpt-4o",
+    scope: Optional[str] = None,
+    vacancy: Optional[str] = None,
+    fields: Optional[Mapping[str, Any]] = None,
+    ttl: float = LLM_CACHE_TTL,
+    create: Optional[Callable[..., Any]] = None,
+    timeout: Optional[float] = None,
+    **params: Any,
+) -> str:
+    """Return the completion text for ``messages``, calling the API on a miss.
+
+    Args:
+        messages: Chat messages passed to the API.
+        model: Model name; part of the cache key.
+        scope: Name of the generator. Together with ``fields`` it enables
+            invalidation: when the fingerprint of ``fields`` differs from the
+            one stored for ``scope``, every entry of the scope is dropped.
+        vacancy: Identifier of the vacancy or session the fields belong to.
+            The cache is shared by all sessions, so scopes are kept per
+            vacancy; otherwise two users editing different vacancies would
+            invalidate each other's entries on every rerun.
+        fields: Vacancy fields the prompt was built from.
+        ttl: Maximum age of a cached answer in seconds.
+        create: Completion function, defaults to the shared client's
+            ``chat.completions.create``.
+        timeout: Per-call timeout in seconds; not part of the cache key.
+        **params: Sampling parameters such as ``temperature``; part of the
+            cache key and forwarded to ``create``.
+
+    Returns:
+        The stripped message content of the first choice.
+    """
+
+    key = cache_key(model, messages, **params)
+    scope_key, fingerprint = _scope(scope, vacancy, fields)
+    text = _lookup(key, scope_key, fingerprint, ttl)
+    if text is not None:
+        return text
+
+    _log_sent(messages)
+    create = create or get_client(timeout).chat.completions.create
+    response = create(model=model, messages=messages, **params)
+    text = response.choices[0].message.content.strip()
+    _store(key, text, scope_key, fingerprint)
+    return text
+
+
+def stream_completion(
+    messages: List[Message],
+    *,
+    model: str = "gpt-4o",
+    scope: Optional[str] = None,
+    vacancy: Optional[str] = None,
+    fields: Optional[Mapping[str, Any]] = None,
+    ttl: float = LLM_CACHE_TTL,
+    create: Optional[Callable[..., Any]] = None,
+    timeout: Optional[float] = None,
+    **params: Any,
+) -> Iterator[str]:
+    """Yield the completion for ``messages`` token by token.
+
+    Takes the same arguments as :func:`cached_completion` and shares its
+    cache. A cached answer is yielded as a single piece; otherwise the API is
+    called with ``stream=True`` and the deltas are passed on as they arrive,
+    so the caller can render the first token while the rest is generated.
+    The complete text is cached once the stream is exhausted.
+    """
+
+    key = cache_key(model, messages, **params)
+    scope_key, fingerprint = _scope(scope, vacancy, fields)
+    text = _lookup(key, scope_key, fingerprint, ttl)
+    if text is not None:
+        yield text
+        return
+
+    _log_sent(messages)
+    create = create or get_client(timeout).chat.completions.create
+    started = time.perf_counter()
+    pieces: List[str] = []
+    for chunk in create(model=model, messages=messages, stream=True, **params):
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+        if not pieces:
+            logger.debug(
+                "First token from %s after %.2fs", model, time.perf_counter() - started
+            )
+        pieces.append(delta)
+        yield delta
+    _store(key, "".join(pieces).strip(), scope_key, fingerprint)
+
+
+async def cached_completion_async(
+    messages: List[Message],
+    *,
+    create: Callable[..., Awaitable[Any]],
+    model: str = "gpt-4o",
+    scope: Optional[str] = None,
+    vacancy: Optional[str] = None,
+    fields: Optional[Mapping[str, Any]] = None,
+    ttl: float = LLM_CACHE_TTL,
+    **params: Any,
+) -> str:
+    """Async variant of :func:`cached_completion` sharing its cache.
+
+    ``create`` is the ``chat.completions.create`` method of an
+    ``AsyncOpenAI`` client, see :func:`utils.openai_client.new_async_client`.
+    Cache reads and writes run in a worker thread, so a SQLite write lock
+    held by another request does not stall the event loop.
+    """
+
+    key = cache_key(model, messages, **params)
+    scope_key, fingerprint = _scope(scope, vacancy, fields)
+    text = await asyncio.to_thread(_lookup, key, scope_key, fingerprint, ttl)
+    if text is not None:
+        return text
+
+    _log_sent(messages)
+    response = await create(model=model, messages=messages, **params)
+    text = response.choices[0].message.content.strip()
+    await asyncio.to_thread(_store, key, text, scope_key, fingerprint)
+    return text
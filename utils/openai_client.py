@@ -1,71 +1,314 @@
-"""OpenAI client helpers for field extraction functions."""
+"""OpenAI client helpers for field extraction functions.
+
+All API calls go through :func:`get_client`, which builds one process-wide
+client on first use. Its HTTP connection pool is shared by every caller, so
+the TLS connection to the API is reused across Streamlit reruns and sessions.
+Rate limits (429), timeouts and 5xx responses are retried by the SDK with
+exponential backoff, honouring ``Retry-After``. ``OPENAI_BASE_URL`` points the
+client at another endpoint, e.g. a local stand-in server in tests.
+"""
 
 from __future__ import annotations
 
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Sequence, Tuple
+
+from utils.chunking import CHUNK_TOKENS, merge_chunk_fields, split_sections
+from utils.field_map import field_map
+from utils.prompt_encoding import count_tokens, log_prompt_savings, render_prompt
+from utils.text_normalization import normalize_text
+
+if TYPE_CHECKING:  # pragma: no cover
+    import httpx
+    from openai import AsyncOpenAI, OpenAI
+
+# Connections kept open to the API; further requests wait for a free slot.
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+# Seconds an idle keep-alive connection is held open.
+KEEPALIVE_EXPIRY = 30.0
+# Retries on connection errors, 408, 409, 429 and 5xx (exponential backoff).
+MAX_RETRIES = 4
+# Default seconds per request; connecting must succeed much faster.
+REQUEST_TIMEOUT = 60.0
+CONNECT_TIMEOUT = 5.0
+# Timeout of the function-calling extraction, which runs while the user waits.
+EXTRACTION_TIMEOUT = 30.0
+# Chunks of one job ad extracted at the same time (at most MAX_CONNECTIONS).
+MAX_PARALLEL_CHUNKS = 8
+
+_client: Optional["OpenAI"] = None
+_lock = threading.Lock()
+
+
+def _client_options() -> Dict[str, Any]:
+    import httpx
+
+    # Load secrets from environment or .streamlit/secrets.toml (Streamlit macht das automatisch)
+    return {
+        "api_key": os.getenv("OPENAI_API_KEY"),
+        "organization": os.getenv("OPENAI_ORG_ID"),
+        "base_url": os.getenv("OPENAI_BASE_URL") or None,
+        "max_retries": MAX_RETRIES,
+        "timeout": httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+    }
+
+
+def _pool_limits() -> "httpx.Limits":
+    import httpx
+
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+def _build_client() -> "OpenAI":
+    from openai import DefaultHttpxClient, OpenAI
+
+    return OpenAI(
+        **_client_options(), http_client=DefaultHttpxClient(limits=_pool_limits())
+    )
+
+
+def get_client(timeout: Optional[float] = None) -> "OpenAI":
+    """Return the process-wide OpenAI client, creating it on first use.
+
+    Args:
+        timeout: Per-call timeout in seconds. The returned copy shares the
+            connection pool of the process-wide client.
+
+    Returns:
+        The shared client, or a copy of it with ``timeout`` applied.
+    """
+
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = _build_client()
+    if timeout is None:
+        return _client
+    return _client.with_options(timeout=timeout)
+
+
+def new_async_client() -> "AsyncOpenAI":
+    """Return a new ``AsyncOpenAI`` client with the settings of :func:`get_client`.
+
+    Async connections belong to the event loop that opened them, so unlike
+    the synchronous client this one is not shared across the process. Create
+    one per ``asyncio.run`` and close it when the loop is done.
+    """
+
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    return AsyncOpenAI(
+        **_client_options(),
+        http_client=DefaultAsyncHttpxClient(limits=_pool_limits()),
+    )
+
+
+# Wizard fields that describe the input itself rather than the job ad.
+_NOT_EXTRACTED = {"input_url", "uploaded_file"}
+# JSON schema type of the wizard widgets; other widgets take a string.
+_WIDGET_TYPES: Dict[str, Dict[str, Any]] = {
+    "multiselect": {"type": "array", "items": {"type": "string"}},
+    "number_input": {"type": "number"},
+    "checkbox": {"type": "boolean"},
+}
+
+
+def _field_properties() -> Dict[str, Dict[str, Any]]:
+    """Return one function parameter per wizard field of the job ad."""
+
+    properties = {}
+    for key, meta in field_map.items():
+        if key in _NOT_EXTRACTED:
+            continue
+        description = f"{meta['label']}. {meta['help']}"
+        if meta.get("options"):
+            description += " One of: " + ", ".join(meta["options"]) + "."
+        properties[key] = {
+            **_WIDGET_TYPES.get(meta["widget"], {"type": "string"}),
+            "description": description,
+        }
+    return properties
+
+
+# Schema of the forced function call used for extraction. Fields are
+# optional, so every chunk returns only what its sections mention.
+_EXTRACT_FUNCTION = {
+    "name": "extract_job_fields",
+    "description": (
+        "Extract structured job ad fields like title, skills, benefits, "
+        "location. Omit fields the text does not mention."
+    ),
+    "parameters": {"type": "object", "properties": _field_properties()},
+}
+# Field keys the extraction function can return.
+EXTRACTABLE_KEYS = frozenset(_EXTRACT_FUNCTION["parameters"]["properties"])
+_LANGUAGES = {"de": "German", "en": "English"}
 
-from openai import OpenAI
 
-# Load secrets from environment or .streamlit/secrets.toml (Streamlit macht das automatisch)
-client = OpenAI(
-    api_key=os.getenv("OPENAI_API_KEY"),
-    organization=os.getenv("OPENAI_ORG_ID"),
+# User message when some fields are already known, e.g. from the rules.
+_KNOWN_FIELDS_TEMPLATE = (
+    "Fields already known (do not extract them again):\n{data}\n\n"
+    "Extract the remaining job fields from this job ad: {text}"
 )
 
 
+def _extract_function(keys: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Return the function schema, limited to the known ``keys`` if given."""
+
+    if keys is None:
+        return _EXTRACT_FUNCTION
+    properties = _EXTRACT_FUNCTION["parameters"]["properties"]
+    return {
+        **_EXTRACT_FUNCTION,
+        "parameters": {
+            "type": "object",
+            "properties": {key: properties[key] for key in keys if key in properties},
+        },
+    }
+
+
+def extraction_request(
+    text: str,
+    language: str = "de",
+    model: str = "gpt-4o",
+    *,
+    keys: Optional[Sequence[str]] = None,
+    known: Optional[Mapping[str, Any]] = None,
+) -> dict[str, Any]:
+    """Return the ``chat.completions.create`` arguments for one chunk.
+
+    Shared by the interactive extraction and the Batch API pipeline in
+    :mod:`functions.batch_extraction`.
+
+    Args:
+        text: Chunk of the job ad.
+        language: Target language for free-text values.
+        model: Chat model.
+        keys: Fields to ask for; every job ad field by default.
+        known: Values found by earlier extraction steps, sent as compact
+            context via :func:`utils.prompt_encoding.render_prompt`.
+    """
+
+    if known:
+        content = render_prompt(
+            _KNOWN_FIELDS_TEMPLATE, known, name="extraction", model=model, text=text
+        )
+        log_prompt_savings(content)
+    else:
+        content = f"Extract all relevant job fields from this job ad: {text}"
+    return {
+        "model": model,
+        "messages": [
+            {
+                "role": "system",
+                "content": (
+                    "You are an expert for extracting job ad data. Output "
+                    "strictly as function call. Write free-text values in "
+                    f"{_LANGUAGES.get(language, 'German')}."
+                ),
+            },
+            {"role": "user", "content": content},
+        ],
+        "tools": [{"type": "function", "function": _extract_function(keys)}],
+        "tool_choice": {
+            "type": "function",
+            "function": {"name": "extract_job_fields"},
+        },
+        "temperature": 0.2,
+        "max_tokens": 1000,
+    }
+
+
+def chunk_text(text: str, max_tokens: int = CHUNK_TOKENS) -> list[str]:
+    """Return the normalised ``text`` split into extraction chunks."""
+
+    return split_sections(normalize_text(text), max_tokens, count_tokens) or [""]
+
+
+def _extract_chunk(
+    text: str, language: str, model: str = "gpt-4o", **options: Any
+) -> Tuple[Dict[str, Any], int, int]:
+    """Run the function-calling extraction on one chunk of the job ad.
+
+    Returns the fields with the prompt and completion tokens of the call.
+    """
+
+    client = get_client(EXTRACTION_TIMEOUT)
+    response = client.chat.completions.create(  # type: ignore[arg-type,call-overload]
+        **extraction_request(text, language, model, **options)
+    )
+    tool_call = response.choices[0].message.tool_calls[0]
+    arguments = tool_call.function.arguments if tool_call else "{}"
+    usage = response.usage
+    if usage is None:
+        return json.loads(arguments), 0, 0
+    return json.loads(arguments), usage.prompt_tokens, usage.completion_tokens
+
+
 # Funktion für Option 1: Klassisches Function Calling
 def call_extract_fields_function_calling(
-    text: str, language: str = "de"
-) -> dict[str, str]:
+    text: str,
+    language: str = "de",
+    *,
+    max_tokens: int = CHUNK_TOKENS,
+    max_workers: int = MAX_PARALLEL_CHUNKS,
+    model: str = "gpt-4o",
+    keys: Optional[Sequence[str]] = None,
+    known: Optional[Mapping[str, Any]] = None,
+    usage: Optional[Dict[str, int]] = None,
+) -> dict[str, Any]:
     """Extract job fields via OpenAI function calling.
 
+    The normalised text is split at section boundaries into chunks of at
+    most ``max_tokens`` tokens, so long ads are covered up to the last
+    section. The chunks are extracted in parallel over the shared client and
+    the per-chunk fields are merged with :func:`merge_chunk_fields`; a short
+    ad is a single chunk and a single call.
+
     Args:
         text: Raw job advertisement text.
         language: Target language for the response, ``"de"`` or ``"en"``.
+        max_tokens: Token budget of the job ad text per request.
+        max_workers: Maximum number of chunks extracted at the same time.
+        model: Chat model, e.g. ``"gpt-4o-mini"`` for a cheaper first pass.
+        keys: Fields to ask for; every job ad field by default.
+        known: Values already found, sent as context instead of asked for.
+        usage: Receives the summed ``prompt_tokens`` and
+            ``completion_tokens`` of all calls.
 
     Returns:
         Parsed job fields as a dictionary or an error message.
     """
 
-    function_def = {
-        "name": "extract_job_fields",
-        "description": "Extract structured job ad fields like title, skills, benefits, location.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "text": {"type": "string", "description": "Job ad full text"},
-                "language": {"type": "string", "enum": ["en", "de"]},
-            },
-            "required": ["text", "language"],
-        },
-    }
+    options = {"keys": keys, "known": known}
     try:
-        response = client.chat.completions.create(  # type: ignore[arg-type,call-overload]
-            model="gpt-4o",  # Alternativ: "gpt-4" oder "gpt-3.5-turbo"
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert for extracting job ad data. Output strictly as function call.",
-                },
-                {
-                    "role": "user",
-                    "content": f"Extract all relevant job fields from this job ad: {text[:3000]}",
-                },
-            ],
-            tools=[{"type": "function", "function": function_def}],
-            tool_choice={
-                "type": "function",
-                "function": {"name": "extract_job_fields"},
-            },
-            temperature=0.2,
-            max_tokens=1000,
-        )
-        tool_call = response.choices[0].message.tool_calls[0]
-        arguments = tool_call.function.arguments if tool_call else "{}"
-        return json.loads(arguments)
+        chunks = chunk_text(text, max_tokens)
+        if len(chunks) == 1:
+            results = [_extract_chunk(chunks[0], language, model, **options)]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+                results = list(
+                    pool.map(
+                        lambda c: _extract_chunk(c, language, model, **options),
+                        chunks,
+                    )
+                )
     except Exception as e:
         return {"error": str(e)}
+    if usage is not None:
+        for index, name in ((1, "prompt_tokens"), (2, "completion_tokens")):
+            usage[name] = usage.get(name, 0) + sum(r[index] for r in results)
+    fields = [r[0] for r in results]
+    return fields[0] if len(fields) == 1 else merge_chunk_fields(fields)
 
 
 # Funktion für Option 2: Responses API (Tool Loop)
@@ -0,0 +1,212 @@
+"""Compact serialisation of vacancy fields for LLM prompts.
+
+Interpolating the field dictionary into a prompt sends its Python ``repr``:
+quotes, braces, every empty key and the same skill list once per field it was
+copied into. :func:`encode_fields` writes one ``label: value`` line per
+non-empty field instead, with short stable labels and repeated text replaced
+by a reference to the field it first appeared in. :func:`render_prompt` fills
+a prompt template with that block. Once the prompt is actually sent,
+:func:`log_prompt_savings` logs how many prompt tokens it saved compared to
+the dictionary ``repr``; answers served from the LLM cache skip the two
+tokenizations.
+
+Tokens are counted with ``tiktoken`` (pinned in *requirements.txt*) and
+estimated from the text length where it is not installed.
+"""
+
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from utils.chunking import estimate_tokens
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional tokenizer
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Short prompt labels of long field keys; other keys are used as they are.
+FIELD_LABELS = {
+    "primary_responsibilities": "responsibilities",
+    "work_location_city": "city",
+    "department_name": "department",
+    "salary_range_min": "salary_min",
+    "salary_range_max": "salary_max",
+    "salary_currency": "currency",
+    "recruiter_email": "contact",
+    "seniority_level": "seniority",
+    "employment_type": "employment",
+    "role_description": "role",
+    "must_have_skills": "must_skills",
+    "nice_to_have_skills": "nice_skills",
+}
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Return the number of tokens ``text`` costs as input to ``model``."""
+
+    if tiktoken is None:
+        return estimate_tokens(text)
+    try:
+        return len(_encoding(model).encode(text))
+    except Exception:  # pragma: no cover - tokenizer files unavailable
+        return estimate_tokens(text)
+
+
+def _clean(value: Any) -> str:
+    if isinstance(value, (list, tuple, set)):
+        items = []
+        for item in value:
+            item = _clean(item)
+            if item and item.casefold() not in (i.casefold() for i in items):
+                items.append(item)
+        return ", ".join(items)
+    if isinstance(value, Mapping):
+        return "; ".join(
+            f"{key}={_clean(item)}" for key, item in value.items() if _clean(item)
+        )
+    return " ".join(str(value if value is not None else "").split())
+
+
+def encode_fields(
+    fields: Mapping[str, Any], labels: Optional[Mapping[str, str]] = None
+) -> str:
+    """Serialise ``fields`` as compact ``label: value`` lines.
+
+    Empty values are dropped, whitespace is collapsed and duplicate list
+    items are removed. A value identical to an earlier one is written as
+    ``=label`` of the field it first appeared in.
+
+    Args:
+        fields: Vacancy field values by key.
+        labels: Prompt label per key, :data:`FIELD_LABELS` by default. Keys
+            without a label, or whose label is another key or already taken,
+            use the key.
+
+    Returns:
+        The encoded block, one line per non-empty field in input order.
+    """
+
+    labels = FIELD_LABELS if labels is None else labels
+    used: set = set()
+    seen: Dict[str, str] = {}
+    lines = []
+    for key, value in fields.items():
+        text = _clean(value)
+        if not text:
+            continue
+        label = labels.get(key, key)
+        if label != key and (label in used or label in fields):
+            label = key
+        used.add(label)
+        previous = seen.get(text.casefold())
+        if previous is not None:
+            lines.append(f"{label}: ={previous}")
+            continue
+        seen[text.casefold()] = label
+        lines.append(f"{label}: {text}")
+    return "\n".join(lines)
+
+
+class EncodedPrompt(str):
+    """Prompt text from :func:`render_prompt` that remembers its inputs.
+
+    Behaves like the plain prompt string; the extra attributes let
+    :func:`log_prompt_savings` compute the savings only when needed.
+    """
+
+    template: str
+    fields: Mapping[str, Any]
+    name: str
+    model: str
+    extra: Dict[str, Any]
+
+    def __new__(
+        cls,
+        text: str,
+        template: str,
+        fields: Mapping[str, Any],
+        *,
+        name: str,
+        model: str,
+        extra: Dict[str, Any],
+    ) -> "EncodedPrompt":
+        prompt = super().__new__(cls, text)
+        prompt.template = template
+        prompt.fields = fields
+        prompt.name = name
+        prompt.model = model
+        prompt.extra = extra
+        return prompt
+
+
+def render_prompt(
+    template: str,
+    fields: Mapping[str, Any],
+    *,
+    name: str = "prompt",
+    model: str = "gpt-4o",
+    **extra: Any,
+) -> EncodedPrompt:
+    """Fill ``template`` with the encoded ``fields``.
+
+    Args:
+        template: Prompt with a ``{data}`` placeholder and optionally further
+            placeholders given in ``extra``.
+        fields: Vacancy fields inserted as ``{data}``.
+        name: Prompt name used in the log message.
+        model: Model whose tokenizer counts the tokens.
+        **extra: Values of the other placeholders.
+
+    Returns:
+        The compact prompt; pass it to :func:`log_prompt_savings` when it is
+        sent to the API.
+    """
+
+    text = template.format(data=encode_fields(fields), **extra)
+    return EncodedPrompt(
+        text, template, dict(fields), name=name, model=model, extra=extra
+    )
+
+
+def log_prompt_savings(prompt: str) -> None:
+    """Log the tokens ``prompt`` saved; a no-op for plain strings."""
+
+    if not isinstance(prompt, EncodedPrompt):
+        return
+    before, after = prompt_savings(
+        prompt.template, prompt.fields, str(prompt), model=prompt.model, **prompt.extra
+    )
+    logger.info(
+        "Prompt %s: %d tokens instead of %d (%d saved)",
+        prompt.name,
+        after,
+        before,
+        before - after,
+    )
+
+
+def prompt_savings(
+    template: str,
+    fields: Mapping[str, Any],
+    prompt: str,
+    *,
+    model: str = "gpt-4o",
+    **extra: Any,
+) -> Tuple[int, int]:
+    """Return the token counts of the ``repr`` prompt and of ``prompt``."""
+
+    raw = template.format(data=dict(fields), **extra)
+    return count_tokens(raw, model), count_tokens(prompt, model)
@@ -0,0 +1,242 @@
+"""One-click generation of the complete recruiting pack.
+
+The job ad, Boolean search string, interview sheet, candidate persona and
+contact email only depend on the vacancy fields, not on each other, so
+:func:`generate_pack` sends all prompts at once over ``AsyncOpenAI`` and
+writes each answer into its :data:`utils.keys.GENERATED_KEYS` slot as soon as
+it arrives. The batch takes as long as its slowest call. Prompts and cache
+scopes are shared with the single generators in *tools.py*, so artifacts
+generated here are served from the LLM cache there and vice versa.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from utils.keys import GENERATED_KEYS
+from utils.llm_cache import cached_completion_async
+from utils.openai_client import MAX_CONNECTIONS, new_async_client
+from utils.prompt_encoding import render_prompt
+
+# Maximum number of artifact prompts sent at the same time: the whole pack
+# in one wave, capped by the client's connection pool.
+PACK_CONCURRENCY = min(len(GENERATED_KEYS), MAX_CONNECTIONS)
+
+
+@dataclass(frozen=True)
+class Artifact:
+    """Prompt of one generated artifact.
+
+    Attributes:
+        key: Slot in :data:`GENERATED_KEYS` the answer is stored in.
+        scope: LLM cache scope, invalidated when ``fields`` change.
+        fields: Vacancy fields inserted into the prompt.
+        template: Prompt with a ``{data}`` placeholder for the fields.
+        defaults: Values of further placeholders in ``template``.
+    """
+
+    key: str
+    scope: str
+    fields: Tuple[str, ...]
+    template: str
+    defaults: Mapping[str, str] = field(default_factory=dict)
+
+    def collect(self, values: Mapping[str, Any]) -> Dict[str, Any]:
+        """Return the fields of this artifact from ``values``."""
+
+        return {key: values.get(key, "") for key in self.fields}
+
+    def prompt(self, data: Mapping[str, Any], **extra: str) -> str:
+        """Render the prompt for the collected fields ``data``."""
+
+        return render_prompt(
+            self.template, data, name=self.scope, **{**self.defaults, **extra}
+        )
+
+
+JOB_AD = Artifact(
+    "generated_job_ad",
+    "job_ad",
+    (
+        "job_title",
+        "role_purpose",
+        "employment_type",
+        "seniority_level",
+        "company_name",
+        "company_size",
+        "industry",
+        "work_location_city",
+        "department_name",
+        "primary_responsibilities",
+        "hard_skills",
+        "soft_skills",
+        "salary_currency",
+        "salary_range_min",
+        "salary_range_max",
+        "recruiter_email",
+    ),
+    """
+Write a concise, attractive job ad (Markdown) for the following vacancy. Use job title, role, skills, salary, location, company and recruiter contact.
+{data}
+""",
+)
+BOOLEAN_SEARCH = Artifact(
+    "generated_boolean_query",
+    "boolean_search",
+    ("job_title", "hard_skills", "work_location_city", "industry"),
+    """
+As a sourcing expert, write an advanced Boolean search string for this role, with title, must-have skills, city, and industry. Output only the search string.
+{data}
+""",
+)
+INTERVIEW_PREP = Artifact(
+    "generated_interview_prep",
+    "interview_prep",
+    (
+        "job_title",
+        "hard_skills",
+        "soft_skills",
+        "primary_responsibilities",
+        "company_name",
+        "department_name",
+    ),
+    """
+Create a line manager/HR interview prep sheet (Markdown) for this role, including suggested questions for all must-have skills.
+{data}
+""",
+)
+CONTACT_EMAIL = Artifact(
+    "generated_email_template",
+    "contact_email",
+    ("job_title", "company_name", "department_name", "recruiter_email"),
+    """
+Draft a businesslike email for the {contact_target} about this vacancy: {data}. Subject and signature included. Use recruiter email if present.
+""",
+    {"contact_target": "Candidate"},
+)
+CANDIDATE_PERSONA = Artifact(
+    "target_group_analysis",
+    "candidate_persona",
+    ("job_title", "hard_skills", "soft_skills", "company_name", "industry"),
+    """
+Write a short, vivid candidate persona for this vacancy, summarizing background, motivators, where to source, what attracts.
+{data}
+""",
+)
+
+ARTIFACTS: Dict[str, Artifact] = {
+    artifact.key: artifact
+    for artifact in (
+        JOB_AD,
+        INTERVIEW_PREP,
+        CONTACT_EMAIL,
+        CANDIDATE_PERSONA,
+        BOOLEAN_SEARCH,
+    )
+}
+
+
+@dataclass
+class PackResult:
+    """Outcome of generating a single artifact."""
+
+    key: str
+    text: str = ""
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+ProgressCallback = Callable[[PackResult, int, int], None]
+
+
+async def generate_pack(
+    values: Mapping[str, Any],
+    *,
+    keys: Optional[Sequence[str]] = None,
+    concurrency: int = PACK_CONCURRENCY,
+    model: str = "gpt-4o",
+    vacancy: Optional[str] = None,
+    store: Optional[MutableMapping[str, Any]] = None,
+    on_result: Optional[ProgressCallback] = None,
+    client: Optional[Any] = None,
+) -> List[PackResult]:
+    """Generate the artifacts in ``keys`` concurrently.
+
+    Args:
+        values: Vacancy fields, e.g. ``st.session_state``.
+        keys: Slots of :data:`GENERATED_KEYS` to fill; all by default.
+        concurrency: Maximum number of prompts in flight.
+        model: Model used for every artifact.
+        vacancy: Vacancy or session identifier of the LLM cache scopes.
+        store: Mapping that receives each generated text under its key as
+            soon as it completes, e.g. ``st.session_state``.
+        on_result: Called with ``(result, done, total)`` as each artifact
+            completes, in completion order.
+        client: Optional ``AsyncOpenAI`` client; a new one is created and
+            closed otherwise.
+
+    Returns:
+        One result per key in the order of ``keys``. Failed artifacts carry
+        the error message instead of text.
+    """
+
+    keys = list(keys or GENERATED_KEYS)
+    unknown = [key for key in keys if key not in ARTIFACTS]
+    if unknown:
+        raise ValueError(f"Unknown artifact keys: {unknown}")
+    semaphore = asyncio.Semaphore(concurrency)
+    own_client = client is None
+    if client is None:
+        client = new_async_client()
+
+    async def run(artifact: Artifact) -> PackResult:
+        start = time.perf_counter()
+        result = PackResult(artifact.key)
+        data = artifact.collect(values)
+        try:
+            async with semaphore:
+                result.text = await cached_completion_async(
+                    [{"role": "user", "content": artifact.prompt(data)}],
+                    create=client.chat.completions.create,
+                    model=model,
+                    scope=artifact.scope,
+                    vacancy=vacancy,
+                    fields=data,
+                )
+        except Exception as exc:
+            result.error = str(exc) or type(exc).__name__
+        result.seconds = round(time.perf_counter() - start, 3)
+        return result
+
+    results: Dict[str, PackResult] = {}
+    try:
+        for next_done in asyncio.as_completed([run(ARTIFACTS[key]) for key in keys]):
+            result = await next_done
+            results[result.key] = result
+            if store is not None and result.error is None:
+                store[result.key] = result.text
+            if on_result is not None:
+                on_result(result, len(results), len(keys))
+    finally:
+        if own_client:
+            await client.close()
+    return [results[key] for key in keys]
+
+
+def generate_pack_sync(values: Mapping[str, Any], **kwargs: Any) -> List[PackResult]:
+    """Run :func:`generate_pack` from synchronous code such as a Streamlit script."""
+
+    return asyncio.run(generate_pack(values, **kwargs))
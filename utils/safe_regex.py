@@ -0,0 +1,150 @@
+"""Linear-time regular expressions for untrusted job ad text.
+
+Extraction patterns are compiled with :func:`compile_safe`. When the
+``google-re2`` package is installed (it is pinned in *requirements.txt*) its
+linear-time engine is used; otherwise the standard :mod:`re` module runs the
+same patterns, which are written in the RE2-compatible subset (no
+backreferences or lookaround) with bounded repetition; :func:`is_linear`
+checks that. :func:`safe_finditer` additionally feeds the text to the engine
+in bounded slices and stops once the per-document :class:`TimeBudget` is
+spent, so the worst case grows linearly with the size of an upload.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import time
+from typing import Iterator, Optional
+
+try:
+    import re2
+except ImportError:  # pragma: no cover - optional engine
+    re2 = None
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover - Python < 3.11
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+
+# "re2" (default when installed) or "re" to force the standard library engine.
+REGEX_ENGINE = os.getenv("NEED_ANALYSIS_REGEX_ENGINE", "re2" if re2 else "re")
+# Seconds of regex work allowed per document before extraction gives up.
+EXTRACTION_TIME_BUDGET = 2.0
+# Longest slice of text handed to the regex engine at once.
+MAX_SLICE_CHARS = 4096
+
+
+class TimeBudget:
+    """Deadline shared by all regex stages working on one document.
+
+    Args:
+        seconds: Time allowed from construction, ``None`` for no limit.
+    """
+
+    def __init__(self, seconds: Optional[float] = EXTRACTION_TIME_BUDGET) -> None:
+        self.seconds = seconds
+        self._deadline = None if seconds is None else time.monotonic() + seconds
+        self.exhausted = False
+
+    def expired(self) -> bool:
+        """Return ``True`` (and remember it) once the deadline has passed."""
+
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            self.exhausted = True
+        return self.exhausted
+
+
+# Constructs outside the RE2 subset, which need a backtracking engine.
+_BACKTRACKING_OPS = {
+    sre_parse.GROUPREF,
+    sre_parse.GROUPREF_EXISTS,
+    sre_parse.ASSERT,
+    sre_parse.ASSERT_NOT,
+}
+_REPEAT_OPS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}
+
+
+def _backtracks(items, inside_unbounded: bool = False) -> bool:
+    for op, av in items:
+        if op in _BACKTRACKING_OPS:
+            return True
+        if op in _REPEAT_OPS:
+            unbounded = av[1] == sre_parse.MAXREPEAT
+            if unbounded and inside_unbounded:
+                return True
+            if _backtracks(av[2], inside_unbounded or unbounded):
+                return True
+        elif op == sre_parse.SUBPATTERN:
+            if _backtracks(av[-1], inside_unbounded):
+                return True
+        elif op == sre_parse.BRANCH:
+            if any(_backtracks(branch, inside_unbounded) for branch in av[1]):
+                return True
+    return False
+
+
+def is_linear(pattern: str) -> bool:
+    """Return ``True`` if ``pattern`` also runs in linear time under :mod:`re`.
+
+    The pattern must stay in the RE2 subset (no backreferences or
+    lookaround) and must not nest one unbounded repetition inside another,
+    the construct behind catastrophic backtracking such as ``(a+)+``.
+    """
+
+    return not _backtracks(sre_parse.parse(pattern))
+
+
+def compile_safe(pattern: str) -> re.Pattern:
+    """Compile ``pattern`` with the linear-time engine if it is available.
+
+    Flags must be given inline (``(?i)``) so the pattern means the same to
+    both engines. Falls back to :func:`re.compile` when RE2 is not installed,
+    disabled via ``NEED_ANALYSIS_REGEX_ENGINE=re`` or rejects the pattern.
+    """
+
+    if re2 is not None and REGEX_ENGINE == "re2":
+        try:
+            return re2.compile(pattern)
+        except Exception as exc:  # pragma: no cover - depends on re2
+            logger.warning("RE2 rejected pattern %r: %s", pattern, exc)
+    return re.compile(pattern)
+
+
+def _slices(text: str, size: int) -> Iterator[str]:
+    """Split ``text`` at line breaks into slices of at most ``size`` chars."""
+
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            cut = text.rfind("\n", start, end)
+            if cut > start:
+                end = cut + 1
+        yield text[start:end]
+        start = end
+
+
+def safe_finditer(
+    pattern: re.Pattern,
+    text: str,
+    budget: Optional[TimeBudget] = None,
+    *,
+    max_chars: int = MAX_SLICE_CHARS,
+) -> Iterator[re.Match]:
+    """Yield matches of ``pattern`` in ``text`` slice by slice.
+
+    Slices end at line breaks where possible, so patterns that stay within a
+    line see the same input as on the full text; a single line longer than
+    ``max_chars`` is cut. Match offsets are relative to the slice. Scanning
+    stops quietly when ``budget`` expires.
+    """
+
+    for chunk in _slices(text, max_chars):
+        if budget is not None and budget.expired():
+            logger.warning("Regex time budget of %ss exhausted", budget.seconds)
+            return
+        yield from pattern.finditer(chunk)
@@ -0,0 +1,182 @@
+"""Structured parsing of salary statements such as ``45-55k EUR brutto``.
+
+One compiled pattern is shared by field extraction, the wizard processors and
+the summary chart. :func:`parse_salary` handles a single string;
+:func:`parse_salaries` parses a whole column at once for reporting.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from utils.safe_regex import compile_safe
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+# Space, no-break space and narrow no-break space used as digit grouping.
+_GROUP_SPACES = " \u00a0\u202f"
+_CURRENCY = r"€|EUR|Euro|\$|USD|£|GBP|CHF|Fr\."
+# 45.000 | 45,000 | 45 000 | 4.500,50 | 45000 | 45,5
+_NUMBER = (
+    rf"\d{{1,3}}(?:[.,{_GROUP_SPACES}]\d{{3}})+(?:[.,]\d{{1,2}})?|\d+(?:[.,]\d{{1,2}})?"
+)
+_THOUSANDS = r"[^\S\n]?(?:k|Tsd)\b\.?"
+
+SALARY_PATTERN = (
+    rf"(?i)(?P<cur_before>{_CURRENCY})?[^\S\n]{{0,2}}"
+    rf"(?P<min>{_NUMBER})(?P<k_min>{_THOUSANDS})?"
+    rf"[^\S\n]{{0,2}}(?P<cur_mid>{_CURRENCY})?"
+    rf"(?:[^\S\n]{{0,3}}(?:-|–|—|to|bis)[^\S\n]{{0,3}}"
+    rf"(?:{_CURRENCY})?[^\S\n]{{0,2}}"
+    rf"(?P<max>{_NUMBER})(?P<k_max>{_THOUSANDS})?)?"
+    rf"[^\S\n]{{0,2}}(?P<cur_after>{_CURRENCY})?"
+)
+PERIOD_PATTERN = (
+    r"(?i)(?P<year>p\.\s?a\.|/\s?(?:jahr|year|yr|a)\b|pro jahr|per year|"
+    r"per annum|jährlich|jahresgehalt|annual|yearly)"
+    r"|(?P<month>/\s?(?:monat|month|mon|mo|m)\b|pro monat|per month|"
+    r"monatlich|monatsgehalt|monthly)"
+    r"|(?P<week>/\s?(?:woche|week|wk)\b|pro woche|per week|wöchentlich|weekly)"
+    r"|(?P<day>/\s?(?:tag|day)\b|pro tag|per day|tagessatz|daily)"
+    r"|(?P<hour>/\s?(?:std|stunde|hour|hr|h)\b|pro stunde|per hour|"
+    r"stundenlohn|hourly)"
+)
+BASIS_PATTERN = r"(?i)\b(?:(?P<gross>brutto|gross)|(?P<net>netto|net))\b"
+
+_SALARY_RE = compile_safe(SALARY_PATTERN)
+_PERIOD_RE = compile_safe(PERIOD_PATTERN)
+_BASIS_RE = compile_safe(BASIS_PATTERN)
+_GROUPING_RE = re.compile(f"[{_GROUP_SPACES}]")
+_DECIMALS_RE = re.compile(r"[.,](\d{1,2})$")
+
+_CURRENCY_CODES = {"€": "EUR", "euro": "EUR", "$": "USD", "£": "GBP", "fr.": "CHF"}
+# Pay periods per year used to annualise amounts.
+PERIODS_PER_YEAR = {"year": 1, "month": 12, "week": 52, "day": 220, "hour": 1760}
+
+
+@dataclass(frozen=True)
+class SalaryInfo:
+    """Parsed salary statement; fields are ``None`` when not stated."""
+
+    min: Optional[float] = None
+    max: Optional[float] = None
+    currency: Optional[str] = None
+    period: Optional[str] = None
+    basis: Optional[str] = None
+
+    def annualized(self) -> "SalaryInfo":
+        """Return the amounts converted to a yearly figure.
+
+        Amounts without a stated period are returned unchanged.
+        """
+
+        factor = PERIODS_PER_YEAR.get(self.period or "year", 1)
+        return SalaryInfo(
+            None if self.min is None else self.min * factor,
+            None if self.max is None else self.max * factor,
+            self.currency,
+            "year" if self.period else None,
+            self.basis,
+        )
+
+
+def _currency_code(symbol: Optional[str]) -> Optional[str]:
+    if not symbol:
+        return None
+    return _CURRENCY_CODES.get(symbol.lower(), symbol.upper())
+
+
+def parse_amount(number: str, thousands: Optional[str] = None) -> float:
+    """Convert ``45.000``, ``45,5`` or ``4.500,50`` to a float.
+
+    A trailing separator followed by one or two digits is the decimal mark;
+    all other separators group thousands. ``thousands`` (``k``, ``Tsd``)
+    multiplies the result by 1000.
+    """
+
+    compact = _GROUPING_RE.sub("", number)
+    decimals = _DECIMALS_RE.search(compact)
+    whole = compact[: decimals.start()] if decimals else compact
+    fraction = decimals.group(1) if decimals else "0"
+    value = float(whole.replace(".", "").replace(",", "") + "." + fraction)
+    return value * 1000 if thousands else value
+
+
+def _looks_like_pay(match: "re.Match[str]") -> bool:
+    """Return ``True`` for a currency, ``k``/``Tsd``, a range or 4+ digits."""
+
+    marked = ("cur_before", "cur_mid", "cur_after", "k_min", "k_max", "max")
+    if any(match.group(name) for name in marked):
+        return True
+    return parse_amount(match.group("min")) >= 1000
+
+
+def parse_salary(text: str, *, strict: bool = False) -> SalaryInfo:
+    """Parse the first amount or range in ``text``.
+
+    Examples of accepted input: ``45k``, ``45.000 €``, ``€4.500/Monat``,
+    ``50.000 - 60.000 EUR brutto p.a.``, ``25 $/h``.
+
+    With ``strict`` only amounts that look like pay are accepted, so numbers
+    such as ``40 Stunden`` or ``nach 6 Monaten`` after a salary label are
+    skipped.
+    """
+
+    text = str(text or "")
+    matches = _SALARY_RE.finditer(text)
+    if strict:
+        matches = (m for m in matches if _looks_like_pay(m))
+    match = next(matches, None)
+    if match is None:
+        return SalaryInfo()
+    low = parse_amount(match.group("min"), match.group("k_min"))
+    high = low
+    if match.group("max"):
+        high = parse_amount(match.group("max"), match.group("k_max"))
+        if match.group("k_max") and not match.group("k_min") and low < 1000:
+            low *= 1000  # "45-55k"
+    currency = (
+        match.group("cur_before") or match.group("cur_mid") or match.group("cur_after")
+    )
+    period = _PERIOD_RE.search(text)
+    basis = _BASIS_RE.search(text)
+    return SalaryInfo(
+        min(low, high),
+        max(low, high),
+        _currency_code(currency),
+        period.lastgroup if period else None,
+        basis.lastgroup if basis else None,
+    )
+
+
+def parse_salaries(values: Iterable[str]) -> "pd.DataFrame":
+    """Parse a column of salary strings in one call.
+
+    Report columns repeat the same few salary strings many times, so the
+    column is factorised first: every distinct string is parsed once and the
+    results are spread back to all rows with a vectorised ``take``.
+
+    Args:
+        values: Salary strings, e.g. a ``pandas.Series`` read from a report.
+
+    Returns:
+        DataFrame with the :class:`SalaryInfo` columns ``min``, ``max``,
+        ``currency``, ``period`` and ``basis``, one row per input value and
+        the index of ``values`` if it is a Series. Missing amounts are ``NaN``.
+    """
+
+    import pandas as pd
+
+    if not isinstance(values, pd.Series):
+        values = pd.Series(list(values), dtype="object")
+    codes, uniques = pd.factorize(values.fillna("").astype(str))
+    parsed = pd.DataFrame(
+        [tuple(vars(parse_salary(text)).values()) for text in uniques],
+        columns=list(asdict(SalaryInfo())),
+    )
+    frame = parsed.take(codes)
+    frame.index = values.index
+    return frame.astype({"min": float, "max": float})
@@ -0,0 +1,48 @@
+"""Encoding detection for uploaded and downloaded text.
+
+Kept free of other project imports so that both the file extractors and the
+URL fetcher can use it.
+"""
+
+from __future__ import annotations
+
+import codecs
+from typing import Optional
+
+# Number of leading bytes inspected for content sniffing.
+SNIFF_BYTES = 4096
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_CONTROL_BYTES = bytes(set(range(32)) - set(b"\t\n\r\f"))
+
+
+def detect_text_encoding(buffer: memoryview) -> Optional[str]:
+    """Guess the encoding of a text buffer or return ``None`` for binary data.
+
+    Byte order marks win; otherwise UTF-8 is tried on the first
+    :data:`SNIFF_BYTES` bytes and Windows-1252 is the fallback for legacy
+    German/English documents.
+    """
+
+    head = bytes(buffer[:SNIFF_BYTES])
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    if b"\x00" in head:
+        return None
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(
+            head, final=len(buffer) <= SNIFF_BYTES
+        )
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    if head.translate(None, _CONTROL_BYTES) != head:
+        return None
+    return "cp1252"
@@ -0,0 +1,71 @@
+"""Single-pass text normalisation shared by all field extractors."""
+
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+# Number of normalised documents kept in memory.
+NORMALIZE_CACHE_SIZE = 64
+
+_NORMALIZE_RE = re.compile(
+    r"(?P<soft>\u00ad)"
+    # "Soft-\nware" -> "Software"; only when the next word continues lowercase
+    # and is not a conjunction completing a compound ("Daten-\nund Analyse...")
+    r"|(?P<hyphen>(?<=[^\W\d_])-[^\S\n]*\n[^\S\n]*"
+    r"(?-i:(?!(?:und|oder|bis|sowie|bzw|and|or)\b)(?=[a-zäöüß])))"
+    # exemplification markers whose periods would otherwise end a phrase
+    r"|(?P<abbr>[^\S\n]*\b(?:e\.\s?g|i\.\s?e|z\.\s?B|d\.\s?h)\.,?)"
+    # only whitespace that changes is matched, plain spaces and line breaks
+    # are left alone so the callback runs rarely
+    r"|(?P<newline>[^\S\n]+\n[^\S\n]*|\n[^\S\n]+)"
+    r"|(?P<space>[^\S\n]{2,}|[^\S\n ])",
+    re.IGNORECASE,
+)
+
+_cache: "OrderedDict[str, str]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _replace(match: re.Match) -> str:
+    kind = match.lastgroup
+    if kind == "newline":
+        return "\n"
+    if kind == "space":
+        return " "
+    return ""
+
+
+def remember_normalized(text: str, normalized: str) -> None:
+    """Store a previously computed normalisation of ``text`` for reuse."""
+
+    with _lock:
+        _cache[text] = normalized
+        _cache.move_to_end(text)
+        while len(_cache) > NORMALIZE_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def normalize_text(text: str, *, cache: bool = True) -> str:
+    """Return ``text`` normalised for field extraction.
+
+    Applies Unicode NFKC, then a single regex scan that removes soft hyphens,
+    joins words hyphenated across line breaks, drops exemplification
+    abbreviations (``e.g.``, ``i.e.``, ``z. B.``, ``d. h.``), collapses runs of
+    spaces and trims whitespace around line breaks. Results are memoised per
+    document so every extractor working on the same text reuses one pass;
+    pass ``cache=False`` for one-off texts such as a batch corpus.
+    """
+
+    if not cache:
+        return _NORMALIZE_RE.sub(_replace, unicodedata.normalize("NFKC", text))
+    with _lock:
+        cached = _cache.get(text)
+        if cached is not None:
+            _cache.move_to_end(text)
+            return cached
+    normalized = _NORMALIZE_RE.sub(_replace, unicodedata.normalize("NFKC", text))
+    remember_normalized(text, normalized)
+    return normalized
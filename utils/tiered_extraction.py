@@ -0,0 +1,319 @@
+"""Confidence-gated, tiered field extraction.
+
+Fields are resolved by the cheapest tier that is confident enough:
+
+1. ``rules`` – regex, label scanner and gazetteer results, each with a
+   confidence score. Values at or above ``CONFIDENCE_THRESHOLD`` are final.
+2. ``small`` – a fast, cheap model asked only for the *simple* leftovers
+   (short facts such as title, city or salary).
+3. ``large`` – the large model, asked only for the fields still missing.
+
+Both model tiers use the chunked function-calling extraction of
+:mod:`utils.openai_client`, with the schema limited to the fields they are
+asked for and the values already resolved sent as compact context.
+
+Every tier records its latency and cost in a :class:`TierStats` together with
+what it saved compared to asking the large model for the same fields. The
+savings are estimates from the token counts and the price and latency tables
+below.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from utils.gazetteer import scan_gazetteer
+from utils.openai_client import call_extract_fields_function_calling
+from utils.prompt_encoding import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Rule results below this confidence are handed to the model tiers.
+CONFIDENCE_THRESHOLD = 0.75
+SMALL_MODEL = "gpt-4o-mini"
+LARGE_MODEL = "gpt-4o"
+# USD per million input and output tokens.
+MODEL_PRICES = {"gpt-4o-mini": (0.15, 0.60), "gpt-4o": (2.50, 10.00)}
+# Rough latency per model: seconds per call and per output token.
+MODEL_LATENCY = {"gpt-4o-mini": (0.4, 0.006), "gpt-4o": (0.8, 0.02)}
+# Confidence of gazetteer hits, which are exact dictionary terms.
+GAZETTEER_CONFIDENCE = 0.8
+# Nominal confidence of values returned by the model tiers.
+MODEL_CONFIDENCE = {"small": 0.8, "large": 0.9}
+# Short factual fields the small model handles reliably; the rest needs the
+# large model.
+SIMPLE_FIELDS = frozenset(
+    {
+        "job_title",
+        "company_name",
+        "company_website",
+        "company_size",
+        "industry",
+        "city",
+        "work_location_city",
+        "department_name",
+        "employment_type",
+        "seniority_level",
+        "job_type",
+        "contract_type",
+        "job_level",
+        "salary_currency",
+        "salary_range_min",
+        "salary_range_max",
+        "recruiter_email",
+        "application_deadline",
+        "languages_required",
+        "start_date",
+        "salary_range",
+        "currency",
+        "language_requirements",
+        "recruitment_contact_email",
+        "date_of_employment_start",
+    }
+)
+
+
+@dataclass
+class FieldValue:
+    """An extracted value with its confidence and the tier that found it."""
+
+    value: Any
+    confidence: float
+    tier: str = "rules"
+
+
+@dataclass
+class TierStats:
+    """Work done and saved by one extraction tier."""
+
+    name: str
+    model: Optional[str] = None
+    requested: int = 0
+    filled: int = 0
+    seconds: float = 0.0
+    cost: float = 0.0
+    saved_seconds: float = 0.0
+    saved_cost: float = 0.0
+
+
+@dataclass
+class TieredResult:
+    """Fields resolved by :func:`extract_tiered` and the per-tier statistics."""
+
+    fields: Dict[str, FieldValue] = field(default_factory=dict)
+    stats: List[TierStats] = field(default_factory=list)
+
+    def values(self) -> Dict[str, Any]:
+        """Return the plain ``key -> value`` dictionary."""
+
+        return {key: item.value for key, item in self.fields.items()}
+
+
+def gazetteer_values(text: str, key_map: Mapping[str, str]) -> Dict[str, FieldValue]:
+    """Return gazetteer hits as scored values.
+
+    Args:
+        text: Job ad text.
+        key_map: Gazetteer key (e.g. ``hard_skills``) to target field key.
+    """
+
+    found = scan_gazetteer(text)
+    return {
+        target: FieldValue(", ".join(found[key]), GAZETTEER_CONFIDENCE)
+        for key, target in key_map.items()
+        if found.get(key)
+    }
+
+
+def price(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Return the USD cost of a call, ``0.0`` for models without a price."""
+
+    per_input, per_output = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * per_input + completion_tokens * per_output) / 1e6
+
+
+def estimate_seconds(model: str, completion_tokens: int) -> float:
+    """Return the typical latency of a call producing ``completion_tokens``."""
+
+    per_call, per_token = MODEL_LATENCY.get(model, (0.0, 0.0))
+    return per_call + completion_tokens * per_token
+
+
+# Scored rule results, or the rule pass producing them from the text.
+Rules = Union[Mapping[str, FieldValue], Callable[[str], Mapping[str, FieldValue]]]
+
+# ``(text, keys, model=, language=, known=) -> (fields, prompt_tokens,
+# completion_tokens)``
+Extractor = Callable[..., Tuple[Dict[str, Any], int, int]]
+
+
+def extract_fields(
+    text: str,
+    keys: List[str],
+    *,
+    model: str,
+    language: str = "de",
+    known: Optional[Mapping[str, Any]] = None,
+) -> Tuple[Dict[str, Any], int, int]:
+    """Ask ``model`` for ``keys``; return the fields with the token usage.
+
+    Raises:
+        RuntimeError: If the extraction failed.
+    """
+
+    usage: Dict[str, int] = {}
+    data = call_extract_fields_function_calling(
+        text, language, model=model, keys=keys, known=known, usage=usage
+    )
+    if "error" in data and "error" not in keys:
+        raise RuntimeError(data["error"])
+    return data, usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+
+def _baseline(
+    text: str, values: Mapping[str, Any], large_model: str
+) -> Tuple[float, float]:
+    """Cost and latency of asking the large model for ``values``."""
+
+    if not values:
+        return 0.0, 0.0
+    prompt_tokens = count_tokens(text, large_model)
+    output_tokens = count_tokens(json.dumps(values, ensure_ascii=False), large_model)
+    return (
+        price(large_model, prompt_tokens, output_tokens),
+        estimate_seconds(large_model, output_tokens),
+    )
+
+
+def _run_model_tier(
+    name: str,
+    model: str,
+    keys: List[str],
+    text: str,
+    language: str,
+    result: TieredResult,
+    extract: Extractor,
+) -> Dict[str, Any]:
+    stats = TierStats(name, model, requested=len(keys))
+    result.stats.append(stats)
+    if not keys:
+        return {}
+    known = {key: item.value for key, item in result.fields.items()}
+    start = time.perf_counter()
+    try:
+        data, prompt_tokens, completion_tokens = extract(
+            text, keys, model=model, language=language, known=known
+        )
+    except Exception as exc:
+        logger.warning("Extraction tier %s failed: %s", name, exc)
+        data, prompt_tokens, completion_tokens = {}, 0, 0
+    stats.seconds = time.perf_counter() - start
+    stats.cost = price(model, prompt_tokens, completion_tokens)
+    found = {key: data[key] for key in keys if data.get(key) not in (None, "", [])}
+    for key, value in found.items():
+        result.fields[key] = FieldValue(value, MODEL_CONFIDENCE[name], name)
+    stats.filled = len(found)
+    return found
+
+
+def extract_tiered(
+    text: str,
+    keys: Iterable[str],
+    rules: Rules,
+    *,
+    language: str = "de",
+    threshold: float = CONFIDENCE_THRESHOLD,
+    simple_fields: Iterable[str] = SIMPLE_FIELDS,
+    small_model: str = SMALL_MODEL,
+    large_model: str = LARGE_MODEL,
+    extract: Extractor = extract_fields,
+) -> TieredResult:
+    """Resolve ``keys`` from the cheapest confident tier.
+
+    Args:
+        text: Job ad text sent to the model tiers.
+        keys: Field keys to fill.
+        rules: Scored rule results (regex, scanner, gazetteer), or a callable
+            computing them from ``text``; only a callable is included in the
+            latency of the ``rules`` tier.
+        language: Target language for free-text values.
+        threshold: Minimum confidence at which a rule value is final.
+        simple_fields: Keys the small model may answer.
+        small_model: Model of the ``small`` tier.
+        large_model: Model of the ``large`` tier; also the savings baseline.
+        extract: Model extraction step, defaults to :func:`extract_fields`.
+
+    Returns:
+        The resolved fields and one :class:`TierStats` per tier. A rule value
+        below the threshold is kept if no model tier finds the field, and
+        rule values of keys not in ``keys`` are passed through unchanged.
+    """
+
+    keys = list(dict.fromkeys(keys))
+    simple = set(simple_fields)
+    result = TieredResult()
+
+    start = time.perf_counter()
+    if callable(rules):
+        rules = rules(text)
+    accepted = {
+        key: rules[key]
+        for key in keys
+        if key in rules and rules[key].value and rules[key].confidence >= threshold
+    }
+    result.fields.update(accepted)
+    rules_stats = TierStats("rules", requested=len(keys), filled=len(accepted))
+    rules_stats.seconds = time.perf_counter() - start
+    result.stats.append(rules_stats)
+
+    missing = [key for key in keys if key not in accepted]
+    small_found = _run_model_tier(
+        "small",
+        small_model,
+        [key for key in missing if key in simple],
+        text,
+        language,
+        result,
+        extract,
+    )
+    remaining = [key for key in missing if key not in small_found]
+    _run_model_tier("large", large_model, remaining, text, language, result, extract)
+
+    for key, item in rules.items():
+        if key not in result.fields and item.value:
+            result.fields[key] = item
+
+    baselines = {
+        "rules": {key: item.value for key, item in accepted.items()},
+        "small": small_found,
+    }
+    for stats in result.stats:
+        if stats.name in baselines:
+            cost, seconds = _baseline(text, baselines[stats.name], large_model)
+            stats.saved_cost = cost - stats.cost
+            stats.saved_seconds = max(seconds - stats.seconds, 0.0)
+        logger.info(
+            "Tier %s: %d/%d fields in %.2fs for $%.5f (saved %.2fs, $%.5f)",
+            stats.name,
+            stats.filled,
+            stats.requested,
+            stats.seconds,
+            stats.cost,
+            stats.saved_seconds,
+            stats.saved_cost,
+        )
+    return result
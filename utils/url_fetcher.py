@@ -0,0 +1,235 @@
+"""Fetch job ads from URLs with a size cap and conditional-GET caching."""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import re
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+import httpx
+
+from utils.disk_cache import CACHE_DIR, DiskLRUCache
+from utils.http_session import get_session
+from utils.text_encoding import detect_text_encoding
+
+# Largest response body accepted for a single job ad page.
+MAX_URL_BYTES = 2 * 2**20
+URL_TIMEOUT = 10
+# Leading bytes of a page searched for a ``<meta charset>`` declaration.
+SNIFF_META_BYTES = 4096
+
+_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+
+_BLOCK_TAGS = {
+    "address",
+    "article",
+    "br",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "footer",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "header",
+    "hr",
+    "li",
+    "main",
+    "ol",
+    "p",
+    "section",
+    "table",
+    "td",
+    "th",
+    "tr",
+    "ul",
+}
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "head"}
+
+
+class _TextExtractor(HTMLParser):
+    """Collect visible text and turn block elements into line breaks."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data) -> None:
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """Return the visible text of ``html`` with one block element per line."""
+
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    lines = (
+        re.sub(r"[ \t\r\f\v\xa0]+", " ", line).strip()
+        for line in "".join(parser.parts).split("\n")
+    )
+    return "\n".join(line for line in lines if line)
+
+
+@lru_cache(maxsize=1)
+def _url_cache() -> DiskLRUCache:
+    return DiskLRUCache(CACHE_DIR / "urls.sqlite3", max_bytes=64 * 2**20)
+
+
+def _validator_headers(entry: Optional[Dict[str, str]]) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def _check_declared_size(response, max_bytes: int) -> None:
+    declared = response.headers.get("Content-Length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise ValueError(f"Response larger than {max_bytes} bytes")
+
+
+def _append_capped(body: bytearray, chunk: bytes, max_bytes: int) -> None:
+    body.extend(chunk)
+    if len(body) > max_bytes:
+        raise ValueError(f"Response larger than {max_bytes} bytes")
+
+
+def _read_capped(response, max_bytes: int) -> bytes:
+    _check_declared_size(response, max_bytes)
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=65536):
+        _append_capped(body, chunk, max_bytes)
+    return bytes(body)
+
+
+def _charset(response, body: bytes) -> str:
+    """Return the encoding of ``body``.
+
+    A charset in the ``Content-Type`` header wins, then a ``<meta charset>``
+    declaration; otherwise the bytes are sniffed. The ISO-8859-1 default that
+    ``requests`` reports for ``text/*`` without a charset is ignored.
+    """
+
+    declared = _CHARSET_RE.search(response.headers.get("Content-Type", ""))
+    if declared is None:
+        declared = _META_CHARSET_RE.search(body[:SNIFF_META_BYTES])
+    if declared is not None:
+        name = declared.group(1)
+        if isinstance(name, bytes):
+            name = name.decode("ascii")
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            pass
+    return detect_text_encoding(memoryview(body)) or "utf-8"
+
+
+def _to_text(response, body: bytes) -> str:
+    decoded = body.decode(_charset(response, body), errors="replace")
+    content_type = response.headers.get("Content-Type", "")
+    if "html" in content_type or decoded.lstrip()[:1] == "<":
+        return html_to_text(decoded)
+    return decoded
+
+
+def _remember(url: str, response, text: str) -> None:
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        _url_cache().put(
+            url, {"etag": etag, "last_modified": last_modified, "text": text}
+        )
+
+
+def fetch_url_text(
+    url: str, *, max_bytes: int = MAX_URL_BYTES, timeout: float = URL_TIMEOUT
+) -> str:
+    """Download ``url`` and return its plain text.
+
+    The body is streamed and aborted once it exceeds ``max_bytes``. HTML is
+    stripped to text. ``ETag`` and ``Last-Modified`` validators are stored
+    with the text, so fetching the same page again sends a conditional GET
+    and a ``304 Not Modified`` answer is served from the local cache.
+
+    Args:
+        url: Address of the job ad.
+        max_bytes: Maximum accepted response size.
+        timeout: Connect and read timeout in seconds.
+
+    Returns:
+        Plain text of the page.
+
+    Raises:
+        ValueError: If the response exceeds ``max_bytes``.
+        requests.RequestException: On network or HTTP errors.
+    """
+
+    entry = _url_cache().get(url)
+    response = get_session().get(
+        url, headers=_validator_headers(entry), stream=True, timeout=timeout
+    )
+    try:
+        if response.status_code == 304 and entry:
+            return entry["text"]
+        response.raise_for_status()
+        text = _to_text(response, _read_capped(response, max_bytes))
+    finally:
+        response.close()
+
+    _remember(url, response, text)
+    return text
+
+
+async def fetch_url_text_async(
+    client: httpx.AsyncClient, url: str, *, max_bytes: int = MAX_URL_BYTES
+) -> str:
+    """Async variant of :func:`fetch_url_text` using an ``httpx`` client.
+
+    Shares the byte cap, HTML stripping and conditional-GET cache with the
+    synchronous fetcher. Timeouts are taken from ``client``; the SQLite cache
+    is read and written in a worker thread so the event loop keeps running.
+
+    Raises:
+        ValueError: If the response exceeds ``max_bytes``.
+        httpx.HTTPError: On network or HTTP errors.
+    """
+
+    entry = await asyncio.to_thread(_url_cache().get, url)
+    async with client.stream("GET", url, headers=_validator_headers(entry)) as response:
+        if response.status_code == 304 and entry:
+            return entry["text"]
+        response.raise_for_status()
+        _check_declared_size(response, max_bytes)
+        body = bytearray()
+        async for chunk in response.aiter_bytes(65536):
+            _append_capped(body, chunk, max_bytes)
+        text = _to_text(response, bytes(body))
+
+    await asyncio.to_thread(_remember, url, response, text)
+    return text
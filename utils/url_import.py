@@ -0,0 +1,128 @@
+"""Concurrent import of many job ad URLs."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+import httpx
+
+from utils.url_fetcher import MAX_URL_BYTES, URL_TIMEOUT, fetch_url_text_async
+from utils.utils_jobinfo import basic_field_extraction
+
+# Maximum number of URLs fetched at the same time.
+URL_CONCURRENCY = 10
+# Maximum number of simultaneous requests to one host.
+URL_PER_HOST = 2
+# Overall time budget for a batch of URLs in seconds.
+URL_DEADLINE = 60.0
+
+
+@dataclass
+class UrlImportResult:
+    """Outcome of importing a single URL."""
+
+    url: str
+    fields: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+ProgressCallback = Callable[[UrlImportResult, int, int], None]
+
+
+async def import_urls(
+    urls: Sequence[str],
+    *,
+    concurrency: int = URL_CONCURRENCY,
+    per_host: int = URL_PER_HOST,
+    deadline: float = URL_DEADLINE,
+    timeout: float = URL_TIMEOUT,
+    max_bytes: int = MAX_URL_BYTES,
+    on_result: Optional[ProgressCallback] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> List[UrlImportResult]:
+    """Fetch ``urls`` concurrently and extract fields as each page arrives.
+
+    At most ``concurrency`` requests run at once and at most ``per_host`` of
+    them target the same host; URLs waiting for a busy host do not take a
+    global slot. Field extraction runs in a worker thread so it does not
+    block the other downloads. URLs not finished within ``deadline`` seconds
+    are cancelled and reported with an error.
+
+    Args:
+        urls: Job ad URLs; duplicates are fetched once.
+        concurrency: Global limit of parallel requests.
+        per_host: Limit of parallel requests per host name.
+        deadline: Time budget for the whole batch in seconds.
+        timeout: Timeout of a single request in seconds.
+        max_bytes: Maximum accepted response size per URL.
+        on_result: Called with ``(result, done, total)`` after every URL.
+        client: Optional preconfigured ``httpx.AsyncClient``.
+
+    Returns:
+        One result per unique URL in input order.
+    """
+
+    unique = list(dict.fromkeys(u.strip() for u in urls if u.strip()))
+    results: Dict[str, UrlImportResult] = {}
+    overall = asyncio.Semaphore(concurrency)
+    hosts: Dict[str, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(per_host)
+    )
+    own_client = client is None
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=concurrency),
+        )
+
+    async def run(url: str) -> UrlImportResult:
+        start = time.perf_counter()
+        result = UrlImportResult(url)
+        try:
+            # Wait for the host first: a task queued behind a busy host must
+            # not hold one of the global slots other hosts could use.
+            async with hosts[urlsplit(url).hostname or ""], overall:
+                text = await fetch_url_text_async(client, url, max_bytes=max_bytes)
+            result.fields = await asyncio.to_thread(basic_field_extraction, text)
+            result.fields["input_url"] = url
+        except Exception as exc:
+            result.error = str(exc) or type(exc).__name__
+        result.seconds = round(time.perf_counter() - start, 3)
+        return result
+
+    tasks = [asyncio.ensure_future(run(url)) for url in unique]
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=deadline):
+            try:
+                result = await next_done
+            except asyncio.TimeoutError:
+                break
+            results[result.url] = result
+            if on_result is not None:
+                on_result(result, len(results), len(unique))
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if own_client:
+            await client.aclose()
+
+    for url in unique:
+        if url not in results:
+            results[url] = UrlImportResult(url, error="deadline exceeded")
+            if on_result is not None:
+                on_result(results[url], len(results), len(unique))
+    return [results[url] for url in unique]
+
+
+def import_urls_sync(urls: Sequence[str], **kwargs) -> List[UrlImportResult]:
+    """Run :func:`import_urls` from synchronous code such as a Streamlit script."""
+
+    return asyncio.run(import_urls(urls, **kwargs))
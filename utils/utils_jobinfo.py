@@ -4,153 +4,432 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import re
-from typing import Dict, Optional
-
-from utils.keys import ALL_STEP_KEYS
+from collections import OrderedDict
+from functools import lru_cache
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from utils.disk_cache import CACHE_DIR, DiskLRUCache
+from utils.extractors import iter_chunks, open_buffer, sniff_file_type
+from utils.field_scanner import is_label_line, scan_fields
+from utils.gazetteer import scan_gazetteer
+from utils.keys import ALL_STEP_KEYS, MANDATORY_KEYS
+from utils.safe_regex import TimeBudget, compile_safe, safe_finditer
+from utils.salary import parse_salary
+from utils.text_normalization import normalize_text, remember_normalized
 
 from utils.i18n import tr
 
-import docx
-import fitz  # PyMuPDF
 import streamlit as st
 
+# Version of the extraction output stored in the persistent cache. Bump it
+# whenever the extractors, the normalisation or the returned fields change,
+# so results cached by an older deploy are not served again.
+EXTRACTION_VERSION = 4
+
+# Distinct documents whose fields ``extract_fields_batch`` remembers to skip
+# repeated texts; the least recently seen one is dropped beyond that.
+BATCH_DEDUP_SIZE = 4096
+
+# Default number of PDF pages scanned for fields before the scan gives up.
+MAX_PDF_PAGES = 20
+
+# Keys that ``basic_field_extraction`` fills from typical job ads; used as the
+# early-stop targets of ``extract_fields_from_pages``.
+EXTRACTED_KEYS = (
+    "job_title",
+    "company_name",
+    "city",
+    "company_website",
+    "job_type",
+    "contract_type",
+    "job_level",
+    "must_have_skills",
+)
+
+# Comma separated skill lists that are merged across pages.
+_SKILL_KEYS = ("must_have_skills", "hard_skills")
+# Bounded, RE2-compatible; a phrase ends at the next period or line break.
+_SKILL_RE = compile_safe(
+    r"(?i)(?:proficiency in|experience with|knowledge of|proficient in)\s+"
+    r"([^.\n]{1,300})"
+)
+_SKILL_SPLIT_RE = re.compile(r",| and | und |&")
+# A skill phrase at the end of a line; its skills may start on a later line.
+_SKILL_TRIGGER_END_RE = re.compile(
+    r"(?i)(?:proficiency in|experience with|knowledge of|proficient in)\s*$"
+)
+
+
+def iter_pdf_pages(file) -> Iterator[str]:
+    """Yield the text of a PDF file one page at a time."""
+    return iter_chunks(file, "pdf")
+
 
 def extract_text_from_pdf(file) -> str:
     """Return plain text from a PDF file."""
-    file.seek(0)
-    data = file.read()
-    doc = fitz.open(stream=data, filetype="pdf")
-    return "".join(page.get_text() for page in doc)
+    return "".join(iter_pdf_pages(file))
 
 
 def extract_text_from_docx(file) -> str:
     """Return text from a DOCX file including tables."""
+    return "\n".join(iter_chunks(file, "docx"))
 
-    file.seek(0)
-    doc = docx.Document(file)
-    lines = [para.text for para in doc.paragraphs]
 
-    # Include table cell text (if any). Some job ad templates store
-    # important fields like the job title in tables.
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                if cell.text:
-                    lines.append(cell.text)
+def detect_file_type(file) -> Optional[str]:
+    """Detect the file type from the content's leading bytes.
 
-    return "\n".join(lines)
+    The filename extension is ignored: PDF and RTF headers, ZIP containers
+    holding ``word/document.xml``, HTML and decodable text are recognised by
+    :func:`utils.extractors.sniff_file_type`. ``file`` may be an uploaded file
+    object, a path on disk, ``bytes`` or a ``memoryview``.
+    """
+    with open_buffer(file) as buffer:
+        return sniff_file_type(buffer)
 
 
-def detect_file_type(file) -> Optional[str]:
-    """Detect file type based on extension."""
-    name = file.name.lower()
-    if name.endswith(".pdf"):
-        return "pdf"
-    if name.endswith(".docx"):
-        return "docx"
-    if name.endswith(".txt"):
-        return "txt"
-    return None
-
-
-def extract_text(file) -> str:
-    """Extract content from a supported file."""
-    filetype = detect_file_type(file)
+def extract_text(file, file_type: Optional[str] = None) -> str:
+    """Extract content from a supported file.
+
+    Args:
+        file: Uploaded file object, path on disk, ``bytes`` or ``memoryview``.
+        file_type: Explicit file type; detected from the content if omitted.
+
+    Raises:
+        ValueError: If the content is not a supported document type.
+    """
+    filetype = file_type or detect_file_type(file)
     if filetype == "pdf":
         return extract_text_from_pdf(file)
     if filetype == "docx":
         return extract_text_from_docx(file)
-    if filetype == "txt":
-        file.seek(0)
-        return file.read().decode("utf-8")
+    if filetype in ("txt", "html", "rtf"):
+        return "".join(iter_chunks(file, filetype))
     raise ValueError("Unsupported file type")
 
 
-def basic_field_extraction(text: str) -> Dict[str, str]:
+@lru_cache(maxsize=1)
+def _extraction_cache() -> DiskLRUCache:
+    return DiskLRUCache(CACHE_DIR / "extraction.sqlite3")
+
+
+def extract_fields_cached(file) -> Tuple[str, Dict[str, str]]:
+    """Return extracted text and fields for ``file``, reusing earlier results.
+
+    Results are keyed by the SHA-256 of the uploaded bytes and
+    :data:`EXTRACTION_VERSION`, so repeated uploads of the same document skip
+    parsing and field extraction entirely until the extraction changes. The
+    normalised text is cached alongside the raw text and handed back to
+    :func:`utils.text_normalization.normalize_text` on a hit.
+
+    Args:
+        file: Uploaded file object with a ``name`` attribute.
+
+    Returns:
+        Tuple of the extracted text and the field dictionary.
+
+    Raises:
+        ValueError: If the content is not a supported document type.
+    """
+
+    with open_buffer(file) as buffer:
+        digest = hashlib.sha256(buffer).hexdigest()
+        file_type = sniff_file_type(buffer)
+    key = f"v{EXTRACTION_VERSION}:{digest}"
+    cache = _extraction_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        if "normalized" in cached:
+            remember_normalized(cached["text"], cached["normalized"])
+        return cached["text"], cached["fields"]
+
+    if file_type == "pdf":
+        fields = extract_fields_from_pages(iter_pdf_pages(file))
+        text = fields["parsed_data_raw"]
+    else:
+        text = extract_text(file, file_type)
+        fields = basic_field_extraction(text)
+    cache.put(key, {"text": text, "normalized": normalize_text(text), "fields": fields})
+    return text, fields
+
+
+def basic_field_extraction(
+    text: str,
+    normalized: Optional[str] = None,
+    *,
+    budget: Optional[TimeBudget] = None,
+) -> Dict[str, str]:
     """Return a dictionary with extracted fields from ``text``.
 
-    This naive regex approach detects ``job_title``, ``company_name`` and some
-    simple skill statements. The raw text is stored under ``parsed_data_raw``.
+    ``Label: value`` lines are resolved in a single pass by
+    :func:`utils.field_scanner.scan_fields` using the German and English
+    wizard labels. Employment terms and skills from the local dictionary are
+    found by :func:`utils.gazetteer.scan_gazetteer`; dictionary skills go to
+    ``hard_skills`` while ``must_have_skills`` holds skills named after
+    phrases like "experience with". The patterns run on the output of
+    :func:`utils.text_normalization.normalize_text`; pass ``normalized`` when
+    it is already known. Patterns are compiled with
+    :func:`utils.safe_regex.compile_safe` and stop once ``budget`` (default
+    :data:`utils.safe_regex.EXTRACTION_TIME_BUDGET`) is spent, so hostile
+    uploads cannot stall extraction. The raw text is stored under
+    ``parsed_data_raw``.
     Any missing keys from :data:`keys.ALL_STEP_KEYS` are included with empty
     strings so that Streamlit widgets can be pre-populated consistently.
     """
 
     fields: Dict[str, str] = {"parsed_data_raw": text}
+    text = normalized if normalized is not None else normalize_text(text)
+    fields.update(_extract_fields(text, budget or TimeBudget()))
+    for key in ALL_STEP_KEYS:
+        fields.setdefault(key, "")
+    return fields
 
-    job_title = re.search(
-        r"(?im)^\s*(Stellenbezeichnung|Jobtitel|Position)\s*[:\-]\s*(.+)$",
-        text,
-    )
-    if job_title:
-        fields["job_title"] = job_title.group(2).strip()
-
-    company_name = re.search(
-        r"(?im)^\s*(Unternehmen|Company|Firma)\s*[:\-]\s*(.+)$",
-        text,
-    )
-    if company_name:
-        fields["company_name"] = company_name.group(2).strip()
-
-    city = re.search(
-        r"(?im)^\s*(Stadt|Ort|City)\s*[:\-]\s*(.+)$",
-        text,
-    )
-    if city:
-        fields["city"] = city.group(2).strip()
 
-    website = re.search(
-        r"(?im)^\s*(Unternehmenswebsite|Website|Webseite|Company Website)\s*[:\-]\s*(\S+)",
-        text,
-    )
-    if website:
-        fields["company_website"] = website.group(2).strip()
+def _extract_parts(
+    text: str, budget: TimeBudget, line_cache: Optional[dict] = None
+) -> Dict[str, Any]:
+    """Return the raw findings in the normalised ``text``."""
 
-    job_type_match = re.search(
-        r"(?i)\b(full[-\s]?time|teilzeit|part[-\s]?time|praktikum|internship|freelance)\b",
-        text,
-    )
-    if job_type_match:
-        fields["job_type"] = job_type_match.group(1).replace("-", " ").title()
-
-    contract_type_match = re.search(
-        r"(?i)\b(unbefristet|permanent|befristet|fixed[-\s]?term|werkvertrag|contract for work)\b",
-        text,
-    )
-    if contract_type_match:
-        fields["contract_type"] = contract_type_match.group(1).replace("-", " ").title()
-
-    job_level_match = re.search(r"(?i)\b(junior|mid|senior|lead|management)\b", text)
-    if job_level_match:
-        fields["job_level"] = job_level_match.group(1).title()
+    labels: Dict[str, str] = {}
+    for key, value in scan_fields(text).items():
+        if key == "company_website":
+            value = value.split()[0]
+        labels[key] = value
 
     # --- very small skill extraction -------------------------------------
-    cleaned_text = re.sub(r"e\.g\.,?", "", text, flags=re.IGNORECASE)
-    cleaned_text = re.sub(r"i\.e\.,?", "", cleaned_text, flags=re.IGNORECASE)
-    skill_phrases = re.findall(
-        r"(?i)(?:proficiency in|experience with|knowledge of|proficient in)\s+(.+?)(?:\.|\n)",
-        cleaned_text,
-    )
+    # ``e.g.``/``i.e.`` are already masked by the normalisation stage
     skills: list[str] = []
-    for phrase in skill_phrases:
-        clean = re.sub(r"\(e\.g\.,?", "", phrase)
-        clean = re.sub(r"[()]", ",", clean)
-        clean = re.sub(r"[\.\n]", "", clean)
-        clean = re.sub(r"\s+", " ", clean)
-        parts = re.split(r",| and | und |&", clean)
+    for match in safe_finditer(_SKILL_RE, text, budget):
+        phrase = match.group(1)
+        clean = phrase.replace("(", ",").replace(")", ",")
+        parts = _SKILL_SPLIT_RE.split(clean)
         for part in parts:
             part = part.strip()
             if part and part not in skills:
                 skills.append(part)
-    if skills:
-        fields["must_have_skills"] = ", ".join(skills)
+    return {
+        "labels": labels,
+        # employment terms and skills from the gazetteer in one automaton pass
+        "gazetteer": scan_gazetteer(text, line_cache),
+        "skills": skills,
+    }
+
+
+def _combine_parts(parts: Mapping[str, Any]) -> Dict[str, str]:
+    """Turn the findings of :func:`_extract_parts` into fields."""
+
+    fields: Dict[str, str] = dict(parts["labels"])
+    if fields.get("salary_range") and not fields.get("currency"):
+        currency = parse_salary(fields["salary_range"]).currency
+        if currency:
+            fields["currency"] = currency
+
+    found = parts["gazetteer"]
+    for key in ("job_type", "contract_type", "job_level"):
+        if found.get(key):
+            fields[key] = found[key][0]
+    if found.get("hard_skills") and not fields.get("hard_skills"):
+        fields["hard_skills"] = ", ".join(found["hard_skills"])
+    if parts["skills"]:
+        fields["must_have_skills"] = ", ".join(parts["skills"])
+    return fields
+
+
+def _extract_fields(
+    text: str, budget: TimeBudget, line_cache: Optional[dict] = None
+) -> Dict[str, str]:
+    """Return the non-empty fields found in the normalised ``text``."""
+
+    return _combine_parts(_extract_parts(text, budget, line_cache))
+
+
+def extract_parts(
+    text: str,
+    normalized: Optional[str] = None,
+    *,
+    budget: Optional[TimeBudget] = None,
+) -> Dict[str, Any]:
+    """Return the findings of :func:`basic_field_extraction` before merging.
 
+    The findings of consecutive paragraphs can be joined with
+    :func:`merge_parts` and turned into fields with :func:`combine_parts`;
+    the result equals :func:`basic_field_extraction` on the whole text as
+    long as no paragraph :func:`ends_open`.
+    """
+
+    text = normalized if normalized is not None else normalize_text(text)
+    return _extract_parts(text, budget or TimeBudget())
+
+
+def merge_parts(parts: Iterable[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Join the findings of consecutive paragraphs in document order."""
+
+    merged: Dict[str, Any] = {"labels": {}, "gazetteer": {}, "skills": []}
+    for part in parts:
+        for key, value in part["labels"].items():
+            merged["labels"].setdefault(key, value)
+        for key, values in part["gazetteer"].items():
+            known = merged["gazetteer"].setdefault(key, [])
+            known.extend(v for v in values if v not in known)
+        merged["skills"].extend(s for s in part["skills"] if s not in merged["skills"])
+    return merged
+
+
+def combine_parts(parts: Mapping[str, Any]) -> Dict[str, str]:
+    """Return the non-empty fields of the findings ``parts``."""
+
+    return _combine_parts(parts)
+
+
+def ends_open(text: str) -> bool:
+    """Return ``True`` if the value of the last line may follow in later text.
+
+    That is a label without a value, whose value is taken from the next
+    non-empty line, or a skill phrase such as "experience with" whose skills
+    start after the line break.
+    """
+
+    lines = [line for line in normalize_text(text).split("\n") if line.strip()]
+    if not lines:
+        return False
+    return is_label_line(lines[-1]) or bool(_SKILL_TRIGGER_END_RE.search(lines[-1]))
+
+
+def merge_fields(fields: Dict[str, str], update: Mapping[str, str]) -> Dict[str, str]:
+    """Merge the field values of a later text chunk into ``fields`` in place.
+
+    Values already present take precedence; skill lists are joined without
+    duplicates. Returns ``fields`` for convenience.
+    """
+
+    for key, value in update.items():
+        if not value:
+            continue
+        if key in _SKILL_KEYS and fields.get(key):
+            merged = fields[key].split(", ")
+            merged.extend(s for s in value.split(", ") if s and s not in merged)
+            fields[key] = ", ".join(merged)
+        elif not fields.get(key):
+            fields[key] = value
+    return fields
+
+
+def extract_fields_from_pages(
+    pages: Iterable[str], *, max_pages: Optional[int] = MAX_PDF_PAGES
+) -> Dict[str, str]:
+    """Run :func:`basic_field_extraction` incrementally over ``pages``.
+
+    Pages are consumed one at a time and the field scan stops as soon as every
+    mandatory key from :data:`keys.MANDATORY_KEYS` that the regex extraction
+    can provide is filled, or once ``max_pages`` pages have been scanned. Values
+    found on earlier pages take precedence; skill lists are merged across pages.
+    The remaining pages are still read, so ``parsed_data_raw`` always holds the
+    complete text for editing and the model extraction.
+
+    Args:
+        pages: Iterable yielding the text of one page per item.
+        max_pages: Maximum number of pages to scan, ``None`` for no limit.
+
+    Returns:
+        Field dictionary in the same shape as :func:`basic_field_extraction`.
+    """
+
+    targets = [key for key in MANDATORY_KEYS if key in EXTRACTED_KEYS]
+    read: list[str] = []
+    fields: Dict[str, str] = {}
+    scanning = max_pages != 0
+    try:
+        for page in pages:
+            read.append(page)
+            if not scanning:
+                continue
+            page_fields = basic_field_extraction(page)
+            page_fields.pop("parsed_data_raw")
+            merge_fields(fields, page_fields)
+            scanning = not all(fields.get(key) for key in targets) and (
+                max_pages is None or len(read) < max_pages
+            )
+    finally:
+        close = getattr(pages, "close", None)
+        if close is not None:
+            close()
+
+    fields["parsed_data_raw"] = "".join(read)
     for key in ALL_STEP_KEYS:
         fields.setdefault(key, "")
-
     return fields
 
 
+def extract_fields_batch(
+    texts: Iterable[str],
+    *,
+    keys: Optional[Sequence[str]] = None,
+    as_frame: bool = False,
+):
+    """Extract fields from a corpus of texts into columns.
+
+    Compiled patterns, the label index and the gazetteer automaton are shared
+    by all documents; texts are normalised without touching the per-document
+    memo, texts repeated among the last :data:`BATCH_DEDUP_SIZE` distinct
+    documents are extracted once, gazetteer hits of boilerplate
+    lines repeated across the corpus are reused, and only the fields actually
+    found are written instead of filling every key of
+    :data:`keys.ALL_STEP_KEYS` per document.
+
+    Args:
+        texts: Raw job ad texts.
+        keys: Columns to return; defaults to every field found in the corpus.
+        as_frame: Return a ``pandas.DataFrame`` instead of a dict of lists.
+
+    Returns:
+        Mapping of field key to a list with one value per text (``""`` where
+        the field was not found), or the equivalent DataFrame.
+    """
+
+    columns: Dict[str, list[str]] = {key: [] for key in keys or ()}
+    seen: OrderedDict[bytes, Dict[str, str]] = OrderedDict()
+    line_cache: dict = {}
+    count = 0
+    for text in texts:
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        found = seen.get(digest)
+        if found is None:
+            normalized = normalize_text(text, cache=False)
+            found = _extract_fields(normalized, TimeBudget(), line_cache)
+            seen[digest] = found
+            if len(seen) > BATCH_DEDUP_SIZE:
+                seen.popitem(last=False)
+        else:
+            seen.move_to_end(digest)
+        for key, value in found.items():
+            column = columns.get(key)
+            if column is None:
+                if keys is not None:
+                    continue
+                column = columns[key] = []
+            column.extend([""] * (count - len(column)))
+            column.append(value)
+        count += 1
+    for column in columns.values():
+        column.extend([""] * (count - len(column)))
+
+    if as_frame:
+        import pandas as pd
+
+        return pd.DataFrame(columns)
+    return columns
+
+
 def save_fields_to_session(fields: Dict[str, str]) -> None:
     """Persist fields in Streamlit session state."""
     st.session_state.setdefault("job_fields", {}).update(fields)
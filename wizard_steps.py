@@ -20,7 +20,7 @@ import datetime
 from utils.utils_jobinfo import (
     display_fields_summary,
     basic_field_extraction,
-    extract_text,
+    extract_fields_cached,
     save_fields_to_session,
 )
 from utils.i18n import tr
@@ -29,7 +29,8 @@ from utils.esco_client import (
     get_skills_for_job_title,
     get_tasks_for_job_title,
 )
-import requests
+from utils.url_fetcher import fetch_url_text
+from utils.url_import import import_urls_sync
 
 
 def wizard_step_1_basic() -> None:
@@ -56,10 +57,11 @@ def wizard_step_1_basic() -> None:
 
     uploaded_file = st.file_uploader(
         tr(
-            "W\u00e4hle eine Datei (PDF, DOCX, TXT) / Choose a file (PDF, DOCX, TXT)",
+            "W\u00e4hle eine Datei (PDF, DOCX, TXT, HTML, RTF) / "
+            "Choose a file (PDF, DOCX, TXT, HTML, RTF)",
             lang,
         ),
-        type=["pdf", "docx", "txt"],
+        type=["pdf", "docx", "txt", "html", "htm", "rtf"],
     )
     url_input = st.text_input(tr("...oder gib eine URL ein / ...or enter a URL", lang))
 
@@ -72,17 +74,24 @@ def wizard_step_1_basic() -> None:
                 and uploaded_file.name != st.session_state.get("last_uploaded", None)
             )
         ):
-            text = extract_text(uploaded_file)
-            fields_update = basic_field_extraction(text)
-            fields_update["uploaded_file"] = uploaded_file.name
-            save_fields_to_session(fields_update)
+            try:
+                _, fields_update = extract_fields_cached(uploaded_file)
+            except ValueError:
+                st.error(
+                    tr(
+                        "Dateiformat nicht unterstützt / Unsupported file format",
+                        lang,
+                    )
+                )
+            else:
+                fields_update = dict(fields_update)
+                fields_update["uploaded_file"] = uploaded_file.name
+                save_fields_to_session(fields_update)
             st.session_state["last_uploaded"] = uploaded_file.name
 
         if url_input and url_input != st.session_state.get("last_url", ""):
             try:  # pragma: no cover - network
-                response = requests.get(url_input, timeout=10)
-                response.raise_for_status()
-                text = response.text
+                text = fetch_url_text(url_input)
                 fields_update = basic_field_extraction(text)
                 fields_update["input_url"] = url_input
                 save_fields_to_session(fields_update)
@@ -90,10 +99,58 @@ def wizard_step_1_basic() -> None:
             except Exception as exc:  # pragma: no cover - network
                 st.error(f"Fehler beim Laden der URL: {exc}")
 
+    with st.expander(tr("Mehrere URLs importieren / Import multiple URLs", lang)):
+        _multi_url_import(lang)
+
     fields["job_title"] = job_title
     st.session_state["job_fields"] = fields
 
 
+def _multi_url_import(lang: str) -> None:
+    """Fetch many job ad URLs concurrently and let the user load one."""
+    urls_text = st.text_area(
+        tr("Eine URL pro Zeile / One URL per line", lang), key="multi_url_input"
+    )
+    if st.button(tr("URLs importieren / Import URLs", lang)) and urls_text.strip():
+        progress = st.progress(0.0)
+
+        def on_result(result, done: int, total: int) -> None:
+            progress.progress(done / total, text=f"{done}/{total} {result.url}")
+
+        st.session_state["url_imports"] = import_urls_sync(
+            urls_text.splitlines(), on_result=on_result
+        )
+
+    imports = st.session_state.get("url_imports", [])
+    if not imports:
+        return
+    st.dataframe(
+        [
+            {
+                "URL": r.url,
+                "Job Title": r.fields.get("job_title", ""),
+                "Company": r.fields.get("company_name", ""),
+                "City": r.fields.get("city", ""),
+                "Error": r.error or "",
+                "Seconds": r.seconds,
+            }
+            for r in imports
+        ],
+        use_container_width=True,
+    )
+    loaded = [r for r in imports if not r.error]
+    if not loaded:
+        return
+    choice = st.selectbox(
+        tr("Anzeige übernehmen / Load ad", lang),
+        range(len(loaded)),
+        format_func=lambda i: loaded[i].fields.get("job_title") or loaded[i].url,
+    )
+    if st.button(tr("Übernehmen / Apply", lang)):
+        save_fields_to_session(dict(loaded[choice].fields))
+        st.session_state["last_url"] = loaded[choice].url
+
+
 def wizard_step_2_company() -> None:
     """Step 2: company information."""
     lang = st.session_state.get("lang", "de")